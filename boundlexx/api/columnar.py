@@ -0,0 +1,70 @@
+"""
+Columnar (`?format=columnar`) timeseries responses
+
+Instead of one object per row, `results` is one array per field and the
+`world` column holds indexes into a separate `worlds` table, so field names
+and world data are only sent once per page.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+from boundlexx.api.renderers import ORJSONRenderer
+from boundlexx.boundless.models import World
+
+WORLD_COLUMN = "world"
+WORLD_TABLE_FIELDS = ["id", "name", "display_name"]
+
+
+class ColumnarRenderer(ORJSONRenderer):
+    format = "columnar"  # noqa A003
+
+
+def to_columns(rows, fields: Iterable[str]) -> dict[str, list]:
+    return {field: [row[field] for row in rows] for field in fields}
+
+
+def _world_id(value):
+    if isinstance(value, Mapping):
+        return value.get("id")
+    return value
+
+
+def encode_worlds(columns: dict[str, list]) -> Optional[dict[str, list]]:
+    """
+    Replaces the worlds (ids or serialized worlds) in the `world` column with
+    indexes into the returned world table
+    """
+
+    values = columns.get(WORLD_COLUMN)
+    if values is None:
+        return None
+
+    indexes: dict[int, int] = {}
+    encoded = []
+    for value in values:
+        world_id = _world_id(value)
+        if world_id is None:
+            encoded.append(None)
+            continue
+
+        index = indexes.get(world_id)
+        if index is None:
+            index = indexes[world_id] = len(indexes)
+        encoded.append(index)
+    columns[WORLD_COLUMN] = encoded
+
+    worlds = {
+        row[0]: row
+        for row in World.objects.filter(id__in=indexes.keys()).values_list(
+            *WORLD_TABLE_FIELDS
+        )
+    }
+
+    table: dict[str, list] = {field: [] for field in WORLD_TABLE_FIELDS}
+    for world_id in indexes:
+        row = worlds.get(world_id, (world_id,) + (None,) * (len(table) - 1))
+        for field, value in zip(WORLD_TABLE_FIELDS, row):
+            table[field].append(value)
+
+    return table
@@ -14,13 +14,8 @@ from boundlexx.boundless.models import (
     World,
     WorldBlockColor,
 )
-from boundlexx.boundless.utils import (
-    get_block_color_item_ids,
-    get_block_metal_item_ids,
-    get_world_block_color_item_ids,
-)
 
-DEFAULT_FILTERS = ["limit", "offset", "ordering", "search", "format"]
+DEFAULT_FILTERS = ["limit", "offset", "cursor", "ordering", "search", "format"]
 
 
 class DedupedFilter(BaseFilterBackend):
@@ -92,12 +87,10 @@ class EmojiFilterSet(BaseFilterSet):
 class ItemFilterSet(LocalizationFilterSet):
     has_colors = filters.BooleanFilter(
         label=_("Filters out items with/without colors"),
-        method="filter_colors",
     )
 
     has_metal_variants = filters.BooleanFilter(
         label=_("Filters out items with/without metal variants"),
-        method="filter_metals",
     )
 
     has_world_colors = filters.BooleanFilter(
@@ -105,7 +98,6 @@ class ItemFilterSet(LocalizationFilterSet):
             "Filters out items that vary from world to world with "
             "colors (rock, grass, wood, etc.)"
         ),
-        method="filter_world_colors",
     )
 
     class Meta:
@@ -117,30 +109,6 @@ class ItemFilterSet(LocalizationFilterSet):
             "is_resource",
         ]
 
-    def filter_colors(self, queryset, name, value):
-        if value:
-            queryset = queryset.filter(game_id__in=get_block_color_item_ids())
-        elif value is False:
-            queryset = queryset.exclude(game_id__in=get_block_color_item_ids())
-
-        return queryset
-
-    def filter_metals(self, queryset, name, value):
-        if value:
-            queryset = queryset.filter(game_id__in=get_block_metal_item_ids())
-        elif value is False:
-            queryset = queryset.exclude(game_id__in=get_block_metal_item_ids())
-
-        return queryset
-
-    def filter_world_colors(self, queryset, name, value):
-        if value:
-            queryset = queryset.filter(game_id__in=get_world_block_color_item_ids())
-        elif value is False:
-            queryset = queryset.exclude(game_id__in=get_world_block_color_item_ids())
-
-        return queryset
-
 
 class RecipeFilterSet(LocalizationFilterSet):
     input_id = filters.NumberFilter(method="filter_input")
@@ -459,6 +427,14 @@ class TimeseriesFilterSet(BaseFilterSet):
             "applies to `/stats` endpoint"
         ),
     )
+    points = filters.NumberFilter(
+        method="filter_points",
+        label=(
+            "Downsamples the (not paginated) results to at most this many "
+            "points (3 to 5000) with Largest-Triangle-Three-Buckets. On "
+            "`/stats` it only applies with `bucket`"
+        ),
+    )
 
     def filter_time(self, queryset, name, value):
         if value.start is not None:
@@ -468,6 +444,10 @@ class TimeseriesFilterSet(BaseFilterSet):
 
         return queryset
 
+    def filter_points(self, queryset, name, value):
+        # applied by `TimeseriesMixin` after filtering
+        return queryset
+
     def filter_bucket(self, queryset, name, value):
         return queryset.annotate(
             time_bucket=Func(Value(value), F("time"), function="time_bucket")
@@ -1,22 +1,285 @@
+from functools import partial
 from typing import Optional
 
-from django.db.models import Avg, Func, Max, Min, StdDev, Variance
-from django.http import Http404
+from django.conf import settings
+from django.db.models import Model, Prefetch
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
 
+from boundlexx.api.columnar import ColumnarRenderer, encode_worlds, to_columns
 from boundlexx.api.common.filters import TimeseriesFilterSet
 from boundlexx.api.common.pagination import TimeseriesPagination
-from boundlexx.api.db import Median, Mode
+from boundlexx.api.db import ArrayIndex
+from boundlexx.api.downsample import (
+    MAX_POINTS,
+    MIN_POINTS,
+    downsample_indexes,
+    downsample_rows,
+)
+from boundlexx.api.renderers import ORJSONRenderer
+from boundlexx.api.response_cache import (
+    ALL_GENERATION_KEY,
+    CACHED_RESPONSES,
+    COALESCED_RESPONSES,
+    coalesce,
+    generation_key,
+    get_cached_response,
+    get_generations,
+    get_response_key,
+    set_cached_response,
+    uses_object_generations,
+)
 from boundlexx.api.schemas import DescriptiveAutoSchema
+from boundlexx.api.streaming import (
+    EXPORT_CHUNK_SIZE,
+    NDJSONRenderer,
+    iter_batches,
+    iter_json_array,
+    iter_ndjson,
+)
+from boundlexx.boundless.aggregates import (
+    STATS_FUNCTIONS,
+    get_aggregate_bucket,
+    get_bucket_stats,
+    get_stats_aggregates,
+)
+from boundlexx.boundless.color_index import (
+    get_active_worlds,
+    get_color_items,
+    get_first_active_worlds,
+    get_item_colors,
+    iter_world_ids,
+)
+from boundlexx.boundless.models import (
+    LocalizedName,
+    LocalizedStringText,
+    ResourceCountAggregate,
+    WorldPoll,
+)
+from boundlexx.boundless.models.world import (
+    calculate_resource_counts,
+    get_resource_items,
+)
 
 
 class DescriptiveAutoSchemaMixin:
     schema = DescriptiveAutoSchema()
 
 
+LOCALIZED_PREFETCHES = {
+    "localizedname_set": LocalizedName,
+    "strings": LocalizedStringText,
+}
+
+
+def get_lang(request):
+    return request.query_params.get("lang", "all")
+
+
+def localize_prefetches(queryset, lang):
+    """
+    Replaces the localized name/string prefetches of `queryset` with
+    prefetches that only fetch the `lang` rows
+    """
+
+    if lang == "all" or not isinstance(queryset, QuerySet):
+        return queryset
+
+    prefetches = queryset._prefetch_related_lookups  # pylint: disable=protected-access
+
+    lookups = []
+    seen = set()
+    changed = False
+    for lookup in prefetches:
+        path = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+        model = None
+        if isinstance(lookup, str):
+            model = LOCALIZED_PREFETCHES.get(lookup.rsplit("__", 1)[-1])
+
+        if model is not None:
+            changed = True
+            if path in seen:
+                continue
+
+            if lang == "none":
+                lookup = Prefetch(path, queryset=model.objects.none())
+            else:
+                lookup = Prefetch(path, queryset=model.objects.filter(lang=lang))
+
+        seen.add(path)
+        lookups.append(lookup)
+
+    if not changed:
+        return queryset
+    return queryset.prefetch_related(None).prefetch_related(*lookups)
+
+
+class LangPrefetchMixin:
+    def filter_queryset(self, queryset):
+        queryset = localize_prefetches(queryset, get_lang(self.request))  # type: ignore
+        return super().filter_queryset(queryset)  # type: ignore
+
+
+class ResponseCacheMixin:
+    """
+    Caches rendered responses of anonymous GET requests and answers
+    conditional requests for them, see `boundlexx.api.response_cache`
+    """
+
+    # models the responses are built from, defaults to the queryset model
+    cache_models: Optional[list[type[Model]]] = None
+    # additional models for extra actions, {action: [models]}
+    cache_action_models: dict[str, list[type[Model]]] = {}
+
+    def get_cache_models(self):
+        models = self.cache_models
+        if models is None:
+            queryset = getattr(self, "queryset", None)
+            models = [] if queryset is None else [queryset.model]
+
+        return models + self.cache_action_models.get(self.action, [])  # type: ignore # noqa E501
+
+    def get_generation_keys(self):
+        models = self.get_cache_models()
+        keys = [generation_key(model) for model in models]
+
+        # detail responses only depend on their own object of the main model
+        lookup_field = self.lookup_field  # type: ignore
+        lookup_url_kwarg = self.lookup_url_kwarg or lookup_field  # type: ignore
+        if (
+            self.detail  # type: ignore
+            and len(models) > 0
+            and uses_object_generations(models[0])
+            and lookup_field in ("id", "pk")
+            and str(self.kwargs.get(lookup_url_kwarg, "")).isdigit()  # type: ignore # noqa E501
+        ):
+            keys[0] = generation_key(models[0], self.kwargs[lookup_url_kwarg])  # type: ignore # noqa E501
+
+        return keys
+
+    def is_response_cacheable(self, request):
+        return (
+            settings.BOUNDLESS_API_RESPONSE_CACHE
+            and request.method == "GET"
+            and not request.user.is_authenticated
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)  # type: ignore
+
+        # the handler is looked up after `initial`, once the renderer is known
+        if self.is_response_cacheable(request):
+            self.get = partial(self.cached_get, self.get)  # type: ignore # pylint: disable=attribute-defined-outside-init,no-member # noqa E501
+
+    def cached_get(self, handler, request, *args, **kwargs):
+        endpoint = f"{request.version}:{self.basename}-{self.action}"  # type: ignore # noqa E501
+        generations = get_generations([ALL_GENERATION_KEY, *self.get_generation_keys()])
+        key = get_response_key(request, generations)
+
+        cached = get_cached_response(key)
+        if cached is not None:
+            CACHED_RESPONSES.labels(endpoint, "hit").inc()
+            return self.build_cached_response(request, cached)
+
+        CACHED_RESPONSES.labels(endpoint, "miss").inc()
+
+        responses = []
+
+        def render():
+            response = handler(request, *args, **kwargs)
+            responses.append(response)
+            return self.cache_response(key, request, response)
+
+        cached, source = coalesce(key, render)
+        if cached is not None:
+            if source is not None:
+                COALESCED_RESPONSES.labels(endpoint, source).inc()
+            return self.build_cached_response(request, cached)
+
+        if len(responses) > 0:
+            return responses[0]
+
+        # the request this one waited on failed or was not cacheable
+        return handler(request, *args, **kwargs)
+
+    def build_cached_response(self, request, cached):
+        status, content, content_type, etag = cached
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, status=status, content_type=content_type)
+
+        response["ETag"] = etag
+        return response
+
+    def cache_response(self, key, request, response):
+        if not isinstance(response, Response) or response.status_code != 200:
+            return None
+
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()  # type: ignore
+        response.render()
+
+        return set_cached_response(
+            key, response, settings.BOUNDLESS_API_RESPONSE_CACHE_TIMEOUT
+        )
+
+
+class StreamingExportMixin:
+    """
+    Adds an `export` action that streams every row of `list` (with the same
+    filters) as NDJSON, or as a JSON array with `format=json`
+    """
+
+    export_chunk_size = EXPORT_CHUNK_SIZE
+
+    def is_response_cacheable(self, request):
+        return (
+            self.action != "export"  # type: ignore
+            and super().is_response_cacheable(request)  # type: ignore
+        )
+
+    def get_export_batch(self, objs):
+        return objs
+
+    def iter_export_batches(self, queryset):
+        for batch in iter_batches(queryset, self.export_chunk_size):
+            serializer = self.get_serializer(  # type: ignore
+                self.get_export_batch(batch), many=True
+            )
+            yield serializer.data
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, ORJSONRenderer],
+    )
+    def export(self, request, **kwargs):
+        """
+        Streams all of the results of the list endpoint without pagination
+        """
+
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+        batches = self.iter_export_batches(queryset)
+
+        if request.accepted_renderer.format == "json":
+            return StreamingHttpResponse(
+                iter_json_array(batches), content_type="application/json"
+            )
+        return StreamingHttpResponse(
+            iter_ndjson(batches), content_type=NDJSONRenderer.media_type
+        )
+
+
 class TimeseriesMixin:
     is_timeseries = True
     pagination_class = TimeseriesPagination
@@ -26,11 +289,120 @@ class TimeseriesMixin:
     filterset_class = TimeseriesFilterSet
     time_bucket_serializer_class: Optional[BaseSerializer] = None
     number_fields: list[str] = []
-    stats_functions = [Avg, Mode, Median, Min, Max, StdDev, Variance]
+    stats_functions = STATS_FUNCTIONS
+    aggregate_model: Optional[type[Model]] = None
+    aggregate_lookups: dict[str, str] = {}
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarRenderer]
+    # {column: lookup} to build `format=columnar` lists from `values`,
+    # otherwise the serialized rows are turned into columns
+    columnar_fields: dict[str, str] = {}
+    # series `points` downsamples on, defaults to the first number field
+    downsample_field: Optional[str] = None
 
     def get_queryset(self):
         return super().get_queryset().order_by("-time")  # type: ignore
 
+    def get_rows(self, objs):
+        return objs
+
+    @property
+    def is_columnar(self):
+        renderer = getattr(self.request, "accepted_renderer", None)  # type: ignore
+        return isinstance(renderer, ColumnarRenderer)
+
+    def get_columnar_fields(self):
+        return self.columnar_fields or None
+
+    def get_columns(self, queryset, paginate=True):
+        fields = self.get_columnar_fields()
+
+        if fields is None:
+            if paginate:
+                rows = self.paginate_queryset(queryset)  # type: ignore
+            else:
+                rows = self.get_rows(list(queryset))
+            serializer = self.get_serializer(rows, many=True)  # type: ignore
+            return to_columns(serializer.data, serializer.child.fields.keys())
+
+        queryset = queryset.prefetch_related(None).values(*fields.values())
+        if paginate:
+            # the view's `paginate_queryset` may expect model instances
+            queryset = self.paginator.paginate_queryset(  # type: ignore
+                queryset, self.request, view=self  # type: ignore
+            )
+
+        return {
+            column: [row[lookup] for row in queryset]
+            for column, lookup in fields.items()
+        }
+
+    def get_points(self):
+        value = self.request.query_params.get("points")  # type: ignore
+        if value is None:
+            return None
+
+        try:
+            points = int(value)
+        except ValueError:
+            points = None
+
+        if points is None or not MIN_POINTS <= points <= MAX_POINTS:
+            raise ValidationError(
+                {"points": f"Must be a number from {MIN_POINTS} to {MAX_POINTS}"}
+            )
+        return points
+
+    def get_downsample_field(self):
+        if self.downsample_field is not None:
+            return self.downsample_field
+        if len(self.number_fields) > 0:
+            return self.number_fields[0]
+        return None
+
+    def downsample_queryset(self, queryset, points):
+        field = self.get_downsample_field()
+        if field is None:
+            return queryset
+
+        series = [
+            row
+            for row in queryset.prefetch_related(None).values_list("time", field)
+            if row[1] is not None
+        ]
+
+        if len(series) > points:
+            times, values = zip(*series)
+            series = [series[i] for i in downsample_indexes(times, values, points)]
+
+        return queryset.filter(time__in=[row[0] for row in series])
+
+    def list(self, request, *args, **kwargs):  # noqa A003
+        points = self.get_points()
+        if points is None and not self.is_columnar:
+            return super().list(request, *args, **kwargs)  # type: ignore
+
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+
+        # downsampled lists are not paginated, their size is bounded by `points`
+        if points is not None:
+            queryset = self.downsample_queryset(queryset, points)
+
+            if not self.is_columnar:
+                serializer = self.get_serializer(  # type: ignore
+                    self.get_rows(list(queryset)), many=True
+                )
+                return Response(serializer.data)
+
+            columns = self.get_columns(queryset, paginate=False)
+            return Response({"results": columns, "worlds": encode_worlds(columns)})
+
+        columns = self.get_columns(queryset)
+        worlds = encode_worlds(columns)
+
+        response = self.get_paginated_response(columns)  # type: ignore
+        response.data["worlds"] = worlds
+        return response
+
     def get_parents_query_dict(self):
         kwargs = super().get_parents_query_dict()  # type: ignore
 
@@ -58,27 +430,63 @@ class TimeseriesMixin:
 
         return super().get_object()  # type: ignore
 
-    def stats(self, request, **kwargs):
-        if self.time_bucket_serializer_class is None:
-            raise Http404()
+    def get_aggregate_queryset(self, bucket):
+        if self.aggregate_model is None:
+            return None
 
-        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+        filters = {}
+        for lookup, value in self.get_parents_query_dict().items():
+            if lookup not in self.aggregate_lookups:
+                return None
+            filters[self.aggregate_lookups[lookup]] = value
 
-        is_bucket = "bucket" in request.query_params
-        values_list = ["time_bucket"]
+        return self.aggregate_model.objects.filter(bucket=bucket, **filters)
 
-        if len(self.number_fields) > 0:
-            aggregate_args: dict[str, Func] = {}
-            for field in self.number_fields:
-                for func in self.stats_functions:
-                    name = func.__name__.lower()
+    def get_time_range(self, queryset):
+        filterset = self.filterset_class(  # pylint: disable=not-callable
+            self.request.query_params,  # type: ignore
+            queryset=queryset,
+            request=self.request,  # type: ignore
+        )
+
+        value = None
+        if filterset.is_valid():
+            value = filterset.form.cleaned_data.get("time")
+
+        if value is None:
+            return None, None
+        return value.start, value.stop
 
-                    if name == "avg":
-                        name = "average"
+    def get_bucket_stats(self, queryset, value):
+        """
+        Reads bucketed stats from the materialized aggregates, returns None
+        if they cannot be used for the request
+        """
 
-                    stat_field = f"{field}_{name}"
-                    aggregate_args[stat_field] = func(field)
-                    values_list.append(stat_field)
+        bucket = get_aggregate_bucket(value)
+        if bucket is None or self.stats_functions != STATS_FUNCTIONS:
+            return None
+
+        aggregates = self.get_aggregate_queryset(bucket)
+        if aggregates is None:
+            return None
+
+        return get_bucket_stats(
+            queryset,
+            aggregates,
+            bucket,
+            self.number_fields,
+            *self.get_time_range(queryset),
+        )
+
+    def get_raw_stats(self, queryset, is_bucket):
+        values_list = ["time_bucket"]
+
+        if len(self.number_fields) > 0:
+            aggregate_args = get_stats_aggregates(
+                self.number_fields, self.stats_functions
+            )
+            values_list += aggregate_args.keys()
 
             if is_bucket:
                 queryset = queryset.values("time_bucket").annotate(**aggregate_args)
@@ -88,10 +496,36 @@ class TimeseriesMixin:
         if is_bucket:
             queryset = queryset.values(*values_list).order_by("-time_bucket")
 
+        return queryset
+
+    def stats(self, request, **kwargs):
+        if self.time_bucket_serializer_class is None:
+            raise Http404()
+
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+
+        is_bucket = "bucket" in request.query_params
+
+        rows = None
+        if is_bucket and len(self.number_fields) > 0:
+            rows = self.get_bucket_stats(queryset, request.query_params["bucket"])
+
+        if rows is None:
+            rows = self.get_raw_stats(queryset, is_bucket)
+
+        points = self.get_points()
+        field = self.get_downsample_field()
+        if is_bucket and points is not None and field is not None:
+            rows = downsample_rows(
+                list(rows), points, "time_bucket", f"{field}_average"
+            )
+
         serializer = self.time_bucket_serializer_class(  # pylint: disable=not-callable  # noqa: E501
-            queryset, many=True
+            rows, many=True
         )
 
+        if self.is_columnar:
+            return Response(to_columns(serializer.data, serializer.child.fields.keys()))
         return Response(serializer.data)
 
     @classmethod
@@ -108,3 +542,203 @@ class TimeseriesMixin:
             )
 
         return extra_actions
+
+
+class ResourceCountVectorMixin:
+    """
+    Serves resource count timeseries from `WorldPoll.resource_counts` (one
+    row per poll) when `BOUNDLESS_COMPACT_RESOURCE_COUNTS` is enabled
+    """
+
+    aggregate_model = ResourceCountAggregate
+    aggregate_lookups = {
+        "item__game_id": "item__game_id",
+        "world_poll__world_id": "world_id",
+    }
+
+    @property
+    def is_compact(self):
+        return settings.BOUNDLESS_COMPACT_RESOURCE_COUNTS
+
+    @property
+    def world_lookup(self):
+        if self.is_compact:
+            return "world"
+        return "world_poll__world"
+
+    def get_resource_item_id(self):
+        try:
+            item_id = int(self.kwargs["item__game_id"])  # type: ignore
+        except (KeyError, ValueError) as ex:
+            raise Http404() from ex
+
+        if item_id not in settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING:
+            raise Http404()
+        return item_id
+
+    def get_queryset(self):
+        if not self.is_compact:
+            return super().get_queryset()  # type: ignore
+
+        index = settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING.index(
+            self.get_resource_item_id()
+        )
+
+        return (
+            WorldPoll.objects.filter(
+                world_id=self.kwargs["world_poll__world_id"],  # type: ignore
+                world__active=True,
+                world__is_creative=False,
+                resource_counts__isnull=False,
+            )
+            .annotate(count=ArrayIndex("resource_counts", index))
+            .filter(count__gt=0)
+            .select_related("world")
+            .order_by("-time")
+        )
+
+    def get_aggregate_queryset(self, bucket):
+        queryset = super().get_aggregate_queryset(bucket)  # type: ignore
+
+        if queryset is not None:
+            queryset = queryset.filter(world__active=True, world__is_creative=False)
+
+            if not self.request.user.has_perm(  # type: ignore
+                "boundless.can_view_private"
+            ):
+                queryset = queryset.filter(world__is_public=True)
+
+        return queryset
+
+    def get_resource_counts(self, world_polls):
+        item_id = self.get_resource_item_id()
+        items = get_resource_items()
+
+        resource_counts = []
+        for world_poll in world_polls:
+            for resource_count in calculate_resource_counts(
+                world_poll, world_poll.resource_counts, items
+            ):
+                if resource_count.item.game_id == item_id:
+                    resource_counts.append(resource_count)
+                    break
+        return resource_counts
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)  # type: ignore
+
+        if page is not None and self.is_compact:
+            page = self.get_resource_counts(page)
+        return page
+
+    def get_object(self):
+        obj = super().get_object()  # type: ignore
+
+        if self.is_compact:
+            obj = self.get_resource_counts([obj])[0]
+        return obj
+
+    def get_export_batch(self, objs):
+        if self.is_compact:
+            return self.get_resource_counts(objs)
+        return super().get_export_batch(objs)  # type: ignore
+
+    def get_rows(self, objs):
+        if self.is_compact:
+            return self.get_resource_counts(objs)
+        return super().get_rows(objs)  # type: ignore
+
+    def get_columnar_fields(self):
+        # percentages are calculated from the whole vector
+        if self.is_compact:
+            return None
+        return super().get_columnar_fields()  # type: ignore
+
+
+class ColorIndexMixin:
+    """
+    Serves an unfiltered `list` of world block colors from the color bitmap
+    index instead of filtering/deduping all of the rows in the database
+    """
+
+    color_index_params = {"limit", "offset", "format"}
+    color_index_ordering: list[str] = []
+
+    def use_color_index(self):
+        return self.action == "list" and set(  # type: ignore
+            self.request.query_params.keys()  # type: ignore
+        ).issubset(self.color_index_params)
+
+    def get_color_index_ids(self, public_only):
+        """
+        IDs of the world block colors to list from the color index, `None` to
+        filter the database instead
+        """
+
+        return None
+
+    def filter_queryset(self, queryset):
+        if self.use_color_index():
+            ids = self.get_color_index_ids(
+                not self.request.user.has_perm(  # type: ignore
+                    "boundless.can_view_private"
+                )
+            )
+
+            if ids is not None:
+                return self.queryset.filter(id__in=ids).order_by(  # type: ignore
+                    *self.color_index_ordering
+                )
+        return super().filter_queryset(queryset)  # type: ignore
+
+
+class ItemColorIndexMixin(ColorIndexMixin):
+    color_index_ordering = ["color__game_id"]
+
+    def get_color_index_ids(self, public_only):
+        item_id = self.kwargs["item__game_id"]  # type: ignore
+        first_worlds = get_first_active_worlds(
+            get_item_colors(int(item_id)), public_only=public_only
+        )
+
+        ids = {}
+        for block_color_id, color_id, world_id in (
+            self.queryset.filter(  # type: ignore
+                item__game_id=item_id,
+                active=True,
+                color__game_id__in=first_worlds.keys(),
+                world_id__in=set(first_worlds.values()),
+            )
+            .order_by("id")
+            .values_list("id", "color__game_id", "world_id")
+        ):
+            if first_worlds[color_id] == world_id:
+                ids.setdefault(color_id, block_color_id)
+
+        return list(ids.values())
+
+
+class BlockColorIndexMixin(ColorIndexMixin):
+    color_index_ordering = ["item__game_id", "world_id"]
+
+    def get_color_index_ids(self, public_only):
+        color_id = self.kwargs["color__game_id"]  # type: ignore
+        worlds = get_active_worlds(
+            get_color_items(int(color_id)), public_only=public_only
+        )
+
+        world_ids = 0
+        for bits in worlds.values():
+            world_ids |= bits
+
+        ids = []
+        for block_color_id, item_id, world_id in self.queryset.filter(  # type: ignore
+            color__game_id=color_id,
+            active=True,
+            item__game_id__in=worlds.keys(),
+            world_id__in=list(iter_world_ids(world_ids)),
+        ).values_list("id", "item__game_id", "world_id"):
+            if worlds[item_id] >> world_id & 1:
+                ids.append(block_color_id)
+
+        return ids
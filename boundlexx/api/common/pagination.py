@@ -1,5 +1,58 @@
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 
+from boundlexx.api.pagination import EstimatedCountMixin
+
+
+class TimeCursorPagination(CursorPagination):
+    """
+    Keyset pagination on `time` without a total count. Rows sharing a `time`
+    are paged by an offset stored in the (opaque) cursor
+    """
+
+    ordering = "-time"
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+
+class TimeseriesPagination(EstimatedCountMixin, LimitOffsetPagination):
+    """
+    Limit/offset pagination, or keyset pagination when `cursor` is passed
+    (an empty `cursor` starts at the first page)
+    """
 
-class TimeseriesPagination(LimitOffsetPagination):
     default_limit = 50
+    cursor_query_param = "cursor"
+    cursor_pagination_class = TimeCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        cursor_paginator = self.cursor_pagination_class()
+
+        for parameter in cursor_paginator.get_schema_operation_parameters(view):
+            if parameter["name"] == self.cursor_query_param:
+                parameter["description"] = (
+                    "Switches to cursor pagination, pass an empty value for the "
+                    "first page. Cursor pages do not have a `count`"
+                )
+                parameters.append(parameter)
+
+        return parameters
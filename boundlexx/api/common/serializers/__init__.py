@@ -78,6 +78,7 @@ from boundlexx.api.common.serializers.world import (
     SettlementSerializer,
     SimpleWorldSerializer,
     WorldDistanceSerializer,
+    WorldRouteSerializer,
     WorldSerializer,
 )
 
@@ -138,6 +139,7 @@ __all__ = [
     "WorldPollSerializer",
     "WorldPollTBSerializer",
     "WorldRequestBasketPriceSerializer",
+    "WorldRouteSerializer",
     "WorldSerializer",
     "WorldShopStandPriceSerializer",
     "WebsocketResponseSerializer",
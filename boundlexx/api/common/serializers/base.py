@@ -1,5 +1,6 @@
 from typing import Optional
 
+from django.db import models
 from rest_framework import serializers
 
 from boundlexx.api.models import ExportedFile
@@ -67,21 +68,18 @@ class LangFilterListSerializer(
     serializers.ListSerializer
 ):  # pylint: disable=abstract-method
     def to_representation(self, data):
-        data = super().to_representation(data)
         lang = self.context["request"].query_params.get("lang", "all")
 
-        if lang == "all":
-            return data
         if lang == "none":
             return []
 
-        new_data = []
-        for item in data:
-            if item["lang"] == lang:
-                new_data.append(item)
-        data = new_data
+        # filter before serializing, the rows are usually already filtered
+        # by the viewset's prefetch (see `localize_prefetches`)
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        if lang != "all":
+            iterable = [item for item in iterable if item.lang == lang]
 
-        return data
+        return [self.child.to_representation(item) for item in iterable]
 
 
 class LocalizedStringTextSerializer(serializers.ModelSerializer):
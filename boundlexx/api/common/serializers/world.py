@@ -7,6 +7,7 @@ from boundlexx.api.common.serializers.base import (
     NullSerializer,
 )
 from boundlexx.api.common.serializers.skill import IDSkillSerializer
+from boundlexx.boundless.distances import ROUTE_METRICS
 from boundlexx.boundless.models import Beacon, BeaconPlotColumn, World, WorldDistance
 
 
@@ -188,6 +189,14 @@ class WorldDistanceSerializer(serializers.ModelSerializer):
         ]
 
 
+class WorldRouteSerializer(NullSerializer):
+    world_source = IDWorldSerializer()
+    world_dest = IDWorldSerializer()
+    by = serializers.ChoiceField(choices=ROUTE_METRICS)
+    total = serializers.FloatField()
+    hops = WorldDistanceSerializer(many=True)
+
+
 class BeaconPlotColumnSerializer(serializers.ModelSerializer):
     plot_x = serializers.IntegerField()
     plot_z = serializers.IntegerField()
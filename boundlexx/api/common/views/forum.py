@@ -18,10 +18,10 @@ def get_response(world, extra):
 
     if world.worldpoll_set.count() > 0:
         resources = (
-            world.worldpoll_set.prefetch_related("resourcecount_set")
+            world.worldpoll_set.select_related("world")
+            .prefetch_related("resourcecount_set", "resourcecount_set__item")
             .first()
-            .resources.order_by("-count")
-            .select_related("item")
+            .resources
         )
 
     _, title, body = WorldNotification().forum(world, resources, extra=extra)
@@ -4,7 +4,11 @@ from rest_framework.mixins import ListModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 
-from boundlexx.api.common.mixins import DescriptiveAutoSchemaMixin
+from boundlexx.api.common.mixins import (
+    DescriptiveAutoSchemaMixin,
+    LangPrefetchMixin,
+    ResponseCacheMixin,
+)
 
 if TYPE_CHECKING:
     from rest_framework.viewsets import ModelViewSet as _Base
@@ -12,7 +16,7 @@ else:
     _Base = object
 
 
-class BoundlexxViewSetMixin(DescriptiveAutoSchemaMixin, _Base):
+class BoundlexxViewSetMixin(LangPrefetchMixin, DescriptiveAutoSchemaMixin, _Base):
     action: str
 
     def get_serializer_class(self):
@@ -62,5 +66,7 @@ class BoundlexxListViewSet(BoundlexxListViewSetMixin, ListModelMixin, GenericVie
     pass
 
 
-class BoundlexxReadOnlyViewSet(BoundlexxListViewSetMixin, ReadOnlyModelViewSet):
+class BoundlexxReadOnlyViewSet(
+    ResponseCacheMixin, BoundlexxListViewSetMixin, ReadOnlyModelViewSet
+):
     pass
@@ -1,3 +1,7 @@
+import json
+
+from django.db import connections
+from django.db.models import Func, IntegerField
 from django.db.models.aggregates import Aggregate
 from django.db.models.functions.mixins import (
     FixDurationInputMixin,
@@ -20,3 +24,28 @@ class Median(
     function = "median"
     name = "Median"
     allow_distinct = False
+
+
+class ArrayIndex(Func):  # pylint: disable=abstract-method
+    template = "%(expressions)s[%(index)s]"
+    output_field = IntegerField()
+
+    def __init__(self, expression, index, **extra):
+        # postgres arrays are 1-indexed
+        super().__init__(expression, index=int(index) + 1, **extra)
+
+
+def estimate_count(queryset) -> int:
+    """
+    Row count of `queryset` as estimated by the Postgres query planner
+    """
+
+    sql, params = queryset.order_by().query.sql_with_params()
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
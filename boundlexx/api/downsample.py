@@ -0,0 +1,73 @@
+"""
+Largest-Triangle-Three-Buckets downsampling of timeseries
+
+The series is split in `points - 2` buckets (the first and last point are
+always kept) and from each bucket the point forming the largest triangle
+with the previously selected point and the average of the next bucket is
+kept. The areas of a bucket are calculated in one numpy operation, so the
+Python loop only runs once per returned point.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+MIN_POINTS = 3
+MAX_POINTS = 5000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Returns the indexes of the `points` items of the (`x`, `y`) series that
+    best preserve its shape, `x` has to be ordered
+    """
+
+    size = len(x)
+    if points >= size or points < MIN_POINTS:
+        return np.arange(size)
+
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    ends = np.append(edges[1:], size)
+
+    selected = np.empty(points, dtype=int)
+    selected[0] = 0
+    selected[-1] = size - 1
+
+    previous = 0
+    for index in range(points - 2):
+        start, end = edges[index], edges[index + 1]
+        next_x = x[end : ends[index + 1]].mean()
+        next_y = y[end : ends[index + 1]].mean()
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+
+        previous = start + int(areas.argmax())
+        selected[index + 1] = previous
+
+    return selected
+
+
+def downsample_indexes(times: Sequence, values: Sequence, points: int) -> list[int]:
+    x = np.fromiter((t.timestamp() for t in times), dtype=float, count=len(times))
+    y = np.asarray(values, dtype=float)
+
+    return lttb(x, y, points).tolist()
+
+
+def downsample_rows(rows: list, points: int, x_key: str, y_key: str) -> list:
+    """
+    Downsamples a list of dicts, rows without a `y_key` value are dropped
+    """
+
+    if len(rows) <= points:
+        return rows
+
+    rows = [row for row in rows if row.get(y_key) is not None]
+    indexes = downsample_indexes(
+        [row[x_key] for row in rows], [row[y_key] for row in rows], points
+    )
+
+    return [rows[index] for index in indexes]
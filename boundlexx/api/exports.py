@@ -0,0 +1,175 @@
+"""
+Streaming export pipeline
+
+Rows are fed from generators into `ExportSheet`s, which spool them to a
+temporary file and track the column widths as they go. The spooled rows are
+then written out to a write-only Excel workbook (column widths have to be set
+before the first row is written), CSV and Parquet from the same rows, without
+ever holding the full spreadsheet in memory.
+
+Every format is written byte for byte the same for the same rows (no
+timestamps), so unchanged exports are detected by their content hash.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+import pickle  # nosec
+import tempfile
+import zipfile
+from typing import Iterable
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.utils.text import slugify
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from boundlexx.api.utils import create_export_file
+
+# fixed timestamps so the same content always gives the same hash
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+XLSX_DATE_TIME = datetime.datetime(*ZIP_DATE_TIME)
+
+
+class ExportSheet:
+    def __init__(self, title, headers=None):
+        self.title = title
+        self.widths: list[int] = []
+        self.row_count = 0
+        self._spool = tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+
+        if headers is not None:
+            self.append(headers)
+
+    def append(self, row):
+        row = list(row)
+
+        for index, cell in enumerate(row):
+            width = len(str(cell)) if cell is not None else 0
+
+            if index < len(self.widths):
+                if width > self.widths[index]:
+                    self.widths[index] = width
+            else:
+                self.widths.append(width)
+
+        pickle.dump(row, self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+        self.row_count += 1
+
+    def extend(self, rows: Iterable):
+        for row in rows:
+            self.append(row)
+
+    def rows(self):
+        self._spool.seek(0)
+
+        for _ in range(self.row_count):
+            yield pickle.load(self._spool)  # nosec
+
+    def close(self):
+        self._spool.close()
+
+    @property
+    def slug(self):
+        return slugify(self.title).replace("-", "_")
+
+
+def write_xlsx(sheets: list[ExportSheet]) -> bytes:
+    workbook = Workbook(write_only=True)
+    workbook.properties.created = XLSX_DATE_TIME
+    workbook.properties.modified = XLSX_DATE_TIME
+
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(sheet.title)
+
+        for index, width in enumerate(sheet.widths):
+            worksheet.column_dimensions[get_column_letter(index + 1)].width = width + 2
+
+        for row in sheet.rows():
+            worksheet.append(row)
+
+    output = io.BytesIO()
+    workbook.save(output)
+
+    # openpyxl dates the zip entries with the current time
+    with zipfile.ZipFile(output) as zip_file:
+        return _zip_files(
+            {info.filename: zip_file.read(info) for info in zip_file.infolist()}
+        )
+
+
+def write_csv(sheet: ExportSheet) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    for row in sheet.rows():
+        writer.writerow(row)
+
+    return output.getvalue().encode("utf8")
+
+
+def write_parquet(sheet: ExportSheet) -> bytes:
+    rows = sheet.rows()
+    headers = [str(h) for h in next(rows, [])]
+    columns: list[list] = [[] for _ in range(len(sheet.widths))]
+
+    for row in rows:
+        for index, column in enumerate(columns):
+            value = row[index] if index < len(row) else None
+            column.append(None if value is None else str(value))
+
+    names = [
+        headers[index] if index < len(headers) else f"column_{index + 1}"
+        for index in range(len(columns))
+    ]
+
+    output = io.BytesIO()
+    pq.write_table(pa.table(dict(zip(names, columns))), output)
+    return output.getvalue()
+
+
+def _zip_files(files: dict[str, bytes]) -> bytes:
+    output = io.BytesIO()
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for name, content in files.items():
+            info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zip_file.writestr(info, content)
+
+    return output.getvalue()
+
+
+def create_exports(name, description, sheets: list[ExportSheet]):
+    """
+    Creates the Excel, CSV (zip of a CSV per sheet) and Parquet (zip of a
+    Parquet file per sheet) exports from `sheets`
+
+    Returns the names of the exports that changed
+    """
+
+    try:
+        changed = []
+
+        if create_export_file(name, "xlsx", description, write_xlsx(sheets)):
+            changed.append(name)
+
+        csv_name = f"{name}_csv"
+        csv_files = {f"{s.slug}.csv": write_csv(s) for s in sheets}
+        if create_export_file(csv_name, "zip", description, _zip_files(csv_files)):
+            changed.append(csv_name)
+
+        parquet_name = f"{name}_parquet"
+        parquet_files = {f"{s.slug}.parquet": write_parquet(s) for s in sheets}
+        if create_export_file(
+            parquet_name, "zip", description, _zip_files(parquet_files)
+        ):
+            changed.append(parquet_name)
+    finally:
+        for sheet in sheets:
+            sheet.close()
+
+    return changed
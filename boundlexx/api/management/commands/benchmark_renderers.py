@@ -0,0 +1,87 @@
+import io
+import json
+import time
+
+import djclick as click
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from boundlexx.api.renderers import ORJSONRenderer, dumps
+from rest_framework_msgpack.parsers import MessagePackParser
+from rest_framework_msgpack.renderers import MessagePackRenderer
+
+DEFAULT_PATHS = [
+    "/api/v2/worlds/?limit=1000",
+    "/api/v2/items/?limit=1000",
+    "/api/v2/colors/1/blocks/?limit=1000",
+    "/api/v1/worlds/?limit=1000",
+    "/api/v1/items/?limit=1000",
+]
+
+
+def _record(paths):
+    client = Client()
+    recorded = []
+
+    with override_settings(ALLOWED_HOSTS=["*"], BOUNDLESS_API_RESPONSE_CACHE=False):
+        for path in paths:
+            response = client.get(path)
+            data = getattr(response, "data", None)
+
+            if response.status_code != 200 or data is None:
+                click.echo(f"Skipping {path} ({response.status_code})")
+                continue
+            recorded.append((path, data))
+
+    return recorded
+
+
+def _run(renderer, data, rounds):
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        content = renderer.render(data)
+
+    return (time.perf_counter() - start) / rounds * 1000, content
+
+
+def _decode(name, content):
+    if name == "msgpack":
+        return json.loads(dumps(MessagePackParser().parse(io.BytesIO(content))))
+    return json.loads(content)
+
+
+@click.command()
+@click.option("-r", "--rounds", type=int, default=20, help="Renders per response")
+@click.argument("paths", nargs=-1)
+def command(rounds, paths):
+    """
+    Records API responses (default: large list endpoints) and compares
+    rendering them with DRF's `JSONRenderer`, the `ORJSONRenderer` and the
+    `MessagePackRenderer`
+    """
+
+    renderers = (
+        ("json", JSONRenderer()),
+        ("orjson", ORJSONRenderer()),
+        ("msgpack", MessagePackRenderer()),
+    )
+
+    for path, data in _record(paths or DEFAULT_PATHS):
+        results = [(name, *_run(r, data, rounds)) for name, r in renderers]
+
+        _, base_ms, base_content = results[0]
+        click.echo(f"{path} x {rounds}")
+        for name, per_render, content in results:
+            if content == base_content:
+                same = "identical"
+            elif _decode(name, content) == json.loads(base_content):
+                same = "equivalent"
+            else:
+                same = "DIFFERENT"
+
+            click.echo(
+                f"  {name:<8} {per_render:8.3f}ms/render  "
+                f"{base_ms / per_render:5.2f}x  {len(content):>9} bytes  {same}"
+            )
@@ -1,9 +1,7 @@
 import djclick as click
-from openpyxl import Workbook
-from openpyxl.writer.excel import save_virtual_workbook
 
+from boundlexx.api.exports import ExportSheet, create_exports
 from boundlexx.api.tasks import purge_static_cache
-from boundlexx.api.utils import create_export_file, set_column_widths
 from boundlexx.boundless.models import Recipe, RecipeGroup
 
 FILENAME = "recipe_export"
@@ -69,10 +67,11 @@ def _get_levels(recipe):
                 recipe.craft_xp * level.output_quantity,
             ]
 
-        if level.inputs.count() == 0:
+        inputs = level.inputs.all()
+        if len(inputs) == 0:
             single_only = True
 
-        for input_item in level.inputs.all():
+        for input_item in inputs:
             if input_item.group is None:
                 extra_row += [input_item.item.english, input_item.count]
             else:
@@ -88,6 +87,21 @@ def _get_levels(recipe):
     return single_only, [single_row, bulk_row, mass_row]
 
 
+def _iter_recipe_rows(queryset):
+    """
+    Yields `(machine, single_only, rows)` for each recipe
+    """
+
+    # not `.iterator()`, it skips `prefetch_related`
+    for recipe in queryset:
+        single_only, rows = _get_levels(recipe)
+
+        if recipe.machine != "FURNACE" and rows[0][12] == rows[1][12]:
+            single_only = True
+
+        yield recipe.machine, single_only, rows
+
+
 @click.command()
 def command():
     queryset = Recipe.objects.all().prefetch_related(
@@ -106,58 +120,44 @@ def command():
         "members__localizedname_set",
     )
 
-    workbook = Workbook()
-    workbook.active.title = "Single"
-    workbook.create_sheet("Bulk")
-    workbook.create_sheet("Mass")
-    workbook.create_sheet("Furnace")
-    workbook.create_sheet("Groups")
-
-    group_sheet = workbook["Groups"]
-    group_sheet.append(["Name", "Members"])
-
-    for group in groups:
-        group_sheet.append([group.name] + [i.english for i in group.members.all()])
-
-    single = workbook["Single"]
-    bulk = workbook["Bulk"]
-    mass = workbook["Mass"]
-    furnace = workbook["Furnace"]
-
     crafting_headers = HEADERS.copy()
     crafting_headers.pop(3)  # Heat
-    single.append(crafting_headers)
-    bulk.append(crafting_headers)
-    mass.append(crafting_headers)
 
     furnace_headers = HEADERS.copy()
     furnace_headers.pop(11)  # Spark
 
-    click.echo("Creating recipes...")
-    with click.progressbar(queryset) as pbar:
-        for recipe in pbar:
-            single_only, rows = _get_levels(recipe)
+    single = ExportSheet("Single", crafting_headers)
+    bulk = ExportSheet("Bulk", crafting_headers)
+    mass = ExportSheet("Mass", crafting_headers)
+    furnace = ExportSheet("Furnace", furnace_headers)
+    group_sheet = ExportSheet("Groups", ["Name", "Members"])
+
+    group_sheet.extend(
+        [group.name] + [i.english for i in group.members.all()] for group in groups
+    )
 
-            if recipe.machine == "FURNACE":
+    click.echo("Creating recipes...")
+    with click.progressbar(
+        _iter_recipe_rows(queryset), length=queryset.count()
+    ) as pbar:
+        for machine, single_only, rows in pbar:
+            if machine == "FURNACE":
                 furnace.append(rows[0])
                 continue
 
-            if rows[0][12] == rows[1][12]:
-                single_only = True
-
             single.append(rows[0])
             if not single_only:
                 bulk.append(rows[1])
                 mass.append(rows[2])
 
-    click.echo("Resizing columns...")
-    set_column_widths(group_sheet)
-    set_column_widths(single)
-    set_column_widths(bulk)
-    set_column_widths(mass)
+    click.echo("Creating files...")
+    changed = create_exports(
+        FILENAME, DESCRIPTION, [single, bulk, mass, furnace, group_sheet]
+    )
 
-    click.echo("Creating file...")
-    create_export_file(FILENAME, "xlsx", DESCRIPTION, save_virtual_workbook(workbook))
+    if len(changed) == 0:
+        click.echo("Exports unchanged, skipping upload")
+        return
 
     click.echo("Purging CDN cache...")
     purge_static_cache(["exports"])
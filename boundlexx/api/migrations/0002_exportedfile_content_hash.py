@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_api"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportedfile",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="Content Hash"
+            ),
+        ),
+    ]
@@ -1,12 +1,29 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import ExportModelOperationsMixin
 
+from boundlexx.api.response_cache import bump_generation
 from config.storages import select_storage
 
+RESPONSE_CACHE_APPS = ("api", "boundless", "ingest")
+
 
 class ExportedFile(ExportModelOperationsMixin("exported_file"), models.Model):  # type: ignore # noqa E501
     name = models.CharField(_("Name"), max_length=64, unique=True)
     description = models.TextField()
     exported_file = models.FileField(storage=select_storage("exports"))
     last_updated = models.DateTimeField(auto_now=True)
+    content_hash = models.CharField(_("Content Hash"), max_length=64, blank=True)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_response_cache_generation(sender, instance=None, **kwargs):
+    if instance is None:
+        return
+
+    app_label = sender._meta.app_label  # pylint: disable=protected-access
+    if app_label in RESPONSE_CACHE_APPS:
+        bump_generation(sender, instance.pk)
@@ -1,5 +1,90 @@
+from collections import OrderedDict
+
+from django.conf import settings
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+from boundlexx.api.db import estimate_count
+
+
+class EstimatedCountMixin:
+    """
+    Counts at most `BOUNDLESS_API_COUNT_THRESHOLD` rows, past that `count` is
+    the query planner's estimate and `count_approximate` is true. Paging is
+    driven by the rows actually fetched, so it does not depend on the estimate
+    """
+
+    count_approximate = False
+
+    def get_count_threshold(self):
+        return settings.BOUNDLESS_API_COUNT_THRESHOLD
+
+    def get_count(self, queryset):
+        self.count_approximate = False
+
+        threshold = self.get_count_threshold()
+        if not threshold or isinstance(queryset, list):
+            return super().get_count(queryset)  # type: ignore
+
+        count = queryset.order_by()[: threshold + 1].count()
+        if count <= threshold:
+            return count
+
+        self.count_approximate = True
+        return max(estimate_count(queryset), count)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)  # type: ignore
+
+        if page is None or not self.count_approximate:
+            return page
+
+        # the estimate can be below the real count
+        if self.offset > self.count:  # type: ignore
+            page = list(
+                queryset[self.offset : self.offset + self.limit]  # type: ignore
+            )
+
+        if len(page) < self.limit:  # type: ignore
+            if len(page) > 0 or self.offset == 0:  # type: ignore
+                # last page, the count is exact
+                self.count = self.offset + len(page)  # type: ignore
+                self.count_approximate = False
+        else:
+            self.count = max(self.count, self.offset + self.limit + 1)  # type: ignore
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),  # type: ignore
+                    ("count_approximate", self.count_approximate),
+                    ("next", self.get_next_link()),  # type: ignore
+                    ("previous", self.get_previous_link()),  # type: ignore
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)  # type: ignore
+
+        # plain dict, the YAML schema renderer cannot represent an OrderedDict
+        properties = response_schema["properties"]
+        response_schema["properties"] = {
+            "count": properties["count"],
+            "count_approximate": {
+                "type": "boolean",
+                "description": "`count` is an estimate",
+                "example": False,
+            },
+            **{k: v for k, v in properties.items() if k != "count"},
+        }
+
+        return response_schema
 
 
-class MaxLimitOffsetPagination(LimitOffsetPagination):
+class MaxLimitOffsetPagination(EstimatedCountMixin, LimitOffsetPagination):
     max_limit = 1000
@@ -0,0 +1,47 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# datetimes are passed to DRF's `JSONEncoder` (orjson does not use a `Z`
+# suffix for UTC), as is anything orjson does not know (Decimal, lazy strings,
+# timedelta, etc.)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+default = JSONEncoder().default
+
+
+def dumps(data) -> bytes:
+    """
+    `data` as compact UTF-8 JSON, the same as DRF's `JSONRenderer` with the
+    default (compact, unicode, strict) settings
+    """
+
+    ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+    # escaped by `JSONRenderer` so the output is also valid javascript
+    if b"\xe2\x80" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return ret
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with orjson. Indented output (browsable API) and
+    data orjson cannot encode (ints larger than 64 bits, etc.) fall back to
+    the stock renderer
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
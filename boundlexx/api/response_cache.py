@@ -0,0 +1,282 @@
+"""
+Versioned server side response cache for the read-only API
+
+Rendered responses are keyed by absolute URL (scheme, host and path),
+normalized query string, renderer and the generation counters of the models
+the endpoint reads from. Writes bump the generation of the model (and
+object), so every response built from the old data stops being addressable
+without having to find or delete its keys. A global generation invalidates
+everything at once. Cached responses carry an ETag (hash of the content), so
+conditional GETs can be answered with a 304 before any query runs. There is
+no Last-Modified: bulk writes change the data without bumping a generation,
+only the content hash reliably tells if a response changed.
+
+Concurrent misses for the same key are coalesced: one request renders while
+the others in the same process wait for its result and, with
+`BOUNDLESS_API_COALESCE_LEASE`, requests in other processes wait on a Redis
+lease for the rendered response to show up in the cache.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import wraps
+from hashlib import sha256
+from typing import Iterable, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_page
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+ALL_GENERATION_KEY = "boundlexx:api:generation"
+GENERATION_KEY = "boundlexx:api:generation:{label}"
+OBJECT_GENERATION_KEY = "boundlexx:api:generation:{label}:{pk}"
+RESPONSE_KEY = "boundlexx:api:response:{digest}"
+LEASE_KEY = "boundlexx:api:lease:{key}"
+LEASE_POLL_INTERVAL = 0.05
+SCHEMA_KEY_PREFIX = "boundlexx:api:schema:{generation}"
+
+# models with detail views looked up by numeric id (`cache_models[0]` of the
+# viewset), only these get per object generations
+OBJECT_GENERATION_MODELS = frozenset(
+    (
+        "boundless.recipe",
+        "boundless.recipegroup",
+        "boundless.resourcecount",
+        "boundless.skill",
+        "boundless.skillgroup",
+        "boundless.world",
+        "boundless.worldpoll",
+        "ingest.gamefile",
+    )
+)
+
+CACHED_RESPONSES = Counter(
+    "boundlexx_api_response_cache_total",
+    "Cacheable API requests by endpoint and result (hit/miss)",
+    ["endpoint", "result"],
+)
+COALESCED_RESPONSES = Counter(
+    "boundlexx_api_coalesced_requests_total",
+    "API requests served from another request's render by endpoint and source "
+    "(local/redis)",
+    ["endpoint", "source"],
+)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Tracks the in-flight renders of this process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+
+    def join(self, key) -> tuple[_Flight, bool]:
+        """
+        Returns the flight for `key` and if the caller started it
+        """
+
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def finish(self, key, flight, result):
+        flight.result = result
+
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.done.set()
+
+
+_flights = SingleFlight()
+
+
+def generation_key(model, pk=None):
+    label = model._meta.label_lower  # pylint: disable=protected-access
+
+    if pk is None:
+        return GENERATION_KEY.format(label=label)
+    return OBJECT_GENERATION_KEY.format(label=label, pk=pk)
+
+
+def uses_object_generations(model):
+    label = model._meta.label_lower  # pylint: disable=protected-access
+    return label in OBJECT_GENERATION_MODELS
+
+
+def _bump(key, timeout=None):
+    try:
+        generation = cache.incr(key)
+    except ValueError:
+        # an expired generation restarts past any value it could have had, so
+        # responses cached under an old generation are never addressable again
+        generation = time.time_ns() // 1000
+        cache.set(key, generation, timeout=timeout)
+    else:
+        if timeout is not None:
+            cache.touch(key, timeout)
+
+    return generation
+
+
+def bump_generation(model, pk=None):
+    """
+    Invalidates cached responses built from `model` (or only the ones for the
+    `pk` object, plus every list of `model`)
+
+    The generations expire with the responses cached under them (a missing
+    generation is 0), so rows written constantly do not leave keys behind
+    """
+
+    timeout = settings.BOUNDLESS_API_RESPONSE_CACHE_TIMEOUT
+    _bump(generation_key(model), timeout)
+    if pk is not None and uses_object_generations(model):
+        _bump(generation_key(model, pk), timeout)
+
+
+def bump_all_generations():
+    return _bump(ALL_GENERATION_KEY)
+
+
+def get_generations(keys: Iterable[str]) -> list[int]:
+    keys = list(keys)
+    values = cache.get_many(keys)
+
+    return [values.get(key, 0) for key in keys]
+
+
+def get_response_key(request, generations: Iterable[int]) -> str:
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+    )
+
+    # the rendered content has absolute URLs, so the host is part of the key
+    parts = [
+        request.build_absolute_uri(request.path),
+        query,
+        request.accepted_renderer.format or "",
+        request.accepted_media_type or "",
+    ]
+    parts += [str(g) for g in generations]
+
+    return RESPONSE_KEY.format(digest=sha256("|".join(parts).encode()).hexdigest())
+
+
+def get_cached_response(key) -> Optional[tuple]:
+    """
+    Returns (status, content, content type, ETag)
+    """
+
+    return cache.get(key)
+
+
+def set_cached_response(key, response, timeout):
+    cached = (
+        response.status_code,
+        response.content,
+        response["Content-Type"],
+        quote_etag(sha256(response.content).hexdigest()),
+    )
+    cache.set(key, cached, timeout=timeout)
+
+    return cached
+
+
+def _wait_for_response(key, timeout) -> Optional[tuple]:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        time.sleep(LEASE_POLL_INTERVAL)
+
+        cached = get_cached_response(key)
+        if cached is not None:
+            return cached
+    return None
+
+
+def _render_with_lease(key, render):
+    if not settings.BOUNDLESS_API_COALESCE_LEASE:
+        return render(), None
+
+    timeout = settings.BOUNDLESS_API_COALESCE_TIMEOUT
+    lease = cache.lock(LEASE_KEY.format(key=key), expire=timeout, auto_renewal=False)
+
+    if lease.acquire(blocking=False):
+        try:
+            return render(), None
+        finally:
+            try:
+                lease.release()
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Could not release lease: %s", ex)
+
+    cached = _wait_for_response(key, timeout)
+    if cached is not None:
+        return cached, "redis"
+    return render(), None
+
+
+def coalesce(key, render) -> tuple[Optional[tuple], Optional[str]]:
+    """
+    Calls `render` (which renders and caches the response for `key` and
+    returns the cached value, or None if it is not cacheable) once for all
+    concurrent callers
+
+    Returns (cached response, source), `source` is None for the caller that
+    rendered. A None cached response for the other callers means they have
+    to render themselves
+    """
+
+    flight, started = _flights.join(key)
+    if not started:
+        flight.done.wait(settings.BOUNDLESS_API_COALESCE_TIMEOUT)
+        return flight.result, "local"
+
+    result, source = None, None
+    try:
+        result, source = _render_with_lease(key, render)
+    finally:
+        _flights.finish(key, flight, result)
+
+    return result, source
+
+
+def cache_schema_view(view, timeout):
+    """
+    `cache_page` with a key prefix that changes with the global generation
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        key_prefix = SCHEMA_KEY_PREFIX.format(
+            generation=get_generations([ALL_GENERATION_KEY])[0]
+        )
+
+        return cache_page(timeout, key_prefix=key_prefix)(view)(
+            request, *args, **kwargs
+        )
+
+    return wrapped
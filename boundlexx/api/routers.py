@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.urls import include, path
-from django.views.decorators.cache import cache_page
 from django.views.generic import TemplateView
 from rest_framework.schemas import get_schema_view
 from rest_framework_extensions.routers import ExtendedSimpleRouter
@@ -12,6 +11,7 @@ from boundlexx.api.common.views import (
     WorldForumIDView,
     WorldWSDataView,
 )
+from boundlexx.api.response_cache import cache_schema_view
 from boundlexx.api.schemas import BoundlexxSchemaGenerator
 
 ingest_urls = [
@@ -81,7 +81,7 @@ class APIDocsRouter(ExtendedSimpleRouter):
                 }
 
         if not settings.DEBUG:
-            schema_view = cache_page(86400)(schema_view)
+            schema_view = cache_schema_view(schema_view, 86400)
 
         urls = [
             path("", DocsView.as_view(), name="api-docs"),
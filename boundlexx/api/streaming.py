@@ -0,0 +1,73 @@
+"""
+Streaming (unpaginated) exports of list endpoints
+
+Rows are read with a server side cursor in chunks, the prefetches of the
+queryset are run per chunk and each chunk is serialized and written out
+before the next one is read, so memory use does not grow with the export.
+"""
+
+from typing import Iterable, Iterator
+
+from django.db.models import prefetch_related_objects
+from rest_framework.renderers import BaseRenderer
+
+from boundlexx.api.renderers import dumps
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline delimited JSON, one row per line. Only used to select the
+    export format and to render error responses
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"  # noqa A003
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data) + b"\n"
+
+
+def iter_batches(queryset, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    if isinstance(queryset, list):
+        for index in range(0, len(queryset), chunk_size):
+            yield queryset[index : index + chunk_size]
+        return
+
+    # `iterator` skips `prefetch_related`, so it is done per batch
+    prefetches = queryset._prefetch_related_lookups  # pylint: disable=protected-access
+
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+
+        if len(batch) >= chunk_size:
+            prefetch_related_objects(batch, *prefetches)
+            yield batch
+            batch = []
+
+    if len(batch) > 0:
+        prefetch_related_objects(batch, *prefetches)
+        yield batch
+
+
+def iter_ndjson(batches: Iterable[list]) -> Iterator[bytes]:
+    for rows in batches:
+        if len(rows) > 0:
+            yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def iter_json_array(batches: Iterable[list]) -> Iterator[bytes]:
+    separator = b"["
+    for rows in batches:
+        if len(rows) > 0:
+            yield separator + b",".join(dumps(row) for row in rows)
+            separator = b","
+
+    if separator == b"[":
+        yield b"["
+    yield b"]"
@@ -1,6 +1,8 @@
 import socket
 from datetime import timedelta
 from email.utils import parsedate_to_datetime
+from itertools import groupby
+from operator import itemgetter
 
 import requests
 from azure.identity import ClientSecretCredential
@@ -13,20 +15,19 @@ from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
-from openpyxl import Workbook
-from openpyxl.writer.excel import save_virtual_workbook
 from requests.exceptions import ReadTimeout
 
+from boundlexx.api.exports import ExportSheet, create_exports
+from boundlexx.api.response_cache import bump_all_generations
 from boundlexx.api.utils import (
     PURGE_CACHE_LOCK,
     PURGE_CACHE_PATHS,
     PURGE_GROUPS,
-    create_export_file,
     queue_purge_paths,
-    set_column_widths,
 )
 from boundlexx.boundless.models import Item, World, WorldBlockColor
-from boundlexx.boundless.utils import get_world_block_color_item_ids
+from boundlexx.boundless.names import annotate_default_name
+from boundlexx.boundless.registry import get_registry
 from config.celery_app import app
 
 MAX_SINGLE_PURGE = 50
@@ -92,9 +93,7 @@ def _reschedule(run_time, task_name, name, args="[]"):
 
 @app.task
 def purge_django_cache():
-    keys = cache.keys("views.decorators.cache.*")
-    for key in keys:
-        cache.delete(key)
+    bump_all_generations()
 
     for path in WARM_CACHE_PATHS:
         _reschedule_warm(timezone.now(), path)
@@ -263,72 +262,90 @@ def _warm_cache(path):
         lock.release()
 
 
-@app.task
-def create_world_colors_export():
-    workbook = Workbook()
-    workbook.active.title = "Homeworlds"
-    workbook.create_sheet("Exoworlds")
-    workbook.create_sheet("Sovereign")
-
-    homeworlds = workbook["Homeworlds"]
-    exoworlds = workbook["Exoworlds"]
-    sovereign = workbook["Sovereign"]
-    sovereign.append(["Name", "Avaiable Colors"])
+def _iter_sovereign_color_rows(items, color_names):
+    block_colors = (
+        WorldBlockColor.objects.filter(item__in=items, is_default=True)
+        .filter(
+            Q(world__isnull=True)
+            | Q(world__end__isnull=True, world__is_creative=False)
+            | Q(world__owner__isnull=False, world__is_creative=False)
+        )
+        .order_by("item__game_id", "color__game_id")
+        .distinct("item__game_id", "color__game_id")
+        .values_list("item__game_id", "color__game_id")
+    )
 
-    worlds = World.objects.filter(owner__isnull=True, is_creative=False).order_by("id")
+    colors_by_item: dict[int, list[str]] = {}
+    for item_id, color_id in block_colors.iterator(chunk_size=2000):
+        colors_by_item.setdefault(item_id, []).append(color_names[color_id])
 
-    logger.info("Generating Sovereign Color...")
-    items = Item.objects.filter(game_id__in=get_world_block_color_item_ids()).order_by(
-        "game_id"
-    )
-    headers = [
-        "Name",
-        "ID",
-    ]
     for item in items:
-        headers.append(item.english)
-
-        sovereign_columns = [item.english]
-        wbcs = (
-            WorldBlockColor.objects.filter(item=item, is_default=True)
-            .filter(
-                Q(world__isnull=True)
-                | Q(world__end__isnull=True, world__is_creative=False)
-                | Q(world__owner__isnull=False, world__is_creative=False)
-            )
-            .select_related("item")
-            .order_by("color__game_id")
-            .distinct("color__game_id")
-        )
+        yield [item.english] + colors_by_item.get(item.game_id, [])
 
-        for wbc in wbcs:
-            sovereign_columns.append(f"{wbc.color.default_name} ({wbc.color.game_id})")
 
-        sovereign.append(sovereign_columns)
+def _iter_world_color_rows(worlds, items, color_names):
+    item_indexes = {item.game_id: index for index, item in enumerate(items)}
+    block_colors = (
+        WorldBlockColor.objects.filter(
+            world__in=worlds, item__in=items, is_default=True
+        )
+        .order_by("world_id", "item__game_id")
+        .values_list("world_id", "item__game_id", "color__game_id")
+    )
+
+    # both are ordered by world ID, so the rows can be merged as they stream
+    groups = groupby(block_colors.iterator(chunk_size=2000), key=itemgetter(0))
+    group = next(groups, None)
 
-    logger.info("Generating World Rows...")
-    homeworlds.append(headers)
-    exoworlds.append(headers)
     for world in worlds:
-        columns = [world.display_name, world.id]
+        columns: list = [None] * len(items)
+
+        while group is not None and group[0] < world.id:
+            group = next(groups, None)
 
-        for wbc in world.worldblockcolor_set.filter(is_default=True).order_by(
-            "item__game_id"
-        ):
-            columns.append(f"{wbc.color.default_name} ({wbc.color.game_id})")
+        if group is not None and group[0] == world.id:
+            for _, item_id, color_id in group[1]:
+                columns[item_indexes[item_id]] = color_names[color_id]
+            group = next(groups, None)
 
+        yield world, [world.display_name, world.id] + columns
+
+
+@app.task
+def create_world_colors_export():
+    worlds = list(
+        World.objects.filter(owner__isnull=True, is_creative=False).order_by("id")
+    )
+    items = list(
+        annotate_default_name(Item.objects.filter(has_world_colors=True)).order_by(
+            "game_id"
+        )
+    )
+    color_names = {
+        color.game_id: f"{color.default_name} ({color.game_id})"
+        for color in get_registry().colors
+    }
+
+    headers = ["Name", "ID"] + [item.english for item in items]
+    homeworlds = ExportSheet("Homeworlds", headers)
+    exoworlds = ExportSheet("Exoworlds", headers)
+    sovereign = ExportSheet("Sovereign", ["Name", "Avaiable Colors"])
+
+    logger.info("Generating Sovereign Color...")
+    sovereign.extend(_iter_sovereign_color_rows(items, color_names))
+
+    logger.info("Generating World Rows...")
+    for world, columns in _iter_world_color_rows(worlds, items, color_names):
         if world.is_exo:
             exoworlds.append(columns)
         else:
             homeworlds.append(columns)
 
-    set_column_widths(homeworlds)
-    set_column_widths(exoworlds)
-    set_column_widths(sovereign)
-
-    create_export_file(
+    changed = create_exports(
         COLOR_EXPORT_FILENAME,
-        "xlsx",
         COLOR_EXPORT_DESCRIPTION,
-        save_virtual_workbook(workbook),
+        [homeworlds, exoworlds, sovereign],
     )
+
+    if len(changed) == 0:
+        logger.info("Color export unchanged, skipping upload")
@@ -1,3 +1,4 @@
+import hashlib
 from datetime import timedelta
 
 from django.conf import settings
@@ -7,7 +8,6 @@ from django.core.files.base import ContentFile
 from django.db import ProgrammingError
 from django.utils import timezone
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
-from openpyxl.utils import get_column_letter
 
 from boundlexx.api.models import ExportedFile
 
@@ -107,31 +107,32 @@ def queue_purge_paths(new_paths):
             task.save()
 
 
-def set_column_widths(sheet):
-    column_widths: list[int] = []
-    for row in sheet.rows:
-        for i, cell in enumerate(row):
-            value = str(cell.value) if cell.value is not None else ""
-
-            if len(column_widths) > i:
-                if len(value) > column_widths[i]:
-                    column_widths[i] = len(value)
-            else:
-                column_widths += [len(value)]
-
-    for i, column_width in enumerate(column_widths):
-        sheet.column_dimensions[get_column_letter(i + 1)].width = column_width + 2
-
-
 def create_export_file(name, ext, description, content):
-    xlsx_file = ContentFile(content)
-    xlsx_file.name = f"{name}.{ext}"
+    """
+    Uploads `content` as the export file `name`, skips the upload if the
+    content has not changed. Returns if the file was uploaded.
+    """
+
+    content_hash = hashlib.sha256(content).hexdigest()
 
     existing_file = ExportedFile.objects.filter(name=name).first()
     if existing_file is not None:
+        if existing_file.content_hash == content_hash:
+            if existing_file.description != description:
+                existing_file.description = description
+                existing_file.save()
+            return False
+
         existing_file.exported_file.delete()
         existing_file.delete()
 
+    export_file = ContentFile(content)
+    export_file.name = f"{name}.{ext}"
+
     ExportedFile.objects.create(
-        name=name, description=description, exported_file=xlsx_file
+        name=name,
+        description=description,
+        exported_file=export_file,
+        content_hash=content_hash,
     )
+    return True
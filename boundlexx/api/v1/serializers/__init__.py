@@ -73,7 +73,7 @@ __all__ = [
 
 
 class WorldPollDetailSerializer(WorldPollSerializer):
-    resources = ResourcesSerializer(many=True, source="resourcecount_set")
+    resources = ResourcesSerializer(many=True)
     leaderboard = LeaderboardSerializer(many=True, source="leaderboardrecord_set")
 
     class Meta:
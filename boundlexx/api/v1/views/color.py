@@ -1,4 +1,3 @@
-from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.decorators import action
@@ -11,6 +10,7 @@ from boundlexx.api.common.filters import (
     DedupedFilter,
     WorldBlockColorFilterSet,
 )
+from boundlexx.api.common.mixins import BlockColorIndexMixin
 from boundlexx.api.common.viewsets import BoundlexxReadOnlyViewSet
 from boundlexx.api.schemas import DescriptiveAutoSchema
 from boundlexx.api.utils import get_base_url, get_list_example
@@ -19,6 +19,7 @@ from boundlexx.api.v1.serializers import (
     URLBlockColorSerializer,
     URLColorSerializer,
 )
+from boundlexx.boundless.color_index import get_sovereign_blocks
 from boundlexx.boundless.models import Color, WorldBlockColor
 
 COLOR_EXAMPLE = {
@@ -55,6 +56,7 @@ class ColorViewSet(BoundlexxReadOnlyViewSet):
     )
     serializer_class = URLColorSerializer
     lookup_field = "game_id"
+    cache_action_models = {"sovereign_blocks": [WorldBlockColor]}
     filter_backends = [
         DjangoFilterBackend,
         RankedFuzzySearchFilter,
@@ -105,17 +107,7 @@ class ColorViewSet(BoundlexxReadOnlyViewSet):
 
         color = self.get_object()
 
-        queryset = (
-            WorldBlockColor.objects.filter(color=color, is_default=True)
-            .filter(
-                Q(world__isnull=True)
-                | Q(world__end__isnull=True, world__is_creative=False)
-                | Q(world__owner__isnull=False, world__is_creative=False)
-            )
-            .select_related("item")
-            .order_by("item__game_id")
-            .distinct("item__game_id")
-        )
+        queryset = get_sovereign_blocks(color)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -130,6 +122,7 @@ class ColorViewSet(BoundlexxReadOnlyViewSet):
 
 
 class BlockColorViewSet(
+    BlockColorIndexMixin,
     NestedViewSetMixin,
     BoundlexxReadOnlyViewSet,
 ):
@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -15,6 +14,7 @@ from boundlexx.api.common.filters import (
     ItemFilterSet,
     ItemResourceCountFilterSet,
 )
+from boundlexx.api.common.mixins import ItemColorIndexMixin
 from boundlexx.api.common.viewsets import BoundlexxListViewSet, BoundlexxReadOnlyViewSet
 from boundlexx.api.utils import get_base_url, get_list_example
 from boundlexx.api.v1.serializers import (
@@ -27,6 +27,7 @@ from boundlexx.api.v1.serializers import (
     URLSimpleWorldSerializer,
     URLWorldColorSerializer,
 )
+from boundlexx.boundless.color_index import get_sovereign_colors
 from boundlexx.boundless.models import (
     Item,
     ItemRequestBasketPrice,
@@ -138,6 +139,11 @@ class ItemViewSet(
     )
     serializer_class = URLItemSerializer
     lookup_field = "game_id"
+    cache_action_models = {
+        "shop_stands": [ItemShopStandPrice],
+        "request_baskets": [ItemRequestBasketPrice],
+        "sovereign_colors": [WorldBlockColor],
+    }
     filter_backends = [
         DjangoFilterBackend,
         RankedFuzzySearchFilter,
@@ -274,17 +280,7 @@ class ItemViewSet(
 
         item = self.get_object()
 
-        queryset = (
-            WorldBlockColor.objects.filter(item=item, is_default=True)
-            .filter(
-                Q(world__isnull=True)
-                | Q(world__end__isnull=True, world__is_creative=False)
-                | Q(world__owner__isnull=False, world__is_creative=False)
-            )
-            .select_related("color")
-            .order_by("color__game_id")
-            .distinct("color__game_id")
-        )
+        queryset = get_sovereign_colors(item)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -425,6 +421,7 @@ class ItemResourceCountViewSet(
 
 
 class ItemColorsViewSet(
+    ItemColorIndexMixin,
     NestedViewSetMixin,
     BoundlexxReadOnlyViewSet,
 ):
@@ -4,7 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_extensions.mixins import NestedViewSetMixin
 
-from boundlexx.api.common.mixins import TimeseriesMixin
+from boundlexx.api.common.mixins import ResourceCountVectorMixin, TimeseriesMixin
 from boundlexx.api.common.serializers import (
     ItemResourceCountTimeSeriesTBSerializer,
     WorldPollTBSerializer,
@@ -19,7 +19,17 @@ from boundlexx.api.v1.serializers import (
     URLWorldPollResourcesSerializer,
     URLWorldPollSerializer,
 )
-from boundlexx.boundless.models import ResourceCount, WorldPoll
+from boundlexx.boundless.aggregates import (
+    RESOURCE_COUNT_NUMBER_FIELDS,
+    WORLD_POLL_NUMBER_FIELDS,
+)
+from boundlexx.boundless.models import (
+    LeaderboardRecord,
+    ResourceCount,
+    WorldPoll,
+    WorldPollAggregate,
+    WorldPollResult,
+)
 
 ITEM_RESOURCE_TIMESERIES_EXAMPLE = {
     "time": "2020-08-04T09:09:50.136765-04:00",
@@ -35,7 +45,10 @@ ITEM_RESOURCE_TIMESERIES_EXAMPLE = {
 
 
 class ItemResourceTimeseriesViewSet(
-    TimeseriesMixin, NestedViewSetMixin, BoundlexxReadOnlyViewSet
+    ResourceCountVectorMixin,
+    TimeseriesMixin,
+    NestedViewSetMixin,
+    BoundlexxReadOnlyViewSet,
 ):
     schema = DescriptiveAutoSchema(tags=["items", "timeseries"])
     queryset = ResourceCount.objects.filter(
@@ -44,7 +57,8 @@ class ItemResourceTimeseriesViewSet(
     ).select_related("world_poll", "world_poll__world", "item", "item__resource_data")
     serializer_class = URLItemResourceCountTimeSeriesSerializer
     time_bucket_serializer_class = ItemResourceCountTimeSeriesTBSerializer
-    number_fields = ["count"]
+    number_fields = RESOURCE_COUNT_NUMBER_FIELDS
+    cache_models = [ResourceCount, WorldPoll]
     lookup_field = "id"
 
     def get_queryset(self):
@@ -56,7 +70,7 @@ class ItemResourceTimeseriesViewSet(
         queryset = super().get_queryset()
 
         if not self.request.user.has_perm("boundless.can_view_private"):
-            queryset = queryset.filter(world_poll__world__is_public=True)
+            queryset = queryset.filter(**{f"{self.world_lookup}__is_public": True})
 
         return queryset
 
@@ -99,12 +113,10 @@ class WorldPollViewSet(TimeseriesMixin, NestedViewSetMixin, BoundlexxReadOnlyVie
     )
     serializer_class = URLWorldPollSerializer
     time_bucket_serializer_class = WorldPollTBSerializer
-    number_fields = [
-        "worldpollresult__player_count",
-        "worldpollresult__beacon_count",
-        "worldpollresult__plot_count",
-        "worldpollresult__total_prestige",
-    ]
+    number_fields = WORLD_POLL_NUMBER_FIELDS
+    cache_models = [WorldPoll, WorldPollResult, LeaderboardRecord, ResourceCount]
+    aggregate_model = WorldPollAggregate
+    aggregate_lookups = {"world_id": "world_id"}
     lookup_field = "id"
 
     def list(self, request, *args, **kwargs):  # noqa A003
@@ -29,6 +29,7 @@ from boundlexx.boundless.models import (
     ItemShopStandPrice,
     Settlement,
     World,
+    WorldBlockColor,
     WorldDistance,
 )
 
@@ -42,6 +43,13 @@ class WorldViewSet(BoundlexxReadOnlyViewSet):
     serializer_class = KindOfSimpleWorldSerializer
     detail_serializer_class = URLWorldSerializer
     lookup_field = "id"
+    cache_action_models = {
+        "block_colors": [WorldBlockColor],
+        "shop_stands": [ItemShopStandPrice],
+        "request_baskets": [ItemRequestBasketPrice],
+        "beacons": [Beacon],
+        "settlements": [Settlement],
+    }
     filter_backends = [
         DjangoFilterBackend,
         RankedFuzzySearchFilter,
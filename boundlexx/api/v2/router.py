@@ -78,6 +78,12 @@ world_viewset.register(
     basename="world-distance",
     parents_query_lookups=["world_source__id"],
 )
+world_viewset.register(
+    "routes",
+    views.WorldRouteViewSet,
+    basename="world-route",
+    parents_query_lookups=["world_source__id"],
+)
 world_viewset.register(
     "polls",
     views.WorldPollViewSet,
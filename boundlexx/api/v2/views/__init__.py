@@ -14,7 +14,11 @@ from boundlexx.api.v2.views.timeseries import (
     ItemResourceTimeseriesViewSet,
     WorldPollViewSet,
 )
-from boundlexx.api.v2.views.world import WorldDistanceViewSet, WorldViewSet
+from boundlexx.api.v2.views.world import (
+    WorldDistanceViewSet,
+    WorldRouteViewSet,
+    WorldViewSet,
+)
 
 __all__ = [
     "BlockColorViewSet",
@@ -32,6 +36,7 @@ __all__ = [
     "SkillGroupViewSet",
     "SkillViewSet",
     "WorldDistanceViewSet",
+    "WorldRouteViewSet",
     "WorldPollViewSet",
     "WorldViewSet",
 ]
@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -15,6 +14,7 @@ from boundlexx.api.common.filters import (
     ItemFilterSet,
     ItemResourceCountFilterSet,
 )
+from boundlexx.api.common.mixins import ItemColorIndexMixin, StreamingExportMixin
 from boundlexx.api.common.serializers import (
     IDWorldSerializer,
     ItemColorSerializer,
@@ -27,6 +27,7 @@ from boundlexx.api.common.serializers import (
     WorldColorSerializer,
 )
 from boundlexx.api.common.viewsets import BoundlexxListViewSet, BoundlexxReadOnlyViewSet
+from boundlexx.boundless.color_index import get_sovereign_colors
 from boundlexx.boundless.models import (
     Item,
     ItemRequestBasketPrice,
@@ -37,7 +38,7 @@ from boundlexx.boundless.models import (
 )
 
 
-class ItemViewSet(BoundlexxReadOnlyViewSet):
+class ItemViewSet(StreamingExportMixin, BoundlexxReadOnlyViewSet):
     queryset = (
         Item.objects.filter(active=True)
         .select_related("item_subtitle", "list_type", "description")
@@ -50,6 +51,11 @@ class ItemViewSet(BoundlexxReadOnlyViewSet):
     serializer_class = SimpleItemSerializer
     detail_serializer_class = ItemSerializer
     lookup_field = "game_id"
+    cache_action_models = {
+        "shop_stands": [ItemShopStandPrice],
+        "request_baskets": [ItemRequestBasketPrice],
+        "sovereign_colors": [WorldBlockColor],
+    }
     filter_backends = [
         DjangoFilterBackend,
         RankedFuzzySearchFilter,
@@ -192,17 +198,7 @@ class ItemViewSet(BoundlexxReadOnlyViewSet):
 
         item = self.get_object()
 
-        queryset = (
-            WorldBlockColor.objects.filter(item=item, is_default=True)
-            .filter(
-                Q(world__isnull=True)
-                | Q(world__end__isnull=True, world__is_creative=False)
-                | Q(world__owner__isnull=False, world__is_creative=False)
-            )
-            .select_related("color")
-            .order_by("color__game_id")
-            .distinct("color__game_id")
-        )
+        queryset = get_sovereign_colors(item)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -217,6 +213,7 @@ class ItemViewSet(BoundlexxReadOnlyViewSet):
 
 
 class ItemResourceCountViewSet(
+    StreamingExportMixin,
     NestedViewSetMixin,
     BoundlexxReadOnlyViewSet,
 ):
@@ -306,6 +303,8 @@ class ItemResourceCountViewSet(
 
 
 class ItemColorsViewSet(
+    ItemColorIndexMixin,
+    StreamingExportMixin,
     NestedViewSetMixin,
     BoundlexxReadOnlyViewSet,
 ):
@@ -4,7 +4,11 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_extensions.mixins import NestedViewSetMixin
 
-from boundlexx.api.common.mixins import TimeseriesMixin
+from boundlexx.api.common.mixins import (
+    ResourceCountVectorMixin,
+    StreamingExportMixin,
+    TimeseriesMixin,
+)
 from boundlexx.api.common.serializers import (
     ItemResourceCountTimeSeriesSerializer,
     ItemResourceCountTimeSeriesTBSerializer,
@@ -15,11 +19,25 @@ from boundlexx.api.common.serializers import (
 )
 from boundlexx.api.common.viewsets import BoundlexxReadOnlyViewSet
 from boundlexx.api.schemas import DescriptiveAutoSchema
-from boundlexx.boundless.models import ResourceCount, WorldPoll
+from boundlexx.boundless.aggregates import (
+    RESOURCE_COUNT_NUMBER_FIELDS,
+    WORLD_POLL_NUMBER_FIELDS,
+)
+from boundlexx.boundless.models import (
+    LeaderboardRecord,
+    ResourceCount,
+    WorldPoll,
+    WorldPollAggregate,
+    WorldPollResult,
+)
 
 
 class ItemResourceTimeseriesViewSet(
-    TimeseriesMixin, NestedViewSetMixin, BoundlexxReadOnlyViewSet
+    ResourceCountVectorMixin,
+    TimeseriesMixin,
+    StreamingExportMixin,
+    NestedViewSetMixin,
+    BoundlexxReadOnlyViewSet,
 ):
     schema = DescriptiveAutoSchema(tags=["items", "timeseries"])
     queryset = ResourceCount.objects.filter(
@@ -28,7 +46,15 @@ class ItemResourceTimeseriesViewSet(
     ).select_related("world_poll", "world_poll__world", "item", "item__resource_data")
     serializer_class = ItemResourceCountTimeSeriesSerializer
     time_bucket_serializer_class = ItemResourceCountTimeSeriesTBSerializer
-    number_fields = ["count"]
+    number_fields = RESOURCE_COUNT_NUMBER_FIELDS
+    cache_models = [ResourceCount, WorldPoll]
+    columnar_fields = {
+        "time": "time",
+        "world": "world_poll__world_id",
+        "percentage": "percentage",
+        "count": "count",
+        "average_per_chunk": "average_per_chunk",
+    }
     lookup_field = "id"
 
     def get_queryset(self):
@@ -40,7 +66,7 @@ class ItemResourceTimeseriesViewSet(
         queryset = super().get_queryset()
 
         if not self.request.user.has_perm("boundless.can_view_private"):
-            queryset = queryset.filter(world_poll__world__is_public=True)
+            queryset = queryset.filter(**{f"{self.world_lookup}__is_public": True})
 
         return queryset
 
@@ -67,7 +93,12 @@ class ItemResourceTimeseriesViewSet(
     retrieve.operation_id = "retrieveItemResourceTimeseries"  # type: ignore # noqa E501
 
 
-class WorldPollViewSet(TimeseriesMixin, NestedViewSetMixin, BoundlexxReadOnlyViewSet):
+class WorldPollViewSet(
+    TimeseriesMixin,
+    StreamingExportMixin,
+    NestedViewSetMixin,
+    BoundlexxReadOnlyViewSet,
+):
     schema = DescriptiveAutoSchema(tags=["worlds", "timeseries"])
     queryset = (
         WorldPoll.objects.all()
@@ -81,12 +112,19 @@ class WorldPollViewSet(TimeseriesMixin, NestedViewSetMixin, BoundlexxReadOnlyVie
     )
     serializer_class = WorldPollSerializer
     time_bucket_serializer_class = WorldPollTBSerializer
-    number_fields = [
-        "worldpollresult__player_count",
-        "worldpollresult__beacon_count",
-        "worldpollresult__plot_count",
-        "worldpollresult__total_prestige",
-    ]
+    number_fields = WORLD_POLL_NUMBER_FIELDS
+    cache_models = [WorldPoll, WorldPollResult, LeaderboardRecord, ResourceCount]
+    columnar_fields = {
+        "id": "id",
+        "time": "time",
+        "world": "world_id",
+        "player_count": "worldpollresult__player_count",
+        "beacon_count": "worldpollresult__beacon_count",
+        "plot_count": "worldpollresult__plot_count",
+        "total_prestige": "worldpollresult__total_prestige",
+    }
+    aggregate_model = WorldPollAggregate
+    aggregate_lookups = {"world_id": "world_id"}
     lookup_field = "id"
 
     def list(self, request, *args, **kwargs):  # noqa A003
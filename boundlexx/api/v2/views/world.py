@@ -5,11 +5,13 @@ from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework_extensions.mixins import NestedViewSetMixin
 from rest_fuzzysearch.search import RankedFuzzySearchFilter
 
 from boundlexx.api.common.filters import DedupedFilter, WorldFilterSet
+from boundlexx.api.common.mixins import StreamingExportMixin
 from boundlexx.api.common.serializers import (
     BeaconSerializer,
     SettlementSerializer,
@@ -17,27 +19,44 @@ from boundlexx.api.common.serializers import (
     WorldBlockColorSerializer,
     WorldDistanceSerializer,
     WorldRequestBasketPriceSerializer,
+    WorldRouteSerializer,
     WorldSerializer,
     WorldShopStandPriceSerializer,
 )
-from boundlexx.api.common.viewsets import BoundlexxReadOnlyViewSet
+from boundlexx.api.common.viewsets import (
+    BoundlexxGenericViewSet,
+    BoundlexxReadOnlyViewSet,
+)
+from boundlexx.boundless.distances import (
+    ROUTE_COST,
+    ROUTE_METRICS,
+    get_route_planner,
+)
 from boundlexx.boundless.models import (
     Beacon,
     ItemRequestBasketPrice,
     ItemShopStandPrice,
     Settlement,
     World,
+    WorldBlockColor,
     WorldDistance,
 )
 
 logger = getLogger(__file__)
 
 
-class WorldViewSet(BoundlexxReadOnlyViewSet):
+class WorldViewSet(StreamingExportMixin, BoundlexxReadOnlyViewSet):
     queryset = World.objects.all()
     serializer_class = SimpleWorldSerializer
     detail_serializer_class = WorldSerializer
     lookup_field = "id"
+    cache_action_models = {
+        "block_colors": [WorldBlockColor],
+        "shop_stands": [ItemShopStandPrice],
+        "request_baskets": [ItemRequestBasketPrice],
+        "beacons": [Beacon],
+        "settlements": [Settlement],
+    }
     filter_backends = [
         DjangoFilterBackend,
         RankedFuzzySearchFilter,
@@ -347,3 +366,64 @@ class WorldDistanceViewSet(NestedViewSetMixin, BoundlexxReadOnlyViewSet):
         Retrieves the distance to a specific world
         """
         return super().retrieve(request, *args, **kwargs)  # pylint: disable=no-member
+
+
+class WorldRouteViewSet(NestedViewSetMixin, BoundlexxGenericViewSet):
+    queryset = World.objects.filter(active=True)
+    serializer_class = WorldRouteSerializer
+    lookup_field = "id"
+    filter_backends: list = []
+
+    def retrieve(
+        self,
+        request,
+        world_source__id=None,
+        id=None,  # pylint: disable=redefined-builtin # noqa A002
+    ):
+        """
+        Retrieves the shortest route between two active worlds
+
+        `by` picks what to minimize: `cost` (warp cost, default), `portal`
+        (portal cost) or `distance` (blinksecs)
+        """
+
+        by = request.query_params.get("by", ROUTE_COST)
+        if by not in ROUTE_METRICS:
+            raise ValidationError({"by": f"Must be one of {', '.join(ROUTE_METRICS)}"})
+
+        planner = get_route_planner(
+            public_only=not request.user.has_perm("boundless.can_view_private")
+        )
+
+        try:
+            route = planner.route(int(world_source__id), int(id), by)
+        except (TypeError, ValueError) as ex:
+            raise Http404 from ex
+
+        if route is None:
+            raise Http404
+
+        total, world_ids = route
+        worlds = World.objects.in_bulk(world_ids)
+        hops = [
+            WorldDistance(
+                world_source=worlds[source_id],
+                world_dest=worlds[dest_id],
+                distance=planner.distance(source_id, dest_id),
+            )
+            for source_id, dest_id in zip(world_ids, world_ids[1:])
+        ]
+
+        serializer = self.get_serializer(
+            {
+                "world_source": worlds[world_ids[0]],
+                "world_dest": worlds[world_ids[-1]],
+                "by": by,
+                "total": total,
+                "hops": hops,
+            }
+        )
+
+        return Response(serializer.data)
+
+    retrieve.operation_id = "retrieveWorldRoute"  # type: ignore # noqa E501
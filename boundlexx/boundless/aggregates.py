@@ -0,0 +1,310 @@
+"""
+Materialized timeseries stats
+
+The `/stats` endpoints compute Avg, Mode, Median, Min, Max, StdDev and
+Variance over raw `WorldPoll`/`ResourceCount` rows. For the standard bucket
+sizes those stats are materialized per world (and item) and refreshed
+incrementally by recomputing from the newest stored bucket onward.
+
+Reads use the materialized buckets for the part of the requested range that
+has been refreshed and raw rows for the rest (the open bucket, the partial
+buckets at the edges of the time range and anything newer than the last
+refresh), so a lagging refresh only costs speed, not freshness.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    F,
+    Func,
+    Max,
+    Min,
+    Q,
+    StdDev,
+    Value,
+    Variance,
+)
+
+from boundlexx.api.db import ArrayIndex, Median, Mode
+from boundlexx.boundless.registry import get_registry
+
+AGGREGATE_BUCKETS = (
+    timedelta(hours=1),
+    timedelta(days=1),
+    timedelta(weeks=1),
+)
+# `time_bucket` aligns buckets to 2000-01-03 (a Monday)
+BUCKET_ORIGIN = datetime(2000, 1, 3, tzinfo=timezone.utc)
+# raw range recomputed per transaction while refreshing
+REFRESH_WINDOW = timedelta(weeks=4)
+
+STATS_FUNCTIONS = [Avg, Mode, Median, Min, Max, StdDev, Variance]
+WORLD_POLL_NUMBER_FIELDS = [
+    "worldpollresult__player_count",
+    "worldpollresult__beacon_count",
+    "worldpollresult__plot_count",
+    "worldpollresult__total_prestige",
+]
+RESOURCE_COUNT_NUMBER_FIELDS = ["count"]
+
+BUCKET_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+BUCKET_RE = re.compile(r"^\s*(\d+)\s*(minute|hour|day|week)s?\s*$", re.IGNORECASE)
+
+
+def get_stats_aggregates(number_fields, functions=None) -> dict[str, Func]:
+    if functions is None:
+        functions = STATS_FUNCTIONS
+
+    aggregates: dict[str, Func] = {}
+    for field in number_fields:
+        for func in functions:
+            name = func.__name__.lower()
+
+            if name == "avg":
+                name = "average"
+
+            aggregates[f"{field}_{name}"] = func(field)
+
+    return aggregates
+
+
+def time_bucket(bucket, field="time"):
+    return Func(Value(bucket), F(field), function="time_bucket")
+
+
+def parse_bucket(value) -> Optional[timedelta]:
+    """
+    Parses a `bucket` query param (`1 day`, `24 hours`, etc.), returns None
+    for anything that is not a plain minute/hour/day/week interval
+    """
+
+    match = BUCKET_RE.match(value or "")
+    if match is None:
+        return None
+
+    return int(match.group(1)) * BUCKET_UNITS[match.group(2).lower()]
+
+
+def get_aggregate_bucket(value) -> Optional[timedelta]:
+    if not settings.BOUNDLESS_TIMESERIES_AGGREGATES:
+        return None
+
+    bucket = parse_bucket(value)
+    if bucket not in AGGREGATE_BUCKETS:
+        return None
+    return bucket
+
+
+def floor_bucket(value: datetime, bucket: timedelta) -> datetime:
+    return BUCKET_ORIGIN + ((value - BUCKET_ORIGIN) // bucket) * bucket
+
+
+def ceil_bucket(value: datetime, bucket: timedelta) -> datetime:
+    start = floor_bucket(value, bucket)
+    if start < value:
+        start += bucket
+    return start
+
+
+def get_bucket_stats(queryset, aggregates, bucket, number_fields, start, stop):
+    """
+    Stats for `queryset` (filtered and `time_bucket` annotated raw rows) per
+    bucket from the materialized `aggregates` where possible. Returns None if
+    none of the requested range is materialized yet
+    """
+
+    end = aggregates.aggregate(end=Max("time_bucket"))["end"]
+    if end is None:
+        return None
+
+    # the newest materialized bucket may still be open, it is always raw
+    if stop is not None:
+        end = min(end, floor_bucket(stop, bucket))
+
+    begin = None
+    if start is not None:
+        begin = ceil_bucket(start, bucket)
+        if begin >= end:
+            return None
+
+    materialized = aggregates.filter(time_bucket__lt=end)
+    raw_range = Q(time__gte=end)
+    if begin is not None:
+        materialized = materialized.filter(time_bucket__gte=begin)
+        raw_range |= Q(time__lt=begin)
+
+    rows = [
+        {"time_bucket": bucket_time, **stats}
+        for bucket_time, stats in materialized.values_list("time_bucket", "stats")
+    ]
+
+    stats_aggregates = get_stats_aggregates(number_fields)
+    rows += list(
+        queryset.filter(raw_range)
+        .values("time_bucket")
+        .annotate(**stats_aggregates)
+        .values("time_bucket", *stats_aggregates)
+        .order_by()
+    )
+
+    rows.sort(key=lambda r: r["time_bucket"], reverse=True)
+    return rows
+
+
+def _get_refresh_start(model, bucket, raw_queryset) -> Optional[datetime]:
+    # the newest stored bucket may have been partial, so it is redone
+    start = model.objects.filter(bucket=bucket).aggregate(start=Max("time_bucket"))[
+        "start"
+    ]
+
+    if start is None:
+        start = raw_queryset.aggregate(start=Min("time"))["start"]
+        if start is None:
+            return None
+        start = floor_bucket(start, bucket)
+
+    return start
+
+
+def _refresh(model, bucket, raw_queryset, build_rows, now):
+    start = _get_refresh_start(model, bucket, raw_queryset)
+    if start is None:
+        return 0
+
+    created = 0
+    while start <= now:
+        end = start + REFRESH_WINDOW
+
+        rows = build_rows(
+            raw_queryset.filter(time__gte=start, time__lt=end).annotate(
+                time_bucket=time_bucket(bucket)
+            )
+        )
+
+        with transaction.atomic():
+            model.objects.filter(
+                bucket=bucket, time_bucket__gte=start, time_bucket__lt=end
+            ).delete()
+            model.objects.bulk_create(
+                [model(bucket=bucket, **row) for row in rows], batch_size=1000
+            )
+
+        created += len(rows)
+        start = end
+
+    return created
+
+
+def _group_rows(queryset, keys, number_fields):
+    stats_aggregates = get_stats_aggregates(number_fields)
+
+    rows = []
+    for row in (
+        queryset.values(*keys.values(), "time_bucket")
+        .annotate(**stats_aggregates)
+        .order_by()
+    ):
+        rows.append(
+            {
+                "time_bucket": row["time_bucket"],
+                "stats": {name: row[name] for name in stats_aggregates},
+                **{key: row[field] for key, field in keys.items()},
+            }
+        )
+
+    return rows
+
+
+def refresh_world_poll_aggregates(bucket, now):
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        WorldPoll,
+        WorldPollAggregate,
+    )
+
+    return _refresh(
+        WorldPollAggregate,
+        bucket,
+        WorldPoll.objects.all(),
+        lambda queryset: _group_rows(
+            queryset, {"world_id": "world_id"}, WORLD_POLL_NUMBER_FIELDS
+        ),
+        now,
+    )
+
+
+def _build_compact_resource_rows(queryset):
+    items = get_registry().items_by_id
+
+    rows = []
+    for index, game_id in enumerate(settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING):
+        item = items.get(game_id)
+        if item is None:
+            continue
+
+        item_rows = _group_rows(
+            queryset.annotate(count=ArrayIndex("resource_counts", index)).filter(
+                count__gt=0
+            ),
+            {"world_id": "world_id"},
+            RESOURCE_COUNT_NUMBER_FIELDS,
+        )
+        for row in item_rows:
+            row["item_id"] = item.id
+        rows += item_rows
+
+    return rows
+
+
+def refresh_resource_count_aggregates(bucket, now):
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        ResourceCount,
+        ResourceCountAggregate,
+        WorldPoll,
+    )
+
+    if settings.BOUNDLESS_COMPACT_RESOURCE_COUNTS:
+        return _refresh(
+            ResourceCountAggregate,
+            bucket,
+            WorldPoll.objects.filter(resource_counts__isnull=False),
+            _build_compact_resource_rows,
+            now,
+        )
+
+    return _refresh(
+        ResourceCountAggregate,
+        bucket,
+        ResourceCount.objects.all(),
+        lambda queryset: _group_rows(
+            queryset,
+            {"world_id": "world_poll__world_id", "item_id": "item_id"},
+            RESOURCE_COUNT_NUMBER_FIELDS,
+        ),
+        now,
+    )
+
+
+def refresh_aggregates(now=None, log=None):
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    for bucket in AGGREGATE_BUCKETS:
+        created = refresh_world_poll_aggregates(bucket, now)
+        if log is not None:
+            log(f"Refreshed {created} world poll aggregate(s) for {bucket}")
+
+        created = refresh_resource_count_aggregates(bucket, now)
+        if log is not None:
+            log(f"Refreshed {created} resource count aggregate(s) for {bucket}")
@@ -0,0 +1,263 @@
+"""
+Bitmap inverted index of (item, color) -> worlds for world block colors
+
+Each (item game ID, color game ID) pair stores three values: a bitmap of the
+worlds with a default (spawn) color, a bitmap of the worlds where the color is
+currently active and if there is a world-less default (Sovereign choice) row.
+Bits are world IDs. World class/status (active, public, Sovereign choice) are
+world level bitmaps that are ANDed in at query time, so only WBC writes touch
+the per pair bitmaps.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+INDEX_VERSION_KEY = "boundless:color_index:version"
+INDEX_ITEM_KEY = "boundless:color_index:{version}:item:{item_id}"
+INDEX_COLOR_KEY = "boundless:color_index:{version}:color:{color_id}"
+INDEX_LOCK = "boundless:color_index:lock"
+WORLD_MASKS_KEY = "boundless:color_index:worlds"
+INDEX_TIMEOUT = 86400
+WORLD_MASKS_TIMEOUT = 300
+
+DEFAULT = 0
+ACTIVE = 1
+PLACEHOLDER = 2
+
+Entries = dict[int, list]
+
+
+def _version():
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        version = invalidate_color_index()
+    return version
+
+
+def invalidate_color_index():
+    try:
+        return cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, 1, timeout=None)
+        return 1
+
+
+def invalidate_world_masks():
+    cache.delete(WORLD_MASKS_KEY)
+
+
+def _block_colors():
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        WorldBlockColor,
+    )
+
+    return WorldBlockColor.objects.filter(
+        Q(world__isnull=True)
+        | Q(
+            world__is_creative=False,
+            world_id__lt=settings.BOUNDLESS_EXO_EXPIRED_BASE_ID,
+        )
+    )
+
+
+def _build_entries(queryset, key_field) -> Entries:
+    entries: Entries = {}
+
+    for key, world_id, is_default, active in queryset.values_list(
+        key_field, "world_id", "is_default", "active"
+    ):
+        entry = entries.setdefault(key, [0, 0, False])
+
+        if world_id is None:
+            entry[PLACEHOLDER] = entry[PLACEHOLDER] or is_default
+            continue
+
+        if is_default:
+            entry[DEFAULT] |= 1 << world_id
+        if active:
+            entry[ACTIVE] |= 1 << world_id
+
+    return entries
+
+
+def get_item_colors(item_id) -> Entries:
+    """
+    Returns {color game ID: [default bits, active bits, placeholder]}
+    """
+
+    key = INDEX_ITEM_KEY.format(version=_version(), item_id=item_id)
+
+    entries = cache.get(key)
+    if entries is None:
+        entries = _build_entries(
+            _block_colors().filter(item__game_id=item_id), "color__game_id"
+        )
+        cache.set(key, entries, timeout=INDEX_TIMEOUT)
+
+    return entries
+
+
+def get_color_items(color_id) -> Entries:
+    """
+    Returns {item game ID: [default bits, active bits, placeholder]}
+    """
+
+    key = INDEX_COLOR_KEY.format(version=_version(), color_id=color_id)
+
+    entries = cache.get(key)
+    if entries is None:
+        entries = _build_entries(
+            _block_colors().filter(color__game_id=color_id), "item__game_id"
+        )
+        cache.set(key, entries, timeout=INDEX_TIMEOUT)
+
+    return entries
+
+
+def update_color_index(item_id, color_id):
+    """
+    Rebuilds the entry for a single (item game ID, color game ID) pair
+    """
+
+    version = _version()
+    pair = _build_entries(
+        _block_colors().filter(item__game_id=item_id, color__game_id=color_id),
+        "color__game_id",
+    ).get(color_id)
+
+    item_key = INDEX_ITEM_KEY.format(version=version, item_id=item_id)
+    color_key = INDEX_COLOR_KEY.format(version=version, color_id=color_id)
+
+    with cache.lock(INDEX_LOCK, expire=10):
+        for key, other_id in ((item_key, color_id), (color_key, item_id)):
+            entries = cache.get(key)
+
+            # not built yet, will be built from the database on next read
+            if entries is None:
+                continue
+
+            if pair is None:
+                entries.pop(other_id, None)
+            else:
+                entries[other_id] = list(pair)
+            cache.set(key, entries, timeout=INDEX_TIMEOUT)
+
+
+def get_world_masks() -> dict[str, int]:
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        World,
+    )
+
+    masks = cache.get(WORLD_MASKS_KEY)
+    if masks is not None:
+        return masks
+
+    masks = {"active": 0, "public": 0, "sovereign_choice": 0}
+    worlds = World.objects.filter(
+        is_creative=False, id__lt=settings.BOUNDLESS_EXO_EXPIRED_BASE_ID
+    ).values_list("id", "active", "is_public", "end", "owner")
+
+    for world_id, active, is_public, end, owner in worlds:
+        bit = 1 << world_id
+
+        if active:
+            masks["active"] |= bit
+        if is_public:
+            masks["public"] |= bit
+        if end is None or owner is not None:
+            masks["sovereign_choice"] |= bit
+
+    cache.set(WORLD_MASKS_KEY, masks, timeout=WORLD_MASKS_TIMEOUT)
+    return masks
+
+
+def _lowest_world(bits) -> Optional[int]:
+    if bits == 0:
+        return None
+    return (bits & -bits).bit_length() - 1
+
+
+def iter_world_ids(bits):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def get_sovereign_choices(entries: Entries) -> list[int]:
+    """
+    Game IDs from `entries` that can be picked as a Sovereign color/block:
+    a world-less default row or a default on a Homeworld/Sovereign
+    """
+
+    mask = get_world_masks()["sovereign_choice"]
+
+    return sorted(
+        key
+        for key, entry in entries.items()
+        if entry[PLACEHOLDER] or entry[DEFAULT] & mask
+    )
+
+
+def get_active_worlds(entries: Entries, public_only=True) -> dict[int, int]:
+    """
+    {game ID: bitmap of active public (optionally) worlds} for active colors
+    """
+
+    masks = get_world_masks()
+    mask = masks["active"]
+    if public_only:
+        mask &= masks["public"]
+
+    worlds = {}
+    for key, entry in entries.items():
+        bits = entry[ACTIVE] & mask
+        if bits:
+            worlds[key] = bits
+    return worlds
+
+
+def get_first_active_worlds(entries: Entries, public_only=True) -> dict[int, int]:
+    return {
+        key: _lowest_world(bits)  # type: ignore
+        for key, bits in get_active_worlds(entries, public_only).items()
+    }
+
+
+def get_sovereign_colors(item):
+    """
+    Unsaved `WorldBlockColor`s for each color that can be picked for `item`
+    on a Sovereign
+    """
+
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        Color,
+        WorldBlockColor,
+    )
+
+    color_ids = get_sovereign_choices(get_item_colors(item.game_id))
+    colors = Color.objects.filter(game_id__in=color_ids).order_by("game_id")
+
+    return [WorldBlockColor(item=item, color=color) for color in colors]
+
+
+def get_sovereign_blocks(color):
+    """
+    Unsaved `WorldBlockColor`s for each block that can be picked for `color`
+    on a Sovereign
+    """
+
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        Item,
+        WorldBlockColor,
+    )
+
+    item_ids = get_sovereign_choices(get_color_items(color.game_id))
+    items = Item.objects.filter(game_id__in=item_ids).order_by("game_id")
+
+    return [WorldBlockColor(item=item, color=color) for item in items]
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+from django.core.cache import cache
+
+from boundlexx.boundless.game import BoundlessClient, World as SimpleWorld
+
+logger = logging.getLogger(__name__)
+
+DISTANCE_VERSION_KEY = "boundless:world_distances:version"
+MISSING = -1
+
+_matrix: Optional[WorldDistanceMatrix] = None
+
+
+class WorldDistanceMatrix:
+    """
+    Dense, symmetric matrix of the known distances between all active worlds
+    """
+
+    def __init__(self, world_ids, matrix, version=None):
+        self.world_ids = world_ids
+        self.matrix = matrix
+        self.version = version
+        self._index = {world_id: index for index, world_id in enumerate(world_ids)}
+
+    @classmethod
+    def load(cls, version=None):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            World,
+            WorldDistance,
+        )
+
+        world_ids = np.array(
+            World.objects.filter(active=True)
+            .order_by("id")
+            .values_list("id", flat=True),
+            dtype=np.int64,
+        )
+        size = len(world_ids)
+        matrix = np.full((size, size), MISSING, dtype=np.int16)
+
+        rows = np.array(
+            WorldDistance.objects.filter(
+                world_source__active=True, world_dest__active=True
+            ).values_list("world_source_id", "world_dest_id", "distance"),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+
+        if len(rows) > 0:
+            sources = np.searchsorted(world_ids, rows[:, 0])
+            dests = np.searchsorted(world_ids, rows[:, 1])
+            matrix[sources, dests] = rows[:, 2]
+            matrix[dests, sources] = rows[:, 2]
+
+        return cls(world_ids.tolist(), matrix, version=version)
+
+    def __contains__(self, world_id):
+        return world_id in self._index
+
+    def __iter__(self):
+        return iter(self.world_ids)
+
+    def get(self, world_id_1, world_id_2) -> Optional[int]:
+        index_1 = self._index.get(world_id_1)
+        index_2 = self._index.get(world_id_2)
+
+        if index_1 is None or index_2 is None:
+            return None
+
+        distance = int(self.matrix[index_1, index_2])
+        if distance == MISSING:
+            return None
+        return distance
+
+    def missing_pairs(self, world_ids: Iterable[int]) -> list[tuple[int, int]]:
+        pairs = set()
+
+        for world_id in world_ids:
+            index = self._index.get(world_id)
+            if index is None:
+                continue
+
+            for dest_index in np.flatnonzero(self.matrix[index] == MISSING):
+                pairs.add(tuple(sorted((index, int(dest_index)))))
+
+        return [
+            (self.world_ids[source], self.world_ids[dest])
+            for source, dest in sorted(pairs)
+        ]
+
+
+def get_distance_matrix() -> WorldDistanceMatrix:
+    global _matrix  # pylint: disable=global-statement
+
+    version = cache.get(DISTANCE_VERSION_KEY)
+    if version is None:
+        version = bump_distance_version()
+
+    if _matrix is None or _matrix.version != version:
+        _matrix = WorldDistanceMatrix.load(version=version)
+
+    return _matrix
+
+
+def bump_distance_version():
+    try:
+        return cache.incr(DISTANCE_VERSION_KEY)
+    except ValueError:
+        cache.set(DISTANCE_VERSION_KEY, 1, timeout=None)
+        return 1
+
+
+def fetch_distance(client, world_source, world_dest) -> int:
+    if world_source.id == world_dest.id:
+        return 0
+
+    distance = client.get_world_distance(
+        SimpleWorld(world_source.id, world_source.api_url),
+        SimpleWorld(world_dest.id, world_dest.api_url),
+    )
+    # value is returned as a float, no idea how cost formula works
+    # with non-whole numbers
+    if distance is None or not distance.is_integer():
+        raise ValueError(
+            "Unexpected distance number: "
+            f"{world_source.id} to {world_dest.id} = {distance}"
+        )
+
+    return int(distance)
+
+
+def backfill_distances(pairs, client=None, batch_size=100):
+    """
+    Fetches and bulk inserts the distance for each (source, dest) pair,
+    requests go through the client's DS rate limiter
+    """
+
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        World,
+        WorldDistance,
+    )
+
+    if len(pairs) == 0:
+        return 0
+
+    if client is None:
+        client = BoundlessClient()
+
+    worlds = World.objects.in_bulk({world_id for pair in pairs for world_id in pair})
+
+    created = 0
+    distances: list[WorldDistance] = []
+    for source_id, dest_id in pairs:
+        try:
+            distance = fetch_distance(client, worlds[source_id], worlds[dest_id])
+        except ValueError as ex:
+            logger.warning(ex)
+            continue
+
+        distances.append(
+            WorldDistance(
+                world_source_id=source_id, world_dest_id=dest_id, distance=distance
+            )
+        )
+
+        if len(distances) >= batch_size:
+            created += len(WorldDistance.objects.bulk_create(distances))
+            bump_distance_version()
+            distances = []
+
+    if len(distances) > 0:
+        created += len(WorldDistance.objects.bulk_create(distances))
+        bump_distance_version()
+
+    return created
+
+
+ROUTE_COST = "cost"
+ROUTE_PORTAL = "portal"
+ROUTE_DISTANCE = "distance"
+ROUTE_METRICS = (ROUTE_COST, ROUTE_PORTAL, ROUTE_DISTANCE)
+
+_planners: dict[bool, WorldRoutePlanner] = {}
+
+
+class WorldRoutePlanner:
+    """
+    All-pairs shortest routes between active worlds (Floyd-Warshall) by warp
+    cost, portal cost or blinksecs. Computed lazily per metric.
+    """
+
+    def __init__(self, matrix: WorldDistanceMatrix, public_only=True):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            World,
+        )
+
+        self.version = matrix.version
+
+        worlds = World.objects.in_bulk(matrix.world_ids)
+        indexes = np.array(
+            [
+                index
+                for index, world_id in enumerate(matrix.world_ids)
+                if not public_only or worlds[world_id].is_public
+            ],
+            dtype=np.int64,
+        )
+
+        self.world_ids = [matrix.world_ids[index] for index in indexes]
+        self.distances = matrix.matrix[np.ix_(indexes, indexes)].astype(np.float64)
+        self.distances[self.distances == MISSING] = np.inf
+        self.is_creative = np.array(
+            [bool(worlds[i].is_creative) for i in self.world_ids], dtype=bool
+        )
+        self.is_exo = np.array([worlds[i].is_exo for i in self.world_ids], dtype=bool)
+
+        self._index = {world_id: index for index, world_id in enumerate(self.world_ids)}
+        self._routes: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _weights(self, metric):
+        with np.errstate(invalid="ignore"):
+            return self._calculate_weights(metric)
+
+    def _calculate_weights(self, metric):
+        d = self.distances
+        any_creative = self.is_creative[:, None] | self.is_creative[None, :]
+
+        if metric == ROUTE_DISTANCE:
+            weights = d.copy()
+        elif metric == ROUTE_COST:
+            # mirrors `WorldDistance.cost`
+            remaining = np.maximum(d - 14, 0)
+            weights = np.where(
+                d < 13,
+                100 + np.maximum(d - 1, 0) * 80,
+                1100 + (remaining // 5) * 400 + (remaining % 5) * 100,
+            )
+            weights[any_creative] = 0
+        else:
+            # mirrors `WorldDistance.min_portal_cost`
+            both_creative = self.is_creative[:, None] & self.is_creative[None, :]
+            any_exo = self.is_exo[:, None] | self.is_exo[None, :]
+
+            weights = np.where(
+                d < 3, 1, np.where(d < 5, 2, np.minimum((d - 5) // 3 + 3, 9))
+            ).astype(np.float64)
+            weights[any_creative] = 0
+            weights[any_exo | (d > 25) | (any_creative & ~both_creative)] = np.inf
+
+        weights[np.isinf(d)] = np.inf
+        np.fill_diagonal(weights, 0)
+        return weights
+
+    def _compute(self, metric):
+        if metric not in self._routes:
+            costs = self._weights(metric)
+            size = len(self.world_ids)
+            next_hop = np.tile(np.arange(size), (size, 1))
+            next_hop[np.isinf(costs)] = -1
+
+            for k in range(size):
+                via = costs[:, k, None] + costs[None, k, :]
+                better = via < costs
+                costs = np.where(better, via, costs)
+                next_hop = np.where(better, next_hop[:, k, None], next_hop)
+
+            self._routes[metric] = (costs, next_hop)
+        return self._routes[metric]
+
+    def distance(self, source_id, dest_id) -> Optional[int]:
+        distance = self.distances[self._index[source_id], self._index[dest_id]]
+        if np.isinf(distance):
+            return None
+        return int(distance)
+
+    def route(self, source_id, dest_id, metric=ROUTE_COST):
+        """
+        Returns `(total, [world_id, ...])` or `None` if there is no route
+        """
+
+        source = self._index.get(source_id)
+        dest = self._index.get(dest_id)
+        if source is None or dest is None:
+            return None
+
+        costs, next_hop = self._compute(metric)
+        if np.isinf(costs[source, dest]):
+            return None
+
+        path = [source]
+        while path[-1] != dest:
+            path.append(int(next_hop[path[-1], dest]))
+
+        return float(costs[source, dest]), [self.world_ids[i] for i in path]
+
+
+def get_route_planner(public_only=True) -> WorldRoutePlanner:
+    matrix = get_distance_matrix()
+
+    planner = _planners.get(public_only)
+    if planner is None or planner.version != matrix.version:
+        planner = WorldRoutePlanner(matrix, public_only=public_only)
+        _planners[public_only] = planner
+
+    return planner
@@ -0,0 +1,53 @@
+import time
+
+import djclick as click
+from django.db import connection, reset_queries
+from django.test.utils import override_settings
+
+from boundlexx.boundless.models import Color, Item
+
+
+def _run(lookup, game_ids, rounds):
+    reset_queries()
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        for game_id in game_ids:
+            lookup(game_id)
+
+    elapsed = time.perf_counter() - start
+    total = rounds * len(game_ids)
+
+    return elapsed / total * 1000, len(connection.queries) / total
+
+
+@click.command()
+@click.option("-n", "--count", type=int, default=200, help="Objects per round")
+@click.option("-r", "--rounds", type=int, default=3, help="Rounds to run")
+def command(count, rounds):
+    """
+    Compares single object lookups via the polymorphic `objects` manager and
+    the plain `fast` manager
+    """
+
+    for model in (Item, Color):
+        game_ids = list(
+            model.fast.order_by("game_id").values_list("game_id", flat=True)[:count]
+        )
+        if len(game_ids) == 0:
+            click.echo(f"No {model.__name__} objects to benchmark")
+            continue
+
+        benchmarks = (
+            ("objects", lambda game_id, m=model: m.objects.get(game_id=game_id)),
+            ("fast", lambda game_id, m=model: m.fast.get(game_id=game_id)),
+        )
+
+        click.echo(f"{model.__name__}.get(game_id=...) x {len(game_ids) * rounds}")
+        with override_settings(DEBUG=True):
+            for name, lookup in benchmarks:
+                per_lookup, queries = _run(lookup, game_ids, rounds)
+                click.echo(
+                    f"  {name:<8} {per_lookup:8.3f}ms/lookup  "
+                    f"{queries:.2f} queries/lookup"
+                )
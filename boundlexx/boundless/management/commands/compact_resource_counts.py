@@ -0,0 +1,46 @@
+import djclick as click
+from django.conf import settings
+from django.db.models import Max
+
+from boundlexx.boundless.models import ResourceCount, WorldPoll
+
+
+@click.command()
+@click.option(
+    "-d",
+    "--delete",
+    is_flag=True,
+    help="Delete resource count rows that are not for the newest poll of a world",
+)
+def command(delete):
+    resource_order = settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING
+    indexes = {item_id: index for index, item_id in enumerate(resource_order)}
+
+    world_polls = WorldPoll.objects.filter(resource_counts__isnull=True)
+    total = world_polls.count()
+
+    click.echo("Building resource count vectors...")
+    with click.progressbar(
+        world_polls.iterator(), length=total, show_pos=True, show_percent=True
+    ) as pbar:
+        for world_poll in pbar:
+            vector = [0] * len(resource_order)
+            for item_id, count in ResourceCount.objects.filter(
+                world_poll=world_poll
+            ).values_list("item__game_id", "count"):
+                if item_id in indexes:
+                    vector[indexes[item_id]] = count
+
+            WorldPoll.objects.filter(id=world_poll.id).update(resource_counts=vector)
+
+    if delete:
+        click.echo("Deleting old resource count rows...")
+        latest_polls = (
+            WorldPoll.objects.values("world_id")
+            .annotate(latest=Max("id"))
+            .values_list("latest", flat=True)
+        )
+        deleted, _ = ResourceCount.objects.exclude(
+            world_poll_id__in=list(latest_polls)
+        ).delete()
+        click.echo(f"Deleted {deleted} rows")
@@ -0,0 +1,23 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boundless", "0004_auto_20220920_2328"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worldpoll",
+            name="resource_counts",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.PositiveIntegerField(),
+                blank=True,
+                help_text="Raw resource counts ordered by resource mapping",
+                null=True,
+                size=None,
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+def populate_item_flags(apps, schema_editor):
+    Item = apps.get_model("boundless", "Item")
+    ItemColorVariant = apps.get_model("boundless", "ItemColorVariant")
+    ItemMetalVariant = apps.get_model("boundless", "ItemMetalVariant")
+    WorldBlockColor = apps.get_model("boundless", "WorldBlockColor")
+
+    Item.objects.update(
+        has_colors=models.Exists(
+            ItemColorVariant.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+        has_world_colors=models.Exists(
+            WorldBlockColor.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+        has_metal_variants=models.Exists(
+            ItemMetalVariant.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boundless", "0005_worldpoll_resource_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="has_colors",
+            field=models.BooleanField(
+                db_index=True, default=False, help_text="Has color variants"
+            ),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="has_metal_variants",
+            field=models.BooleanField(
+                db_index=True, default=False, help_text="Has metal variants"
+            ),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="has_world_colors",
+            field=models.BooleanField(
+                db_index=True,
+                default=False,
+                help_text="Color varies from world to world (rock, grass, wood, etc.)",
+            ),
+        ),
+        migrations.RunPython(populate_item_flags, migrations.RunPython.noop),
+    ]
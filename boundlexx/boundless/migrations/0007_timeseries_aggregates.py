@@ -0,0 +1,83 @@
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boundless", "0006_item_capability_flags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorldPollAggregate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DurationField()),
+                ("time_bucket", models.DateTimeField()),
+                (
+                    "stats",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                (
+                    "world",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="boundless.world",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("bucket", "world", "time_bucket")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ResourceCountAggregate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DurationField()),
+                ("time_bucket", models.DateTimeField()),
+                (
+                    "stats",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="boundless.item"
+                    ),
+                ),
+                (
+                    "world",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="boundless.world",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("bucket", "world", "item", "time_bucket")},
+            },
+        ),
+    ]
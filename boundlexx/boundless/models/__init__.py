@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from boundlexx.api.utils import PURGE_GROUPS, queue_purge_paths
+from boundlexx.boundless.color_index import invalidate_world_masks, update_color_index
 from boundlexx.boundless.models.game import (
     AltItem,
     Block,
@@ -30,6 +31,7 @@ from boundlexx.boundless.models.game import (
     Skill,
     SkillGroup,
     Subtitle,
+    refresh_item_flags,
 )
 from boundlexx.boundless.models.shop import (
     ItemBuyRank,
@@ -45,12 +47,14 @@ from boundlexx.boundless.models.world import (
     BeaconScan,
     LeaderboardRecord,
     ResourceCount,
+    ResourceCountAggregate,
     Settlement,
     World,
     WorldBlockColor,
     WorldCreatureColor,
     WorldDistance,
     WorldPoll,
+    WorldPollAggregate,
     WorldPollResult,
 )
 
@@ -86,6 +90,7 @@ __all__ = [
     "RecipeLevel",
     "RecipeRequirement",
     "ResourceCount",
+    "ResourceCountAggregate",
     "ResourceData",
     "ResourceDataBestWorld",
     "Settlement",
@@ -97,6 +102,7 @@ __all__ = [
     "WorldCreatureColor",
     "WorldDistance",
     "WorldPoll",
+    "WorldPollAggregate",
     "WorldPollResult",
 ]
 
@@ -208,3 +214,39 @@ def queue_purge_cache_block_colors(sender, instance=None, **kwargs):
         paths[index] = path.replace("{color_id}", str(instance.color.game_id))
 
     queue_purge_paths(paths)
+
+
+@receiver(post_save, sender=WorldBlockColor)
+@receiver(post_delete, sender=WorldBlockColor)
+def update_color_index_block_colors(sender, instance=None, **kwargs):
+    if instance is None:
+        return
+
+    update_color_index(instance.item.game_id, instance.color.game_id)
+
+
+@receiver(post_save, sender=World)
+@receiver(post_delete, sender=World)
+def invalidate_color_index_worlds(sender, instance=None, **kwargs):
+    if instance is None:
+        return
+
+    invalidate_world_masks()
+
+
+@receiver(post_save, sender=WorldBlockColor)
+def set_item_has_world_colors(sender, instance=None, created=False, **kwargs):
+    if instance is None or not created:
+        return
+
+    Item.fast.filter(id=instance.item_id, has_world_colors=False).update(
+        has_world_colors=True
+    )
+
+
+@receiver(post_delete, sender=WorldBlockColor)
+def refresh_item_has_world_colors(sender, instance=None, **kwargs):
+    if instance is None:
+        return
+
+    refresh_item_flags([instance.item_id])
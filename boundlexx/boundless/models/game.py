@@ -3,19 +3,14 @@ from __future__ import annotations
 import re
 
 from django.contrib.postgres.indexes import GinIndex
-from django.core.cache import cache
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import ExportModelOperationsMixin
 from polymorphic.models import PolymorphicManager, PolymorphicModel
 
-from boundlexx.boundless.utils import (
-    get_block_color_item_ids,
-    get_block_metal_item_ids,
-    get_next_rank_update,
-    get_world_block_color_item_ids,
-)
+from boundlexx.boundless.names import get_default_name
+from boundlexx.boundless.utils import get_next_rank_update
 from config.storages import select_storage
 
 
@@ -24,10 +19,27 @@ class GameObjManager(PolymorphicManager):
         return super().get_queryset().prefetch_related("localizedname")
 
 
+class FastGameObjQuerySet(models.QuerySet):
+    def with_localizations(self):
+        return self.prefetch_related("localizedname_set")
+
+
+class FastGameObjManager(models.Manager.from_queryset(FastGameObjQuerySet)):  # type: ignore # noqa E501
+    """
+    Plain (non-polymorphic, no prefetch) manager for hot internal lookups
+    where the model class is already known (`Item.fast.get(game_id=...)`).
+    Use `objects` for anything serialized by the API.
+    """
+
+
 class GameObj(PolymorphicModel):
     active = models.BooleanField(_("Active"), default=True)
     game_id = models.IntegerField(_("Game ID"), db_index=True)
 
+    # declared first, the default manager has to stay polymorphic
+    objects = PolymorphicManager()
+    fast = FastGameObjManager()
+
     class Meta:
         unique_together = ("game_id", "polymorphic_ctype")
         ordering = ["game_id"]
@@ -54,12 +66,7 @@ class GameObj(PolymorphicModel):
 
     @cached_property
     def default_name(self):
-        localized_name = cache.get(self.localization_cache_key)
-
-        if localized_name is None:
-            localized_name = self.localized_names.get("english")
-            cache.set(self.localization_cache_key, localized_name, timeout=300)
-        return localized_name
+        return get_default_name(self)
 
 
 class LocalizedName(ExportModelOperationsMixin("localized_name"), PolymorphicModel):  # type: ignore # noqa E501
@@ -317,6 +324,17 @@ class Item(ExportModelOperationsMixin("item"), GameObj):  # type: ignore # noqa
     default_color = models.ForeignKey(
         Color, on_delete=models.CASCADE, blank=True, null=True
     )
+    has_colors = models.BooleanField(
+        default=False, db_index=True, help_text=_("Has color variants")
+    )
+    has_world_colors = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text=_("Color varies from world to world (rock, grass, wood, etc.)"),
+    )
+    has_metal_variants = models.BooleanField(
+        default=False, db_index=True, help_text=_("Has metal variants")
+    )
 
     image = models.ImageField(storage=select_storage("items"), blank=True, null=True)
     image_small = models.ImageField(
@@ -344,18 +362,6 @@ class Item(ExportModelOperationsMixin("item"), GameObj):  # type: ignore # noqa
     def sell_locations(self):
         return self.itemrequestbasketprice_set.filter(active=True)
 
-    @property
-    def has_colors(self):
-        return self.game_id in get_block_color_item_ids()
-
-    @property
-    def has_world_colors(self):
-        return self.game_id in get_world_block_color_item_ids()
-
-    @property
-    def has_metal_variants(self):
-        return self.game_id in get_block_metal_item_ids()
-
     @property
     def next_shop_stand_update(self):
         return get_next_rank_update(self.itemsellrank_set.all())
@@ -747,3 +753,30 @@ class ItemMetalVariant(ExportModelOperationsMixin("item_metal_variant"), models.
     @property
     def lookup_id(self):
         return f"{self.item.game_id}_{self.metal.game_id}"
+
+
+def refresh_item_flags(item_ids=None):
+    """
+    Recalculates the denormalized `has_colors`, `has_world_colors` and
+    `has_metal_variants` flags for all items (or the items with `item_ids`)
+    """
+
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        WorldBlockColor,
+    )
+
+    items = Item.fast.all()
+    if item_ids is not None:
+        items = items.filter(id__in=item_ids)
+
+    return items.update(
+        has_colors=models.Exists(
+            ItemColorVariant.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+        has_world_colors=models.Exists(
+            WorldBlockColor.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+        has_metal_variants=models.Exists(
+            ItemMetalVariant.objects.filter(item_id=models.OuterRef("pk"))
+        ),
+    )
@@ -2,26 +2,42 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from decimal import Decimal
 
 import pytz
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import GinIndex
-from django.core.cache import cache
-from django.db import models, transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import ExportModelOperationsMixin
 
-from boundlexx.boundless.game import BoundlessClient, Location
-from boundlexx.boundless.game import Settlement as SimpleSettlement
-from boundlexx.boundless.game import World as SimpleWorld
-from boundlexx.boundless.models.game import Block, Color, Item, Skill
+from boundlexx.boundless.color_index import (
+    invalidate_color_index,
+    invalidate_world_masks,
+    update_color_index,
+)
+from boundlexx.boundless.distances import (
+    bump_distance_version,
+    fetch_distance,
+    get_distance_matrix,
+)
+from boundlexx.boundless.game import (
+    BoundlessClient,
+    Location,
+    Settlement as SimpleSettlement,
+)
+from boundlexx.boundless.models.game import Color, Item
+from boundlexx.boundless.registry import get_registry
 from boundlexx.boundless.utils import (
     calculate_extra_names,
     convert_linear_rgb_to_hex,
     convert_linear_rgb_to_srgb,
+    get_html_name_renderer,
     get_next_rank_update,
     html_name,
 )
@@ -31,7 +47,7 @@ from boundlexx.utils.models import ModelDiffMixin
 from config.storages import select_storage
 
 PORTAL_CONDUITS = [2, 3, 4, 6, 8, 10, 15, 18, 24]
-PROTECTION_SKILLS_CACHE = "boundless:protection_skills"
+TWO_PLACES = Decimal("0.01")
 
 User = get_user_model()
 
@@ -59,6 +75,8 @@ class WorldManager(models.Manager):
 
             WorldBlockColor.objects.filter(world_id=old_id).update(world_id=world.id)
             World.objects.filter(id=old_id).delete()
+            invalidate_color_index()
+            invalidate_world_masks()
 
             return world
         return None
@@ -507,13 +525,8 @@ class World(  # pylint: disable=too-many-public-methods
 
     @cached_property
     def protection_skill(self):
-        skills = cache.get(PROTECTION_SKILLS_CACHE)
-        if skills is None:
-            skills = list(Skill.objects.filter(group__name="Exploration"))
-            cache.set(PROTECTION_SKILLS_CACHE, skills, timeout=86400)
-
         protection_skill = None
-        for skill in skills:
+        for skill in get_registry().get_skills("Exploration"):
             if skill.name.startswith(self.atmosphere_name):
                 protection_skill = skill
                 break
@@ -570,36 +583,31 @@ class World(  # pylint: disable=too-many-public-methods
         return settings.BOUNDLESS_WORLD_LIQUIDS[key][1]
 
     def _get_distance_to_world(self, world, client=None):
-        distance_obj = WorldDistance.objects.filter(
-            models.Q(world_source=self, world_dest=world)
-            | models.Q(world_source=world, world_dest=self)
-        ).first()
-
-        distance = 0.0
-        if distance_obj is None:
-            if world.id != self.id:
-                if client is None:
-                    client = BoundlessClient()
+        matrix = get_distance_matrix()
 
-                distance = client.get_world_distance(
-                    SimpleWorld(self.id, self.api_url),
-                    SimpleWorld(world.id, world.api_url),
+        if self.id in matrix and world.id in matrix:
+            distance = matrix.get(self.id, world.id)
+            if distance is not None:
+                return WorldDistance(
+                    world_source=self, world_dest=world, distance=distance
                 )
-                # value is returned as a float, no idea how cost formula works
-                # with non-whole numbers
-                if (
-                    distance is None
-                    or distance is not None
-                    and not distance.is_integer()
-                ):
-                    raise ValueError(
-                        "Unexpected distance number: "
-                        f"{self.id} to {world.id} = {distance}"
-                    )
+            distance_obj = None
+        else:
+            distance_obj = WorldDistance.objects.filter(
+                models.Q(world_source=self, world_dest=world)
+                | models.Q(world_source=world, world_dest=self)
+            ).first()
+
+        if distance_obj is None:
+            if client is None:
+                client = BoundlessClient()
 
             distance_obj = WorldDistance.objects.create(
-                world_source=self, world_dest=world, distance=int(distance)
+                world_source=self,
+                world_dest=world,
+                distance=fetch_distance(client, self, world),
             )
+            bump_distance_version()
 
         return distance_obj
 
@@ -731,7 +739,259 @@ class WorldDistance(ExportModelOperationsMixin("world_distance"), models.Model):
         return PORTAL_CONDUITS[self.min_portal_cost - 1]
 
 
+WBC_UPDATE_TIME_SQL = """
+UPDATE {wbc} wbc
+SET "time" = w.start
+FROM {world} w
+WHERE wbc.world_id = w.id
+  AND w.start IS NOT NULL
+  AND wbc."time" IS DISTINCT FROM w.start
+  AND {target_filter}
+"""
+
+# is_new uses a window over (item, color); the world lookups need the first/last
+# world by start among rows before the target's time, so they are LATERAL joins
+WBC_RECALCULATE_SQL = """
+WITH transforms AS (
+    SELECT *
+    FROM unnest(%(transform_items)s::integer[], %(transform_sources)s::integer[])
+        AS t(item_id, source_item_id)
+),
+candidates AS (
+    SELECT
+        wbc.item_id,
+        wbc.color_id,
+        wbc."time",
+        wbc.world_id,
+        w.start,
+        (w."end" IS NULL OR w.owner IS NOT NULL) AS is_non_exo,
+        (wbc.world_id IS NOT NULL AND w."end" IS NOT NULL AND w.owner IS NULL)
+            AS is_exo,
+        MIN(wbc."time") FILTER (WHERE w."end" IS NULL OR w.owner IS NOT NULL)
+            OVER (PARTITION BY wbc.item_id, wbc.color_id) AS first_non_exo_time
+    FROM {wbc} wbc
+    LEFT JOIN {world} w ON w.id = wbc.world_id
+    WHERE wbc.is_default AND (wbc.world_id IS NULL OR w.is_creative = FALSE)
+),
+targets AS (
+    SELECT
+        wbc.id,
+        wbc.item_id,
+        wbc.color_id,
+        wbc."time",
+        COALESCE(w.is_creative, FALSE) AS is_creative,
+        EXISTS (SELECT 1 FROM transforms tr WHERE tr.item_id = wbc.item_id)
+            AS has_transforms,
+        NOT EXISTS (
+            SELECT 1
+            FROM candidates c
+            WHERE c.item_id = wbc.item_id
+              AND c.color_id = wbc.color_id
+              AND c.first_non_exo_time < wbc."time"
+        ) AS no_earlier_non_exo
+    FROM {wbc} wbc
+    LEFT JOIN {world} w ON w.id = wbc.world_id
+    WHERE {target_filter}
+),
+calculated AS (
+    SELECT
+        t.id,
+        (NOT t.is_creative AND t.no_earlier_non_exo) AS is_new,
+        first_non_exo.world_id AS first_world_id,
+        last_exo.world_id AS last_exo_id,
+        (
+            NOT t.is_creative
+            AND t.no_earlier_non_exo
+            AND t.has_transforms
+            AND transform_first.found IS NULL
+        ) AS is_new_transform,
+        transform_first.world_id AS transform_first_world_id,
+        transform_last.world_id AS transform_last_exo_id
+    FROM targets t
+    LEFT JOIN LATERAL (
+        SELECT c.world_id
+        FROM candidates c
+        WHERE c.item_id = t.item_id
+          AND c.color_id = t.color_id
+          AND c.is_non_exo
+          AND c."time" < t."time"
+        ORDER BY c.start ASC
+        LIMIT 1
+    ) first_non_exo ON NOT t.is_creative
+    LEFT JOIN LATERAL (
+        SELECT c.world_id
+        FROM candidates c
+        WHERE c.item_id = t.item_id
+          AND c.color_id = t.color_id
+          AND c.is_exo
+          AND c."time" < t."time"
+        ORDER BY c.start DESC
+        LIMIT 1
+    ) last_exo ON NOT t.is_creative
+    LEFT JOIN LATERAL (
+        SELECT TRUE AS found, c.world_id
+        FROM candidates c
+        JOIN transforms tr ON tr.source_item_id = c.item_id
+        WHERE tr.item_id = t.item_id
+          AND c.color_id = t.color_id
+          AND c.is_non_exo
+          AND c."time" < t."time"
+        ORDER BY c.start ASC
+        LIMIT 1
+    ) transform_first
+        ON NOT t.is_creative AND t.no_earlier_non_exo AND t.has_transforms
+    LEFT JOIN LATERAL (
+        SELECT c.world_id
+        FROM candidates c
+        JOIN transforms tr ON tr.source_item_id = c.item_id
+        WHERE tr.item_id = t.item_id
+          AND c.color_id = t.color_id
+          AND c.is_exo
+          AND c."time" < t."time"
+        ORDER BY c.start DESC
+        LIMIT 1
+    ) transform_last
+        ON NOT t.is_creative AND t.no_earlier_non_exo AND t.has_transforms
+)
+UPDATE {wbc} wbc
+SET
+    is_new = calculated.is_new,
+    first_world_id = calculated.first_world_id,
+    last_exo_id = calculated.last_exo_id,
+    is_new_transform = calculated.is_new_transform,
+    transform_first_world_id = calculated.transform_first_world_id,
+    transform_last_exo_id = calculated.transform_last_exo_id
+FROM calculated
+WHERE wbc.id = calculated.id
+  AND (
+    wbc.is_new IS DISTINCT FROM calculated.is_new
+    OR wbc.first_world_id IS DISTINCT FROM calculated.first_world_id
+    OR wbc.last_exo_id IS DISTINCT FROM calculated.last_exo_id
+    OR wbc.is_new_transform IS DISTINCT FROM calculated.is_new_transform
+    OR wbc.transform_first_world_id
+        IS DISTINCT FROM calculated.transform_first_world_id
+    OR wbc.transform_last_exo_id IS DISTINCT FROM calculated.transform_last_exo_id
+  )
+"""
+
+
+def _get_change(world, block_color):
+    # `time` of world colors is synced to the world start
+    time = block_color.time
+    if world is not None and world.start is not None:
+        time = world.start
+
+    return block_color.item_id, block_color.color_id, time
+
+
 class WorldBlockColorManager(models.Manager):
+    def _get_transform_params(self):
+        groups = settings.BOUNDLESS_TRANSFORMATION_GROUPS
+        game_ids = set(groups.keys())
+        for source_ids in groups.values():
+            game_ids.update(source_ids)
+
+        items = get_registry().items_by_id
+        item_ids = {
+            game_id: items[game_id].id for game_id in game_ids if game_id in items
+        }
+
+        transform_items, transform_sources = [], []
+        for game_id, source_ids in groups.items():
+            if game_id not in item_ids:
+                continue
+
+            for source_id in source_ids:
+                if source_id in item_ids:
+                    transform_items.append(item_ids[game_id])
+                    transform_sources.append(item_ids[source_id])
+
+        return {
+            "transform_items": transform_items,
+            "transform_sources": transform_sources,
+        }
+
+    def _get_target_filter(self, world_ids=None, max_age=None, groups=None):
+        filters = ["TRUE"]
+        params: dict = {}
+
+        if world_ids is not None:
+            filters.append("wbc.world_id = ANY(%(world_ids)s)")
+            params["world_ids"] = [int(i) for i in world_ids]
+        if max_age is not None:
+            filters.append('wbc."time" >= %(max_age)s')
+            params["max_age"] = max_age
+        if groups is not None:
+            filters.append(
+                "(wbc.item_id, wbc.color_id) IN (SELECT * FROM unnest("
+                "%(group_items)s::integer[], %(group_colors)s::integer[]))"
+            )
+            params["group_items"] = [g[0] for g in groups]
+            params["group_colors"] = [g[1] for g in groups]
+
+        return " AND ".join(filters), params
+
+    def get_affected_groups(self, groups):
+        """
+        Returns the (item, color) groups whose history can change when colors
+        in `groups` are added or changed, `groups` plus their transform targets
+        """
+
+        groups = {(int(item_id), int(color_id)) for item_id, color_id in groups}
+
+        transform_params = self._get_transform_params()
+        targets: dict[int, list[int]] = {}
+        for item_id, source_id in zip(
+            transform_params["transform_items"],
+            transform_params["transform_sources"],
+        ):
+            targets.setdefault(source_id, []).append(item_id)
+
+        for item_id, color_id in list(groups):
+            for target_id in targets.get(item_id, []):
+                groups.add((target_id, color_id))
+
+        return sorted(groups)
+
+    def recalculate_history(self, world_ids=None, max_age=None, groups=None):
+        """
+        Recalculates the `time` and the history fields (`is_new`,
+        `first_world`, `last_exo`, `is_new_transform`, `transform_first_world`,
+        `transform_last_exo`) with set based SQL
+
+        `time` is synced for the rows matching `world_ids`/`max_age`, the
+        history fields for the rows that also are in `groups` (if given)
+
+        Returns the number of rows updated by each step
+        """
+
+        tables = {
+            "wbc": self.model._meta.db_table,
+            "world": World._meta.db_table,
+        }
+
+        time_filter, time_params = self._get_target_filter(world_ids, max_age)
+        if groups is not None:
+            # rows from other worlds in the affected groups need recalculated
+            world_ids = None
+        target_filter, params = self._get_target_filter(world_ids, max_age, groups)
+        params.update(self._get_transform_params())
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                WBC_UPDATE_TIME_SQL.format(target_filter=time_filter, **tables),
+                time_params,
+            )
+            times_updated = cursor.rowcount
+
+            cursor.execute(
+                WBC_RECALCULATE_SQL.format(target_filter=target_filter, **tables),
+                params,
+            )
+            history_updated = cursor.rowcount
+
+        return times_updated, history_updated
+
     def _get_default_sovereign_wbc(self, world, item):
         block_color = self.filter(world=world, item=item, is_default=True).first()
 
@@ -780,38 +1040,37 @@ class WorldBlockColorManager(models.Manager):
             not default and world.owner is not None and block_color.color != color
         ):
             if world.owner is not None:
-                self.filter(world=world, item=item, active=True).update(active=False)
+                replaced = self.filter(world=world, item=item, active=True)
+                color_ids = list(replaced.values_list("color__game_id", flat=True))
+                replaced.update(active=False)
+
+                for color_id in color_ids:
+                    update_color_index(item.game_id, color_id)
 
             created = True
             block_color = self.create(
                 world=world, item=item, color=color, active=True, is_default=default
             )
         elif block_color.color != color:
+            old_color_id = block_color.color.game_id
             block_color.color = color
             block_color.save()
 
-        return block_color, created
+            update_color_index(item.game_id, old_color_id)
 
-    def _get_blocks(self, attr, **lookup):
-        block_cache: dict[str, Block] = {}
-        blocks = Block.objects.filter(**lookup).select_related("block_item")
-        for block in blocks.all():
-            block_cache[getattr(block, attr)] = block
+        return block_color, created
 
-        return block_cache
+    def _get_blocks(self, blocks, keys):
+        return {key: blocks[key] for key in keys if key in blocks}
 
     def _get_blocks_by_name(self, names):
-        return self._get_blocks("name", name__in=names)
+        return self._get_blocks(get_registry().blocks_by_name, names)
 
     def _get_blocks_by_id(self, ids):
-        return self._get_blocks("game_id", game_id__in=ids)
+        return self._get_blocks(get_registry().blocks_by_id, ids)
 
     def _get_colors(self):
-        colors = {}
-        for color in Color.objects.all():
-            colors[color.game_id] = color
-
-        return colors
+        return dict(get_registry().colors_by_id)
 
     def _get_wbcs(self, **lookup):
         wbcs = self.filter(**lookup).select_related("item", "world", "color")
@@ -886,6 +1145,7 @@ class WorldBlockColorManager(models.Manager):
 
     def _create_default_colors(self, world, default_colors, user=None):
         block_colors = {}
+        changed = []
 
         wbcs = self._get_wbcs(world=world, is_default=True)
 
@@ -894,8 +1154,11 @@ class WorldBlockColorManager(models.Manager):
 
             if block_color is not None:
                 if block_color.color != default_color[1]:
+                    # the old color's history changes as well
+                    changed.append(_get_change(world, block_color))
                     block_color.color = default_color[1]
                     block_color.save()
+                    changed.append(_get_change(world, block_color))
             else:
                 block_color = self.create(
                     world=world,
@@ -906,11 +1169,12 @@ class WorldBlockColorManager(models.Manager):
                     uploader=user,
                 )
                 block_colors[block_color.item.game_id] = block_color
+                changed.append(_get_change(world, block_color))
 
-        return block_colors
+        return block_colors, changed
 
     def _create_unknown_colors(self, possible_colors, default_colors, user=None):
-        block_colors_created = 0
+        created = []
 
         all_wbcs = (
             self.filter(is_default=True)
@@ -934,7 +1198,7 @@ class WorldBlockColorManager(models.Manager):
             for color in pcolors:
                 if color.game_id not in ecolors:
                     new_color_ids.add(color.game_id)
-                    self.create(
+                    block_color = self.create(
                         world=None,
                         item=item,
                         color=color,
@@ -942,7 +1206,7 @@ class WorldBlockColorManager(models.Manager):
                         active=False,
                         uploader=user,
                     )
-                    block_colors_created += 1
+                    created.append(_get_change(None, block_color))
 
             if item.game_id in default_colors:
                 wbc = default_colors[item.game_id]
@@ -952,13 +1216,14 @@ class WorldBlockColorManager(models.Manager):
 
             if len(new_color_ids) > 0:
                 new_color_ids_list = list(new_color_ids)
+                colors_by_id = get_registry().colors_by_id
                 send_color_update_notification(
                     item,
-                    Color.objects.filter(game_id__in=new_color_ids_list),
+                    [colors_by_id[c] for c in new_color_ids_list if c in colors_by_id],
                     new_color_ids_list,
                 )
 
-        return block_colors_created
+        return created
 
     def _log(self, logger, *args):
         if logger is not None:
@@ -994,7 +1259,10 @@ class WorldBlockColorManager(models.Manager):
         return default_colors, possible_colors
 
     def create_colors_from_wc(self, world, color_data, logger=None, user=None):
-        block_colors_created = 0
+        """
+        Returns the number of colors created, the (item, color) groups of the
+        created or changed colors and the earliest (world start) time of them
+        """
 
         default_colors, possible_colors = self._get_possible(color_data, logger)
 
@@ -1005,18 +1273,28 @@ class WorldBlockColorManager(models.Manager):
             len(possible_colors),
         )
 
-        new_block_colors = self._create_default_colors(world, default_colors, user=user)
-        block_colors_created += len(new_block_colors)
+        new_block_colors, changed = self._create_default_colors(
+            world, default_colors, user=user
+        )
+        block_colors_created = len(new_block_colors)
 
         if block_colors_created > 0:
             world.save(force=True)
 
         self._log(logger, "Created %s default", block_colors_created)
-        block_colors_created += self._create_unknown_colors(
+        created = self._create_unknown_colors(
             possible_colors, new_block_colors, user=user
         )
+        block_colors_created += len(created)
 
-        return block_colors_created
+        changed += created
+        groups = sorted({(item_id, color_id) for item_id, color_id, _ in changed})
+
+        return (
+            block_colors_created,
+            groups,
+            min((time for _, _, time in changed), default=None),
+        )
 
 
 class WorldBlockColor(ExportModelOperationsMixin("world_block_color"), models.Model):  # type: ignore # noqa E501
@@ -1151,52 +1429,95 @@ class WorldCreatureColor(ExportModelOperationsMixin("world_creature_color"), mod
         unique_together = ("world", "creature_type")
 
 
-class WorldPollManager(models.Manager):
-    def _create_resource_counts(self, world_poll, resources_list):
-        resource_order = settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING
+def get_resource_items(item_ids=None):
+    if item_ids is None:
+        item_ids = settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING
 
-        resources = []
-        embedded_total = 0
-        surface_total = 0
+    items = get_registry().items_by_id
 
-        for index, amount in enumerate(resources_list):
-            if amount == 0:
-                continue
+    return {game_id: items[game_id] for game_id in item_ids if game_id in items}
 
-            item_id = resource_order[index]
-            item = Item.objects.select_related("resource_data").get(game_id=item_id)
 
-            is_embedded = False
-            if hasattr(item, "resource_data"):
-                is_embedded = item.resource_data.is_embedded
-            resources.append((item, amount, is_embedded))
+def _is_embedded(item):
+    if hasattr(item, "resource_data"):
+        return item.resource_data.is_embedded
+    return False
 
-            if is_embedded:
-                embedded_total += amount
-            else:
-                surface_total += amount
 
-        for item_data in resources:
-            item, amount, is_embedded = item_data[0], item_data[1], item_data[2]
+def calculate_resource_counts(world_poll, resources_list, items=None):
+    """
+    Builds unsaved `ResourceCount` objects from a raw resource count vector
+    ordered by `BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING`
+    """
 
-            if is_embedded:
-                total = embedded_total
-            else:
-                total = surface_total
-
-            ResourceCount.objects.create(
-                world_poll=world_poll,
-                item=item,
-                count=amount,
-                percentage=(amount / total) * 100,
-                average_per_chunk=amount / pow(world_poll.world.size, 2),
-            )
+    resource_order = settings.BOUNDLESS_WORLD_POLL_RESOURCE_MAPPING
+
+    if items is None:
+        items = get_resource_items()
+
+    resources = []
+    embedded_total = 0
+    surface_total = 0
+
+    for index, amount in enumerate(resources_list):
+        if not amount:
+            continue
+
+        item = items[resource_order[index]]
+        is_embedded = _is_embedded(item)
+        resources.append((item, amount, is_embedded))
+
+        if is_embedded:
+            embedded_total += amount
+        else:
+            surface_total += amount
+
+    size = pow(world_poll.world.size, 2)
+    resource_counts = []
+    for item, amount, is_embedded in resources:
+        if is_embedded:
+            total = embedded_total
+        else:
+            total = surface_total
+
+        resource_count = ResourceCount(
+            time=world_poll.time,
+            world_poll=world_poll,
+            item=item,
+            count=amount,
+            percentage=Decimal(amount / total * 100).quantize(TWO_PLACES),
+            average_per_chunk=Decimal(amount / size).quantize(TWO_PLACES),
+        )
+        resource_count.is_embedded = is_embedded
+        resource_counts.append(resource_count)
+
+    resource_counts.sort(key=lambda r: r.count, reverse=True)
+    return resource_counts
+
+
+class WorldPollManager(models.Manager):
+    def _create_resource_counts(self, world_poll, resources_list):
+        resource_counts = calculate_resource_counts(world_poll, resources_list)
+
+        for resource_count in resource_counts:
+            resource_count.time = timezone.now()
+            resource_count.save(force_insert=True)
+
+        if settings.BOUNDLESS_COMPACT_RESOURCE_COUNTS:
+            # history is served from `WorldPoll.resource_counts`, only the
+            # rows for the newest poll are needed for the current counts
+            ResourceCount.objects.filter(
+                world_poll__world_id=world_poll.world_id,
+                world_poll__resource_counts__isnull=False,
+            ).exclude(world_poll_id=world_poll.id).delete()
 
     def create_from_game_dict(self, world_dict, poll_dict, world=None, new_world=False):
         if world is None:
             world, new_world = World.objects.get_or_create_from_game_dict(world_dict)
 
-        world_poll = self.create(world=world)
+        world_poll = self.create(
+            world=world, resource_counts=list(poll_dict["resources"])
+        )
 
         WorldPollResult.objects.create(
             world_poll=world_poll,
@@ -1208,7 +1529,7 @@ class WorldPollManager(models.Manager):
 
         self._create_resource_counts(world_poll, poll_dict["resources"])
 
-        colors = Color.objects.all()
+        colors = get_registry().colors
         for rank, leader in enumerate(poll_dict["leaderboard"]):
             rank += 1
 
@@ -1263,6 +1584,12 @@ class WorldPoll(ExportModelOperationsMixin("world_poll"), models.Model):  # type
     world = models.ForeignKey("World", on_delete=models.CASCADE)
     active = models.BooleanField(db_index=True, default=True)
     time = models.DateTimeField(auto_now_add=True)
+    resource_counts = ArrayField(
+        models.PositiveIntegerField(),
+        blank=True,
+        null=True,
+        help_text=_("Raw resource counts ordered by resource mapping"),
+    )
 
     @property
     def result(self):
@@ -1272,6 +1599,8 @@ class WorldPoll(ExportModelOperationsMixin("world_poll"), models.Model):  # type
 
     @property
     def resources(self):
+        if self.resource_counts is not None:
+            return calculate_resource_counts(self, self.resource_counts)
         return self.resourcecount_set.all()
 
     @property
@@ -1322,6 +1651,52 @@ class ResourceCount(ExportModelOperationsMixin("resource_count"), models.Model):
         return False
 
 
+class WorldPollAggregate(models.Model):
+    """
+    Materialized `WorldPoll`/`WorldPollResult` stats for a world per time
+    bucket, see `boundlexx.boundless.aggregates`
+    """
+
+    bucket = models.DurationField()
+    time_bucket = models.DateTimeField()
+    world = models.ForeignKey("World", on_delete=models.CASCADE)
+    stats = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        unique_together = (
+            "bucket",
+            "world",
+            "time_bucket",
+        )
+
+    def __str__(self):
+        return f"{self.world} @ {self.time_bucket} ({self.bucket})"
+
+
+class ResourceCountAggregate(models.Model):
+    """
+    Materialized `ResourceCount` stats for an item on a world per time bucket,
+    see `boundlexx.boundless.aggregates`
+    """
+
+    bucket = models.DurationField()
+    time_bucket = models.DateTimeField()
+    world = models.ForeignKey("World", on_delete=models.CASCADE)
+    item = models.ForeignKey("Item", on_delete=models.CASCADE)
+    stats = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        unique_together = (
+            "bucket",
+            "world",
+            "item",
+            "time_bucket",
+        )
+
+    def __str__(self):
+        return f"{self.item} for {self.world} @ {self.time_bucket} ({self.bucket})"
+
+
 class LeaderboardRecord(ExportModelOperationsMixin("leaderboard_record"), models.Model):  # type: ignore # noqa E501
     time = models.DateTimeField(auto_now_add=True, primary_key=True)
     world_poll = models.ForeignKey("WorldPoll", on_delete=models.CASCADE)
@@ -1424,6 +1799,55 @@ class SettlementManager(models.Manager):
             html_name=html_name(settlement.name, colors=colors),
         )
 
+    def sync_from_game_objs(
+        self, world, settlements: list[SimpleSettlement], render_name=None
+    ):
+        if render_name is None:
+            render_name = get_html_name_renderer()
+
+        existing = {(s.location_x, s.location_z): s for s in self.filter(world=world)}
+        incoming = {(s.location.x, s.location.z): s for s in settlements}
+
+        to_create = []
+        to_update = []
+        for key, settlement in incoming.items():
+            current = existing.pop(key, None)
+
+            if current is None:
+                to_create.append(
+                    Settlement(
+                        world=world,
+                        location_x=settlement.location.x,
+                        location_z=settlement.location.z,
+                        prestige=settlement.prestige,
+                        name=settlement.name,
+                        text_name=render_name(settlement.name, strip=True),
+                        html_name=render_name(settlement.name),
+                    )
+                )
+            elif (
+                current.prestige != settlement.prestige
+                or current.name != settlement.name
+            ):
+                if current.name != settlement.name:
+                    current.name = settlement.name
+                    current.text_name = render_name(settlement.name, strip=True)
+                    current.html_name = render_name(settlement.name)
+                current.prestige = settlement.prestige
+                to_update.append(current)
+
+        with transaction.atomic():
+            if len(existing) > 0:
+                self.filter(id__in=[s.id for s in existing.values()]).delete()
+            if len(to_update) > 0:
+                self.bulk_update(
+                    to_update, ["prestige", "name", "text_name", "html_name"]
+                )
+            if len(to_create) > 0:
+                self.bulk_create(to_create)
+
+        return len(to_create), len(to_update), len(existing)
+
 
 class Settlement(ExportModelOperationsMixin("settlement"), models.Model):  # type: ignore # noqa E501
     class RankLevels(models.IntegerChoices):
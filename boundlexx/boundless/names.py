@@ -0,0 +1,180 @@
+"""
+Batched resolution of the default (english) localized name of game objects
+
+Names are looked up in an in-process LRU first, then Redis, then the
+database, and each layer is read/filled with one call per batch instead of
+one round trip per object.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+DEFAULT_LANG = "english"
+NAME_ATTR = "_default_name"
+NAME_CACHE_TIMEOUT = 300
+LOCAL_CACHE_SIZE = 8192
+LOCAL_CACHE_TIMEOUT = 60
+
+MISSING = object()
+
+
+class LocalLRUCache:
+    def __init__(self, maxsize=LOCAL_CACHE_SIZE, timeout=LOCAL_CACHE_TIMEOUT):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        now = time.monotonic()
+        found = {}
+
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+
+                value, expires = entry
+                if expires < now:
+                    del self._data[key]
+                    continue
+
+                self._data.move_to_end(key)
+                found[key] = value
+
+        return found
+
+    def set_many(self, mapping):
+        expires = time.monotonic() + self.timeout
+
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (value, expires)
+                self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_names = LocalLRUCache()
+
+
+def _from_prefetch(obj):
+    prefetched = getattr(obj, "_prefetched_objects_cache", {})
+    if "localizedname_set" not in prefetched:
+        return MISSING
+
+    for localized in prefetched["localizedname_set"]:
+        if localized.lang == DEFAULT_LANG:
+            return localized.name
+    return None
+
+
+def _from_database(objs) -> dict:
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        LocalizedName,
+    )
+
+    names = dict(
+        LocalizedName.objects.non_polymorphic()
+        .filter(game_obj_id__in=[obj.pk for obj in objs], lang=DEFAULT_LANG)
+        .values_list("game_obj_id", "name")
+    )
+
+    return {obj.localization_cache_key: names.get(obj.pk) for obj in objs}
+
+
+def get_default_names(objs: Iterable) -> dict[str, Optional[str]]:
+    """
+    Resolves the default name for all of `objs`, returns
+    {localization cache key: name}
+    """
+
+    names: dict[str, Optional[str]] = {}
+    pending = {}
+
+    for obj in objs:
+        name = obj.__dict__.get(NAME_ATTR, MISSING)
+        if name is MISSING:
+            name = _from_prefetch(obj)
+
+        if name is MISSING:
+            pending[obj.localization_cache_key] = obj
+        else:
+            names[obj.localization_cache_key] = name
+
+    if len(pending) > 0:
+        found = local_names.get_many(pending.keys())
+
+        missing = set(pending.keys()) - set(found.keys())
+        if len(missing) > 0:
+            from_redis = cache.get_many(missing)
+            local_names.set_many(from_redis)
+            found.update(from_redis)
+
+            missing -= set(from_redis.keys())
+            if len(missing) > 0:
+                from_db = _from_database([pending[key] for key in missing])
+                cache.set_many(from_db, timeout=NAME_CACHE_TIMEOUT)
+                local_names.set_many(from_db)
+                found.update(from_db)
+
+        names.update(found)
+
+    return names
+
+
+def prime_default_names(objs: Iterable):
+    """
+    Resolves and stores the default name on each of `objs` so reading
+    `default_name`/`english` afterwards does not hit any cache
+    """
+
+    objs = [obj for obj in objs if obj is not None]
+    names = get_default_names(objs)
+
+    for obj in objs:
+        obj.__dict__[NAME_ATTR] = names.get(obj.localization_cache_key)
+
+    return objs
+
+
+def get_default_name(obj) -> Optional[str]:
+    name = obj.__dict__.get(NAME_ATTR, MISSING)
+    if name is MISSING:
+        prime_default_names([obj])
+        name = obj.__dict__[NAME_ATTR]
+
+    return name
+
+
+def annotate_default_name(queryset, lang=DEFAULT_LANG):
+    """
+    Annotates the default name on a `GameObj` queryset in SQL
+    """
+
+    from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+        LocalizedName,
+    )
+
+    return queryset.annotate(
+        **{
+            NAME_ATTR: Subquery(
+                LocalizedName.objects.non_polymorphic()
+                .filter(game_obj_id=OuterRef("pk"), lang=lang)
+                .values("name")[:1]
+            )
+        }
+    )
@@ -0,0 +1,211 @@
+"""
+Process wide, read-only registry of game objects
+
+Game objects (items, colors, metals, skills, recipes, blocks and emoji) only
+change when game data is ingested, so each worker loads them lazily once and
+keeps them in memory until the registry version (bumped at the end of ingest)
+changes. Objects from the registry are shared between callers and must not be
+modified.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Optional
+
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+REGISTRY_VERSION_KEY = "boundless:game_registry:version"
+
+_registry: Optional[GameRegistry] = None
+
+
+def _normalize_name(name):
+    return name.replace(" ", "").replace("_", "").lower()
+
+
+def _by(objects, attr):
+    return MappingProxyType({getattr(obj, attr): obj for obj in objects})
+
+
+def _by_localized_name(objects, lang="english"):
+    names = {}
+    for obj in objects:
+        for localized in obj.localizedname_set.all():
+            if localized.lang == lang:
+                names.setdefault(_normalize_name(localized.name), obj)
+
+    return MappingProxyType(names)
+
+
+class GameRegistry:  # pylint: disable=too-many-public-methods
+    def __init__(self, version=None):
+        self.version = version
+
+    @cached_property
+    def colors(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Color,
+        )
+
+        return tuple(
+            Color.objects.all()
+            .prefetch_related("localizedname_set", "colorvalue_set")
+            .order_by("game_id")
+        )
+
+    @cached_property
+    def colors_by_id(self):
+        return _by(self.colors, "game_id")
+
+    @cached_property
+    def colors_by_name(self):
+        return _by_localized_name(self.colors)
+
+    @cached_property
+    def items(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Item,
+        )
+
+        return tuple(
+            Item.objects.all()
+            .select_related("resource_data")
+            .prefetch_related("localizedname_set")
+            .order_by("game_id")
+        )
+
+    @cached_property
+    def items_by_id(self):
+        return _by(self.items, "game_id")
+
+    @cached_property
+    def items_by_string_id(self):
+        return _by(self.items, "string_id")
+
+    @cached_property
+    def items_by_name(self):
+        return _by_localized_name(self.items)
+
+    @cached_property
+    def metals(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Metal,
+        )
+
+        return tuple(
+            Metal.objects.all()
+            .prefetch_related("localizedname_set")
+            .order_by("game_id")
+        )
+
+    @cached_property
+    def metals_by_id(self):
+        return _by(self.metals, "game_id")
+
+    @cached_property
+    def blocks(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Block,
+        )
+
+        return tuple(
+            Block.objects.all().select_related("block_item").order_by("game_id")
+        )
+
+    @cached_property
+    def blocks_by_id(self):
+        return _by(self.blocks, "game_id")
+
+    @cached_property
+    def blocks_by_name(self):
+        return _by(self.blocks, "name")
+
+    @cached_property
+    def skills(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Skill,
+        )
+
+        return tuple(Skill.objects.all().select_related("group").order_by("id"))
+
+    @cached_property
+    def skills_by_name(self):
+        return _by(self.skills, "name")
+
+    def get_skills(self, group_name):
+        return tuple(s for s in self.skills if s.group.name == group_name)
+
+    @cached_property
+    def recipes(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Recipe,
+        )
+
+        return tuple(
+            Recipe.objects.all()
+            .select_related("output")
+            .prefetch_related("levels", "levels__inputs")
+            .order_by("game_id")
+        )
+
+    @cached_property
+    def recipes_by_id(self):
+        return _by(self.recipes, "game_id")
+
+    @cached_property
+    def emoji_by_name(self):
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            Emoji,
+        )
+
+        names = {}
+        alt_names = {}
+        for emoji in Emoji.objects.filter(active=True).prefetch_related(
+            "emojialtname_set"
+        ):
+            names.setdefault(emoji.name, emoji)
+            for alt in emoji.emojialtname_set.all():
+                alt_names.setdefault(alt.name, emoji)
+
+        alt_names.update(names)
+        return MappingProxyType(alt_names)
+
+    @cached_property
+    def item_color_variants(self):
+        """
+        {(item game ID, color game ID): ItemColorVariant}
+        """
+
+        from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
+            ItemColorVariant,
+        )
+
+        return MappingProxyType(
+            {
+                (variant.item.game_id, variant.color.game_id): variant
+                for variant in ItemColorVariant.objects.select_related("item", "color")
+            }
+        )
+
+
+def get_registry() -> GameRegistry:
+    global _registry  # pylint: disable=global-statement
+
+    version = cache.get(REGISTRY_VERSION_KEY)
+    if version is None:
+        version = bump_registry_version()
+
+    if _registry is None or _registry.version != version:
+        _registry = GameRegistry(version=version)
+
+    return _registry
+
+
+def bump_registry_version():
+    try:
+        return cache.incr(REGISTRY_VERSION_KEY)
+    except ValueError:
+        cache.set(REGISTRY_VERSION_KEY, 1, timeout=None)
+        return 1
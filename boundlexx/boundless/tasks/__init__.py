@@ -1,8 +1,10 @@
-import djclick as click
+import time
+
 from celery.utils.log import get_task_logger
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 
+from boundlexx.api.response_cache import bump_generation
 from boundlexx.boundless.models import World, WorldBlockColor
 from boundlexx.boundless.tasks.forums import (
     ingest_exo_world_data,
@@ -23,6 +25,8 @@ from boundlexx.boundless.tasks.worlds import (
     poll_settlements,
     poll_sovereign_worlds,
     poll_worlds,
+    refresh_timeseries_aggregates,
+    scan_worlds,
     search_new_worlds,
 )
 from boundlexx.notifications.models import ExoworldNotification
@@ -46,113 +50,53 @@ __all__ = [
     "poll_sovereign_worlds",
     "poll_worlds",
     "recalculate_colors",
+    "refresh_timeseries_aggregates",
+    "scan_worlds",
     "search_new_worlds",
     "search_new_worlds",
     "update_prices_split",
     "update_prices",
 ]
 
-NON_EXO = Q(world__end__isnull=True) | Q(world__owner__isnull=False)
-EXO = {
-    "world__isnull": False,
-    "world__end__isnull": False,
-    "world__owner__isnull": True,
-}
 
+@app.task
+def recalculate_colors(world_ids=None, log=None, max_age=None, groups=None):
+    """
+    With `groups`, recalculates every color in those (item, color) groups (and
+    their transform targets) instead of just the colors of `world_ids`
+    """
 
-def _get_block_colors(world_ids):
-    if world_ids is not None:
-        wbcs = WorldBlockColor.objects.filter(world_id__in=world_ids)
-    else:
-        wbcs = WorldBlockColor.objects.all()
+    if log is None:
+        log = logger.info
 
-    return wbcs.order_by("world_id")
+    if isinstance(max_age, str):
+        # datetimes are serialized as strings when queued
+        max_age = parse_datetime(max_age)
 
+    if groups is not None:
+        groups = WorldBlockColor.objects.get_affected_groups(groups)
+        log(f"Recalculating {len(groups)} affected item/color group(s)...")
+    else:
+        log("Recalculating world block color history...")
 
-@app.task
-def recalculate_colors(  # pylint: disable=too-many-branches
-    world_ids=None, log=None, max_age=None
-):
-    if log is None:
-        log = logger.info
+    start = time.monotonic()
+    times_updated, history_updated = WorldBlockColor.objects.recalculate_history(
+        world_ids=world_ids, max_age=max_age, groups=groups
+    )
+    bump_generation(WorldBlockColor)
 
-    wbcs = _get_block_colors(world_ids)
-    if max_age is not None:
-        wbcs = wbcs.filter(time__gte=max_age)
-    log("Updating timing for all world block colors...")
-    with click.progressbar(
-        wbcs.iterator(), length=wbcs.count(), show_percent=True, show_pos=True
-    ) as pbar:
-        for block_color in pbar:
-            if block_color.world is not None and block_color.world.start:
-                block_color.time = block_color.world.start
-                block_color.save()
-
-    wbcs = _get_block_colors(world_ids)
-    if max_age is not None:
-        wbcs = wbcs.filter(time__gte=max_age)
-    log("Recalculcating dynamic properties...")
-    with click.progressbar(
-        wbcs.iterator(), length=wbcs.count(), show_percent=True, show_pos=True
-    ) as pbar:
-        for block_color in pbar:
-            block_color.is_new = False
-            block_color.first_world = None
-            block_color.last_exo = None
-            block_color.is_new_transform = False
-            block_color.transform_first_world = None
-            block_color.transform_last_exo = None
-
-            if block_color.world is not None and block_color.world.is_creative:
-                block_color.save()
-                continue
-
-            base_compare = WorldBlockColor.objects.filter(
-                item=block_color.item,
-                color=block_color.color,
-                is_default=True,
-                time__lt=block_color.time,
-            ).filter(Q(world__isnull=True) | Q(world__is_creative=False))
-
-            wbc = base_compare.filter(NON_EXO).order_by("world__start").first()
-            block_color.is_new = wbc is None
-            if wbc is not None:
-                block_color.first_world = wbc.world
-
-            wbc = base_compare.filter(**EXO).order_by("-world__start").first()
-            if wbc is not None:
-                block_color.last_exo = wbc.world
-
-            if block_color.transform_group is None:
-                block_color.save()
-                continue
-
-            base_transform = WorldBlockColor.objects.filter(
-                item_id__in=block_color.transform_group,
-                color=block_color.color,
-                is_default=True,
-                time__lt=block_color.time,
-            ).filter(Q(world__isnull=True) | Q(world__is_creative=False))
-
-            if block_color.is_new:
-                wbc = base_transform.filter(NON_EXO).first()
-                block_color.is_new_transform = wbc is None
-                if wbc is not None and wbc.world is not None:
-                    block_color.transform_first_world = wbc.world
-
-                wbc = base_compare.filter(**EXO).first()
-                if wbc is not None:
-                    block_color.transform_last_exo = wbc.world
-            else:
-                block_color.is_new_transform = False
-
-            block_color.save()
+    log(f"Updated timing for {times_updated} world block color(s)")
+    log(f"Updated dynamic properties for {history_updated} world block color(s)")
+    log(f"Recalculation took {time.monotonic() - start:.2f}s")
 
 
 @app.task
 def recalculate_and_send_exo(world_id):
     world = World.objects.get(id=world_id)
-    recalculate_colors([world.id])
+    groups = WorldBlockColor.objects.filter(world=world, is_default=True).values_list(
+        "item_id", "color_id"
+    )
+    recalculate_colors([world.id], max_age=world.start, groups=list(groups))
     if world.owner is None:
         ExoworldNotification.objects.send_update_notification(world)
 
@@ -165,11 +109,11 @@ def add_world_control_data(world_id, world_control_data, user_id):
     for block_id, data in world_control_data.items():
         ws_data[int(block_id)] = data
 
-    block_colors_created = WorldBlockColor.objects.create_colors_from_wc(
+    created, groups, since = WorldBlockColor.objects.create_colors_from_wc(
         World.objects.get(pk=world_id), ws_data, logger=logger, user=user
     )
 
-    logger.info("Created %s color(s)", block_colors_created)
+    logger.info("Created %s color(s)", created)
 
-    if block_colors_created > 0:
-        recalculate_colors.delay([world_id])
+    if len(groups) > 0:
+        recalculate_colors.delay([world_id], max_age=since.isoformat(), groups=groups)
@@ -14,7 +14,8 @@ from django.core.files.base import ContentFile
 from django.utils import timezone as dj_timezone
 from filetype.filetype import get_type
 
-from boundlexx.boundless.models import Color, LocalizedName, World, WorldBlockColor
+from boundlexx.boundless.models import LocalizedName, World, WorldBlockColor
+from boundlexx.boundless.registry import get_registry
 from boundlexx.boundless.utils import clean_image
 from config.celery_app import app
 
@@ -133,7 +134,7 @@ def _parse_block_details(block_details):
 
     colors = {}
     color_names = []
-    for color in Color.objects.all().prefetch_related("localizedname_set"):
+    for color in get_registry().colors:
         color_names.append(color.default_name)
         colors[color.game_id] = color
 
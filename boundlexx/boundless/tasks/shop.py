@@ -17,7 +17,6 @@ from requests.exceptions import ConnectionError as RequestsConnectionError
 from boundlexx.boundless.game import HTTP_ERRORS, BoundlessClient
 from boundlexx.boundless.game import World as SimpleWorld
 from boundlexx.boundless.models import (
-    Color,
     Item,
     ItemBuyRank,
     ItemRank,
@@ -26,6 +25,7 @@ from boundlexx.boundless.models import (
     ItemShopStandPrice,
     World,
 )
+from boundlexx.boundless.registry import get_registry
 from config.celery_app import app
 
 logger = get_task_logger(__name__)
@@ -175,7 +175,7 @@ def _create_item_prices(shops, price_klass, world: SimpleWorld, item):
         key=lambda s: f"{s.location.x},{s.location.y},{s.location.z}",
     )
 
-    colors = Color.objects.all()
+    colors = get_registry().colors
 
     total = 0
     state_hash = hashlib.sha512()
@@ -344,7 +344,7 @@ def _update_prices(worlds):
         return
 
     ids_to_remove = [w.id for w in worlds]
-    items = Item.objects.filter(active=True, can_be_sold=True)
+    items = Item.fast.filter(active=True, can_be_sold=True)
     logger.info("Updating the prices for %s items", len(items))
 
     _log_worlds(worlds)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import time
+from bisect import bisect_left
+
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.cache import cache
@@ -7,21 +10,128 @@ from django.db.models import Q
 from django.utils import timezone
 from requests.exceptions import HTTPError
 
+from boundlexx.boundless.aggregates import refresh_aggregates
+from boundlexx.boundless.color_index import invalidate_world_masks
+from boundlexx.boundless.distances import (
+    backfill_distances,
+    bump_distance_version,
+    get_distance_matrix,
+)
 from boundlexx.boundless.game import BoundlessClient
 from boundlexx.boundless.game import World as SimpleWorld
 from boundlexx.boundless.models import (
-    Color,
     Settlement,
     World,
-    WorldDistance,
     WorldPoll,
 )
-from boundlexx.boundless.utils import GameErrorHandler
+from boundlexx.boundless.utils import GameErrorHandler, get_html_name_renderer
 from boundlexx.notifications.models import ExoworldExpiredNotification
 from config.celery_app import app
 
 logger = get_task_logger(__name__)
 
+MISSING_WORLDS_CACHE_KEY = "boundless:missing_worlds"
+MISSING_WORLDS_LOCK = "boundless:missing_worlds:lock"
+
+
+def _get_missing_keys():
+    # bitmaps are bucketed by TTL so an id is skipped for between 1 and 2 TTLs
+    ttl = int(settings.BOUNDLESS_MISSING_WORLD_TTL.total_seconds())
+    bucket = int(time.time()) // ttl
+
+    return (
+        f"{MISSING_WORLDS_CACHE_KEY}:{bucket}",
+        f"{MISSING_WORLDS_CACHE_KEY}:{bucket - 1}",
+        ttl,
+    )
+
+
+def _has_bit(bitmap, world_id):
+    index = world_id >> 3
+    return index < len(bitmap) and bool(bitmap[index] & (1 << (world_id & 7)))
+
+
+def get_missing_world_ids(ids):
+    current_key, previous_key, _ = _get_missing_keys()
+    bitmaps = list(cache.get_many([current_key, previous_key]).values())
+
+    if len(bitmaps) == 0:
+        return set()
+
+    return {i for i in ids if any(_has_bit(b, i) for b in bitmaps)}
+
+
+def mark_missing_world_ids(ids):
+    if len(ids) == 0:
+        return
+
+    current_key, _, ttl = _get_missing_keys()
+
+    with cache.lock(MISSING_WORLDS_LOCK, expire=10):
+        bitmap = bytearray(cache.get(current_key) or b"")
+
+        for world_id in ids:
+            index = world_id >> 3
+            if index >= len(bitmap):
+                bitmap.extend(b"\x00" * (index + 1 - len(bitmap)))
+            bitmap[index] |= 1 << (world_id & 7)
+
+        cache.set(current_key, bytes(bitmap), timeout=ttl * 2)
+
+
+def _prioritize_ids(ids_to_scan):
+    """
+    Orders ids by distance to the closest recently created world, new worlds
+    are generally created next to each other
+    """
+
+    recent_ids = sorted(
+        World.objects.filter(
+            id__lt=settings.BOUNDLESS_EXO_EXPIRED_BASE_ID,
+            start__gt=timezone.now() - settings.BOUNDLEXX_WORLD_SEARCH_OFFSET,
+        ).values_list("id", flat=True)
+    )
+
+    if len(recent_ids) == 0:
+        return list(ids_to_scan)
+
+    def _distance(world_id):
+        index = bisect_left(recent_ids, world_id)
+        distance = settings.BOUNDLESS_MAX_WORLD_ID
+
+        if index < len(recent_ids):
+            distance = recent_ids[index] - world_id
+        if index > 0:
+            distance = min(distance, world_id - recent_ids[index - 1])
+        return distance
+
+    return sorted(ids_to_scan, key=lambda i: (_distance(i), i))
+
+
+def _dispatch_scan(ids_to_scan, skip_missing_ids=None):
+    if skip_missing_ids is None:
+        skip_missing_ids = ids_to_scan
+
+    missing_ids = get_missing_world_ids(skip_missing_ids)
+    if len(missing_ids) > 0:
+        logger.info("Skipping %s recently missing world(s)", len(missing_ids))
+
+    ids_to_scan = _prioritize_ids([i for i in ids_to_scan if i not in missing_ids])
+    workers = max(settings.BOUNDLESS_WORLD_SCAN_WORKERS, 1)
+
+    if workers == 1 or len(ids_to_scan) <= settings.BOUNDLESS_MAX_SCAN_CHUNK:
+        return _scan_worlds(ids_to_scan)
+
+    # interleave so every worker starts with the highest priority ids,
+    # each task creates its own client which rotates to the next account
+    for worker in range(workers):
+        worker_ids = ids_to_scan[worker::workers]
+
+        if len(worker_ids) > 0:
+            scan_worlds.delay(worker_ids)
+
+    return None, None
+
 
 def _get_search_ids():
     existing_worlds = World.objects.filter(
@@ -65,12 +175,19 @@ def search_new_worlds(ids_to_scan=None):
     if ids_to_scan is None:
         ids_to_scan = _get_search_ids()
 
-        if ids_to_scan is None:
-            return
+    if not ids_to_scan:
+        return
 
     logger.info("Starting scan for new worlds (%s)", ids_to_scan)
 
-    _, worlds = _scan_worlds(ids_to_scan)
+    # never skip ids past the highest known world, that is where new worlds show up
+    frontier = max(ids_to_scan) - settings.BOUNDLESS_EXO_SEARCH_RADIUS
+    _, worlds = _dispatch_scan(
+        ids_to_scan, skip_missing_ids=[i for i in ids_to_scan if i <= frontier]
+    )
+
+    if worlds is None:
+        return
 
     worlds_found = 0
     for world in worlds:
@@ -85,33 +202,43 @@ def discover_all_worlds(start_id=None):
     if start_id is None:
         start_id = 1
 
-    chunks = []
-    chunk_lower, chunk_upper = 0, start_id - 1
-    while chunk_upper < settings.BOUNDLESS_MAX_WORLD_ID:
-        chunk_lower = chunk_upper + 1
-        chunk_upper = min(
-            chunk_lower + settings.BOUNDLESS_MAX_SCAN_CHUNK - 1,
-            settings.BOUNDLESS_MAX_WORLD_ID,
-        )
-        chunks.append((chunk_lower, chunk_upper))
+    ids_to_scan = list(range(start_id, settings.BOUNDLESS_MAX_WORLD_ID + 1))
 
-    worlds_found = 0
-    new_worlds = []
-    for chunk in chunks:
-        logger.info("Starting scan for worlds (%s, %s)", chunk[0], chunk[1])
+    logger.info("Starting scan for worlds (%s, %s)", start_id, ids_to_scan[-1])
+    worlds_found, _ = _dispatch_scan(ids_to_scan)
 
-        ids_to_scan = list(range(chunk[0], chunk[1] + 1))
+    if worlds_found is not None:
+        logger.info("Scan Complete. Found %s world(s)", worlds_found)
 
-        created, worlds = _scan_worlds(ids_to_scan)
-        worlds_found += created
 
-        new_worlds += worlds
+@app.task
+def scan_worlds(ids_to_scan):
+    logger.info("Starting scan for %s world(s)", len(ids_to_scan))
 
-    logger.info("Scan Complete. Found %s world(s)", worlds_found)
+    _scan_worlds(ids_to_scan)
 
 
 def _scan_worlds(ids_to_scan):
     client = BoundlessClient()
+
+    # scanned in chunks so missing ids are marked (and skipped by other
+    # scans) as the scan progresses instead of only once it is done
+    worlds_found = 0
+    world_objs = []
+    for index in range(0, len(ids_to_scan), settings.BOUNDLESS_MAX_SCAN_CHUNK):
+        chunk = ids_to_scan[index : index + settings.BOUNDLESS_MAX_SCAN_CHUNK]
+        logger.info("Starting scan for worlds (%s)", chunk)
+
+        created, worlds = _scan_world_chunk(client, chunk)
+        worlds_found += created
+        world_objs += worlds
+
+    logger.info("Found %s world(s)", worlds_found)
+
+    return worlds_found, world_objs
+
+
+def _scan_world_chunk(client, ids_to_scan):
     worlds = get_worlds(ids_to_scan, client=client)
 
     worlds_found = 0
@@ -156,8 +283,6 @@ def _scan_worlds(ids_to_scan):
                         world_data, poll_dict, world=world, new_world=True
                     )
 
-    logger.info("Found %s world(s)", worlds_found)
-
     return worlds_found, world_objs
 
 
@@ -166,13 +291,18 @@ def get_worlds(ids_to_scan, client=None):
         client = BoundlessClient()
 
     worlds: list[dict] = []
+    missing_ids: list[int] = []
 
     for world_id in ids_to_scan:
         world_data = client.get_world_data(SimpleWorld(world_id, None))
 
-        if world_data is not None:
+        if world_data is None:
+            missing_ids.append(world_id)
+        else:
             worlds.append(world_data)
 
+    mark_missing_world_ids(missing_ids)
+
     return worlds
 
 
@@ -216,6 +346,7 @@ def poll_worlds(world_ids=None):
                 address__isnull=False,
             )
         ).update(active=True)
+        invalidate_world_masks()
 
         worlds = World.objects.filter(
             Q(active=True) | Q(end__isnull=False, end__gt=timezone.now())
@@ -389,41 +520,21 @@ def _poll_worlds(worlds):
 def calculate_distances(world_ids=None):
     if world_ids is None:
         worlds = World.objects.filter(active=True)
-        all_worlds = worlds
     else:
         worlds = World.objects.filter(id__in=world_ids)
-        all_worlds = World.objects.filter(active=True)
 
-    client = BoundlessClient()
+    matrix = get_distance_matrix()
+    missing_ids = set(worlds.values_list("id", flat=True)) - set(matrix.world_ids)
+    if len(missing_ids) > 0:
+        # worlds activated since the matrix was last loaded
+        bump_distance_version()
+        matrix = get_distance_matrix()
 
-    world_ids = {w.id for w in all_worlds}
+    pairs = matrix.missing_pairs(worlds.values_list("id", flat=True))
 
-    for world in worlds:
-        world_distances = WorldDistance.objects.filter(
-            Q(world_source=world) | Q(world_dest=world)
-        ).select_related("world_source", "world_dest")
-
-        world_distance_ids = set()
-        for world_distance in world_distances:
-            if world_distance.world_source.id == world_distance.world_dest.id:
-                world_distance_ids.add(world.id)
-            else:
-                if world_distance.world_source.id != world.id:
-                    world_distance_ids.add(world_distance.world_source.id)
-                if world_distance.world_dest.id != world.id:
-                    world_distance_ids.add(world_distance.world_dest.id)
-
-        missing_distance_ids = world_ids.difference(world_distance_ids)
-
-        logger.info(
-            "Missing %s distance calulcation(s) for %s",
-            len(missing_distance_ids),
-            world,
-        )
-        for world_id in missing_distance_ids:
-            world_dest = World.objects.get(id=world_id)
-
-            world.get_distance_to_world(world_dest, client=client)
+    logger.info("Missing %s distance calulcation(s)", len(pairs))
+    created = backfill_distances(pairs)
+    logger.info("Calculated %s distance(s)", created)
 
 
 @app.task
@@ -443,7 +554,7 @@ def poll_settlements(world_ids=None):
         worlds = World.objects.filter(id__in=world_ids)
 
     client = BoundlessClient()
-    colors = Color.objects.all()
+    render_name = get_html_name_renderer()
 
     error_handler = GameErrorHandler(
         rd_callback=_handle_rd,
@@ -462,9 +573,35 @@ def poll_settlements(world_ids=None):
             continue
 
         settlements = response.response  # pylint: disable=no-member
-        Settlement.objects.filter(world=world).delete()
+        created, updated, deleted = Settlement.objects.sync_from_game_objs(
+            world, settlements, render_name=render_name
+        )
+
+        logger.info(
+            "Found %s settlements for %s (%s new, %s updated, %s removed)",
+            len(settlements),
+            world,
+            created,
+            updated,
+            deleted,
+        )
+
 
-        for settlement in settlements:
-            Settlement.objects.create_from_game_obj(world, settlement, colors=colors)
+@app.task
+def refresh_timeseries_aggregates():
+    lock = cache.lock(
+        "boundlexx:tasks:refresh_timeseries_aggregates",
+        expire=3600,
+        auto_renewal=False,
+    )
 
-        logger.info("Found %s settlements for %s", len(settlements), world)
+    if not lock.acquire(blocking=True, timeout=1):
+        return
+
+    try:
+        refresh_aggregates(log=logger.info)
+    finally:
+        try:
+            lock.release()
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not release lock: %s", ex)
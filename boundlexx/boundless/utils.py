@@ -3,11 +3,11 @@ import struct
 import time
 from collections import namedtuple
 from datetime import timedelta
+from functools import lru_cache
 from http.client import RemoteDisconnected
 from io import BytesIO
 from typing import Callable, Optional
 
-from django.core.cache import cache
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from PIL import Image
@@ -15,9 +15,6 @@ from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from boundlexx.boundless.game import HTTP_ERRORS
 
-ITEM_COLOR_IDS_KEYS = "boundless:block_color_ids"
-ITEM_METAL_IDS_KEYS = "boundless:block_metal_ids"
-WORLD_ITEM_COLOR_IDS_KEYS = "boundless:resource_ids"
 FORMATTING_REGEX = r":([^:]*):"
 ERROR_THRESHOLD = 5
 DEFAULT_DELAY = 5
@@ -105,60 +102,6 @@ def get_next_rank_update(ranks):
     return next_update
 
 
-def get_block_color_item_ids():
-    item_ids = cache.get(ITEM_COLOR_IDS_KEYS)
-
-    if item_ids is None:
-        from boundlexx.boundless.models import (  # noqa: E501 # pylint: disable=import-outside-toplevel,cyclic-import
-            ItemColorVariant,
-        )
-
-        block_colors = (
-            ItemColorVariant.objects.all().distinct("item_id").prefetch_related("item")
-        )
-        item_ids = [bc.item.game_id for bc in block_colors]
-
-        cache.set(ITEM_COLOR_IDS_KEYS, item_ids, timeout=86400)
-
-    return item_ids
-
-
-def get_block_metal_item_ids():
-    item_ids = cache.get(ITEM_METAL_IDS_KEYS)
-
-    if item_ids is None:
-        from boundlexx.boundless.models import (  # noqa: E501 # pylint: disable=import-outside-toplevel,cyclic-import
-            ItemMetalVariant,
-        )
-
-        block_colors = (
-            ItemMetalVariant.objects.all().distinct("item_id").prefetch_related("item")
-        )
-        item_ids = [bc.item.game_id for bc in block_colors]
-
-        cache.set(ITEM_METAL_IDS_KEYS, item_ids, timeout=86400)
-
-    return item_ids
-
-
-def get_world_block_color_item_ids():
-    item_ids = cache.get(WORLD_ITEM_COLOR_IDS_KEYS)
-
-    if item_ids is None:
-        from boundlexx.boundless.models import (  # noqa: E501 # pylint: disable=import-outside-toplevel,cyclic-import
-            WorldBlockColor,
-        )
-
-        block_colors = (
-            WorldBlockColor.objects.all().distinct("item_id").prefetch_related("item")
-        )
-        item_ids = [bc.item.game_id for bc in block_colors]
-
-        cache.set(WORLD_ITEM_COLOR_IDS_KEYS, item_ids, timeout=86400)
-
-    return item_ids
-
-
 def color_from_hex_string(hex_string, colors=None):
     color_hex = None
     the_color = None
@@ -226,15 +169,13 @@ def replace_color(string, format_string, inner, colors, strip):
 
 
 def html_name(string, strip=False, colors=None):
-    from boundlexx.boundless.models.game import (  # pylint: disable=cyclic-import
-        Color,
-        Emoji,
+    from boundlexx.boundless.registry import (  # pylint: disable=cyclic-import
+        get_registry,
     )
 
+    registry = get_registry()
     if colors is None:
-        colors = list(
-            Color.objects.all().prefetch_related("localizedname_set", "colorvalue_set")
-        )
+        colors = registry.colors
     final_string = str(escape(string[:]))
 
     for match in re.finditer(FORMATTING_REGEX, string):
@@ -252,26 +193,42 @@ def html_name(string, strip=False, colors=None):
         # replace emoji with resolved emoji
         else:
             user_name = inner.lower()
-            try:
-                emoji = Emoji.objects.get_by_name(user_name)
-            except Emoji.DoesNotExist:
-                pass
-            else:
-                if emoji is not None:
-                    if strip:
-                        final_string = final_string.replace(format_string, inner, 1)
-                    else:
-                        html_emoji = (
-                            f'<img src="{emoji.image.url}" class="emoji"'
-                            f' alt="emoji {user_name}" title="{user_name}">'
-                        )
-                        final_string = final_string.replace(
-                            format_string, html_emoji, 1
-                        )
+            emoji = registry.emoji_by_name.get(user_name)
+            if emoji is not None:
+                if strip:
+                    final_string = final_string.replace(format_string, inner, 1)
+                else:
+                    html_emoji = (
+                        f'<img src="{emoji.image.url}" class="emoji"'
+                        f' alt="emoji {user_name}" title="{user_name}">'
+                    )
+                    final_string = final_string.replace(format_string, html_emoji, 1)
 
     return mark_safe(final_string)  # nosec
 
 
+def get_html_name_renderer(colors=None, maxsize=4096):
+    """
+    Returns a memoized `html_name(string, strip=False)` for rendering a batch
+    of names against the same set of colors
+    """
+
+    from boundlexx.boundless.registry import (  # pylint: disable=cyclic-import
+        get_registry,
+    )
+
+    if colors is None:
+        colors = get_registry().colors
+    else:
+        colors = list(colors.prefetch_related("localizedname_set", "colorvalue_set"))
+
+    @lru_cache(maxsize=maxsize)
+    def _render(string, strip=False):
+        return html_name(string, strip=strip, colors=colors)
+
+    return _render
+
+
 def calculate_extra_names(world, new_name, colors=None):
     if world.display_name != new_name:
         world.text_name = None
@@ -270,7 +270,7 @@ def _get_default_color(item):
         else:
             raise
 
-    return Color.objects.get(game_id=default_color_id)
+    return Color.fast.get(game_id=default_color_id)
 
 
 def run(  # pylint: disable=too-many-locals
@@ -32,7 +32,7 @@ def _create_recipe_groups(recipes):
 
             members = []
             for member_id in group["groupMembers"]:
-                members.append(Item.objects.get(game_id=member_id))
+                members.append(Item.fast.get(game_id=member_id))
             recipe_group.members.set(members)
 
             if created:
@@ -46,7 +46,7 @@ def _create_recipe_groups(recipes):
 def _get_tints(item_ids):
     tints = []
     for item_id in item_ids:
-        tints.append(Item.objects.get(game_id=item_id))
+        tints.append(Item.fast.get(game_id=item_id))
 
     return tints
 
@@ -82,7 +82,7 @@ def _get_inputs(inputs_list):
         elif len(input_dict["inputItems"]) > 1:
             raise Exception("Too many inputs")
         else:
-            item = Item.objects.get(game_id=input_dict["inputItems"][0])
+            item = Item.fast.get(game_id=input_dict["inputItems"][0])
 
         for index, count in enumerate(input_dict["inputQuantity"]):
             rinput, _ = RecipeInput.objects.get_or_create(
@@ -139,7 +139,7 @@ def run(force=False, **kwargs):
                 "heat": recipe_dict["heat"],
                 "craft_xp": recipe_dict["craftXP"],
                 "machine": recipe_dict.get("machine"),
-                "output": Item.objects.get(game_id=recipe_dict["outputItem"]),
+                "output": Item.fast.get(game_id=recipe_dict["outputItem"]),
                 "can_hand_craft": recipe_dict["canHandCraft"],
                 "machine_level": recipe_dict["machineLevel"],
                 "power": recipe_dict["powerRequired"],
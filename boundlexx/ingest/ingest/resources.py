@@ -62,7 +62,7 @@ def _create_world_types(resource_data, created, data):
 
 def _create_resource_liquids():
     for game_id in RESOURCE_LIQUIDS:
-        liquid = Liquid.objects.get(game_id=game_id)
+        liquid = Liquid.fast.select_related("block_item").get(game_id=game_id)
 
         if not liquid.block_item.is_resource:
             liquid.block_item.is_resource = True
@@ -85,7 +85,7 @@ def run(**kwargs):
     # 0 = Live universe, 1 = Multiverse?
     with click.progressbar(resourcetiers[0].items()) as pbar:
         for block_name, resource_data in pbar:
-            block = Block.objects.select_related("block_item").get(name=block_name)
+            block = Block.fast.select_related("block_item").get(name=block_name)
 
             resource_profile = None
             is_embedded = False
@@ -2,6 +2,10 @@ from importlib import import_module
 
 import djclick as click
 
+from boundlexx.api.response_cache import bump_all_generations
+from boundlexx.boundless.models.game import refresh_item_flags
+from boundlexx.boundless.registry import bump_registry_version
+
 BASE = "boundlexx.ingest.ingest"
 
 
@@ -101,3 +105,10 @@ def command(force, start_item_id, end_item_id, skip_variants, english_only, **kw
                 color_variants=(not skip_variants),
                 english_only=english_only,
             )
+
+    click.echo("Refreshing item flags...")
+    refresh_item_flags()
+
+    # game objects changed, reload them in every worker
+    bump_registry_version()
+    bump_all_generations()
@@ -19,6 +19,7 @@ from django_prometheus.models import ExportModelOperationsMixin
 from PIL import Image
 from polymorphic.models import PolymorphicManager, PolymorphicModel
 
+from boundlexx.boundless.names import prime_default_names
 from boundlexx.notifications.tasks import (
     create_forum_post,
     render_discord_messages,
@@ -343,9 +344,11 @@ class WorldNotification(NotificationBase):
 
     def _get_color_variants(self, world):
         from boundlexx.boundless.models import (  # pylint: disable=cyclic-import
-            ItemColorVariant,
             WorldBlockColor,
         )
+        from boundlexx.boundless.registry import (  # pylint: disable=cyclic-import
+            get_registry,
+        )
 
         colors = self._get_colors(world) or []
         default_colors: list[WorldBlockColor] = []
@@ -353,11 +356,10 @@ class WorldNotification(NotificationBase):
             default_colors = self._get_colors(world, default=True) or []
 
         colors = list(colors) + list(default_colors)
+        item_color_variants = get_registry().item_color_variants
         variants = set()
         for wbc in colors:
-            variant = ItemColorVariant.objects.filter(
-                item=wbc.item, color=wbc.color
-            ).first()
+            variant = item_color_variants.get((wbc.item.game_id, wbc.color.game_id))
 
             if variant is not None:
                 variants.add(variant)
@@ -388,7 +390,8 @@ class WorldNotification(NotificationBase):
             embedded_resources = []
             surface_resources = []
 
-            for resource in resources.order_by("-count"):
+            # largest first, compact counts are in resource mapping order
+            for resource in sorted(resources, key=lambda r: r.count, reverse=True):
                 if resource.is_embedded:
                     embedded_resources.append(resource)
                 else:
@@ -694,6 +697,10 @@ class WorldNotification(NotificationBase):
             (embedded_resources, "Embedded Resources"),
             (surface_resources, "Surface Resources"),
         )
+        prime_default_names(
+            resource.item for resources, _ in resource_groups for resource in resources
+        )
+
         for resources, title in resource_groups:
             values = [""]
             for index, resource in enumerate(resources):
@@ -731,6 +738,11 @@ class WorldNotification(NotificationBase):
     def _color_embed(self, world, color_groups):
         color_embed: dict = {"title": "Block Colors"}
         fields: list[dict[str, str]] = []
+
+        for color_group in color_groups.values():
+            prime_default_names(c.item for c in color_group)
+            prime_default_names(c.color for c in color_group)
+
         for group_name, color_group in color_groups.items():
             value = ""
             for color in color_group:
@@ -816,7 +828,7 @@ class SovereignColorNotification(ExportModelOperationsMixin("sovereign_color_not
         fields = []
 
         title = "Color Details"
-        colors = sorted(colors, key=lambda c: c.game_id)
+        colors = sorted(prime_default_names(colors), key=lambda c: c.game_id)
         for color in colors:
             line = f"_{color.default_name} ({color.game_id})_"
 
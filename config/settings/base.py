@@ -399,7 +399,7 @@ REST_FRAMEWORK = {
     ],  # noqa
     "PAGE_SIZE": 100,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "boundlexx.api.renderers.ORJSONRenderer",
         "rest_framework_msgpack.renderers.MessagePackRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
@@ -550,7 +550,35 @@ BOUNDLESS_EXO_SEARCH_RADIUS = 10
 BOUNDLEXX_WORLD_SEARCH_OFFSET = timedelta(days=60)
 BOUNDLESS_MAX_WORLD_ID = 5000
 BOUNDLESS_MAX_SCAN_CHUNK = 50
+BOUNDLESS_MISSING_WORLD_TTL = timedelta(
+    hours=int(env("BOUNDLESS_MISSING_WORLD_TTL", default=6))
+)
+BOUNDLESS_WORLD_SCAN_WORKERS = int(env("BOUNDLESS_WORLD_SCAN_WORKERS", default=1))
 BOUNDLESS_EXO_EXPIRED_BASE_ID = 2000000000
+# only keep `ResourceCount` rows for the newest poll of each world and serve
+# resource history from `WorldPoll.resource_counts`
+BOUNDLESS_COMPACT_RESOURCE_COUNTS = env.bool(
+    "BOUNDLESS_COMPACT_RESOURCE_COUNTS", default=False
+)
+# serve `/stats` for 1 hour/1 day/1 week buckets from the materialized
+# aggregates kept up to date by `refresh_timeseries_aggregates`
+BOUNDLESS_TIMESERIES_AGGREGATES = env.bool(
+    "BOUNDLESS_TIMESERIES_AGGREGATES", default=True
+)
+# cache rendered responses of anonymous requests to read-only viewsets,
+# invalidated by model generations, the timeout bounds staleness for bulk
+# writes that do not send signals
+BOUNDLESS_API_RESPONSE_CACHE = env.bool("BOUNDLESS_API_RESPONSE_CACHE", default=True)
+BOUNDLESS_API_RESPONSE_CACHE_TIMEOUT = int(
+    env("BOUNDLESS_API_RESPONSE_CACHE_TIMEOUT", default=300)
+)
+# identical concurrent cache misses wait (up to the timeout in seconds) for
+# the first one to render, the lease extends that across processes
+BOUNDLESS_API_COALESCE_LEASE = env.bool("BOUNDLESS_API_COALESCE_LEASE", default=False)
+BOUNDLESS_API_COALESCE_TIMEOUT = int(env("BOUNDLESS_API_COALESCE_TIMEOUT", default=10))
+# paginated lists count at most this many rows, larger counts are estimated
+# by the query planner (0 always counts exactly)
+BOUNDLESS_API_COUNT_THRESHOLD = int(env("BOUNDLESS_API_COUNT_THRESHOLD", default=10000))
 BOUNDLESS_FORUM_BAD_TOPICS = [
     28861,
     28592,
@@ -1,4 +1,7 @@
+from contextlib import nullcontext
+
 import pytest
+from django.core.cache import caches
 
 from boundlexx.users.models import User
 from tests.users.factories import UserFactory
@@ -9,6 +12,14 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def cache_lock(monkeypatch):
+    # `LocMemCache` has no `lock` (django-redis only)
+    monkeypatch.setattr(
+        caches["default"], "lock", lambda *args, **kwargs: nullcontext(), raising=False
+    )
+
+
 @pytest.fixture
 def user() -> User:
     return UserFactory()
@@ -4,7 +4,9 @@ import msgpack
 from dateutil.parser import parse
 from rest_framework.exceptions import ParseError
 from rest_framework.parsers import BaseParser
-from six import text_type
+
+# read size for the streaming unpacker
+READ_SIZE = 64 * 1024
 
 
 class MessagePackDecoder(object):
@@ -27,44 +29,42 @@ class MessagePackDecoder(object):
         return decimal.Decimal(obj["as_str"])
 
 
-class MessagePackParser(BaseParser):
+def unmap_data(data, keys):
     """
-    Parses MessagePack-serialized data.
+    Reverses `renderers.map_data`, replaces the key indexes of every dict
+    with the keys from `keys`
     """
 
-    media_type = "application/msgpack"
-
-    def _clean_msgpack_value(self, value, lookup):
-        if isinstance(value, (dict, list)):
-            value = _map_msgpack(value, lookup)
-        elif isinstance(value, str):
-            value = value.replace("\u0000", "")
-
+    def _unmap(value):
+        if isinstance(value, dict):
+            return {keys[k]: _unmap(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [_unmap(v) for v in value]
+        if isinstance(value, str):
+            return value.replace("\u0000", "")
         return value
 
-    def _map_msgpack(self, unmapped, lookup):
-        mapped: Optional[Union[list, dict]] = None
-        if isinstance(unmapped, dict):
-            mapped = {}
+    return _unmap(data)
 
-            for key, value in unmapped.items():
-                value = _clean_msgpack_value(value, lookup)
-                mapped[lookup[key]] = value
-        elif isinstance(unmapped, list):
-            mapped = []
-            for value in unmapped:
-                value = _clean_msgpack_value(value, lookup)
-                mapped.append(value)
-        else:
-            raise Exception("Unknown unmapped object")
 
-        return mapped
+class MessagePackParser(BaseParser):
+    """
+    Parses MessagePack-serialized data.
+    """
+
+    media_type = "application/msgpack"
 
     def parse(self, stream, media_type=None, parser_context=None):
+        unpacker = msgpack.Unpacker(
+            stream,
+            read_size=READ_SIZE,
+            raw=False,
+            strict_map_key=False,
+            object_hook=MessagePackDecoder().decode,
+        )
+
         try:
-            root, lookup = msgpack.load(
-                stream, encoding="utf-8", object_hook=MessagePackDecoder().decode
-            )
-            return self._map_msgpack(root, lookup)
+            root, keys = unpacker.unpack()
+            return unmap_data(root, keys)
         except Exception as exc:
-            raise ParseError("MessagePack parse error - %s" % text_type(exc))
+            raise ParseError("MessagePack parse error - %s" % str(exc))
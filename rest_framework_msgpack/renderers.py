@@ -1,9 +1,19 @@
 import datetime
 import decimal
-from collections.abc import Iterable, Mapping
+import uuid
+from collections.abc import Mapping
 
 import msgpack
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
 from rest_framework.renderers import BaseRenderer
+from rest_framework.serializers import ListSerializer, Serializer
+
+SCALAR_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+STRING_TYPES = (str, bytes, bytearray)
+
+# {serializer class: field names of it and its nested serializers}
+_serializer_keys: dict = {}
 
 
 class MessagePackEncoder(object):
@@ -16,64 +26,125 @@ class MessagePackEncoder(object):
             return {"__class__": "time", "as_str": obj.isoformat()}
         elif isinstance(obj, decimal.Decimal):
             return {"__class__": "decimal", "as_str": str(obj)}
+        elif isinstance(obj, (Promise, uuid.UUID)):
+            return force_str(obj)
         else:
             return obj
 
 
-class MessagePackRenderer(BaseRenderer):
+class KeyTable:
     """
-    Renderer which serializes to MessagePack.
+    Interns dict keys, each distinct key is stored once in `keys` and
+    replaced by its index in the rendered data
     """
 
-    media_type = "application/msgpack"
-    format = "msgpack"
-    render_style = "binary"
-    charset = None
+    def __init__(self, keys=()):
+        self.indexes: dict = {}
+        self.keys: list = []
+
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key):
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes[key] = len(self.keys)
+            self.keys.append(key)
+        return index
+
+
+def _collect_keys(serializer, keys, seen):
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    if not isinstance(serializer, Serializer) or id(serializer) in seen:
+        return
+    seen.add(id(serializer))
+
+    for name, field in serializer.fields.items():
+        keys.append(name)
+        _collect_keys(field, keys, seen)
+
+
+def get_serializer_keys(serializer) -> tuple:
+    """
+    Returns the (cached) field names of `serializer`, so the key table can
+    start with the known keys in order
+    """
+
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
 
-    def _iterate_iterable(self, data, data_map):
-        # many iterable types are not mutatable
-        if not isinstance(data, list):
-            data = list(data)
+    serializer_class = type(serializer)
+    keys = _serializer_keys.get(serializer_class)
 
-        for index, value in enumerate(data):
-            if isinstance(value, (Mapping, Iterable)) and not isinstance(value, str):
-                value, data_map = self._create_mapped_data(value, data_map=data_map)
-            data[index] = value
+    if keys is None:
+        collected: list = []
+        try:
+            _collect_keys(serializer, collected, set())
+        except Exception:  # pylint: disable=broad-except
+            collected = []
 
-        return data, data_map
+        keys = _serializer_keys[serializer_class] = tuple(dict.fromkeys(collected))
 
-    def _iterate_dict(self, data, data_map):
-        new_data = {}
-        for key, value in data.items():
-            if isinstance(value, (Mapping, Iterable)) and not isinstance(value, str):
-                value, data_map = self._create_mapped_data(value, data_map=data_map)
+    return keys
 
-            try:
-                new_key = data_map.index(key)
-            except ValueError:
-                new_key = len(data_map)
-                data_map.append(key)
 
-            new_data[new_key] = value
-        return new_data, data_map
+def map_data(data, table: KeyTable):
+    """
+    Copies `data` with every dict key replaced by its index in `table`
+    """
+
+    intern = table.intern
+
+    def _map(value):
+        value_type = type(value)
+
+        if value_type in SCALAR_TYPES:
+            return value
+        if isinstance(value, Mapping):
+            return {intern(k): _map(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_map(v) for v in value]
+        if isinstance(value, STRING_TYPES) or not hasattr(value, "__iter__"):
+            return value
+        if isinstance(value, Promise):
+            return force_str(value)
+        return [_map(v) for v in value]
+
+    return _map(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
 
-    def _create_mapped_data(self, data, data_map=None):
-        if data_map is None:
-            data_map = []
+    Rendered as `[data, keys]`, where every dict in `data` uses the index of
+    the key in `keys` instead of the key itself.
+    """
 
-        if isinstance(data, Mapping):
-            data, data_map = self._iterate_dict(data, data_map)
-        elif isinstance(data, Iterable) and not isinstance(data, str):
-            data, data_map = self._iterate_iterable(data, data_map)
+    media_type = "application/msgpack"
+    format = "msgpack"
+    render_style = "binary"
+    charset = None
 
-        return data, data_map
+    def get_key_table(self, data):
+        # paginated responses wrap the serializer data in `results`
+        if isinstance(data, Mapping) and "results" in data:
+            data = data["results"]
+
+        serializer = getattr(data, "serializer", None)
+        if serializer is None:
+            return KeyTable()
+        return KeyTable(get_serializer_keys(serializer))
 
     def render(self, data, media_type=None, renderer_context=None):
         """
         Renders *obj* into serialized MessagePack.
         """
         if data is None:
-            return ""
+            return b""
+
+        table = self.get_key_table(data)
+        root = map_data(data, table)
 
-        root, data_map = self._create_mapped_data(data)
-        return msgpack.packb([root, data_map], default=MessagePackEncoder().encode)
+        return msgpack.packb([root, table.keys], default=MessagePackEncoder().encode)
@@ -0,0 +1,103 @@
+import pytest
+from django.core.cache import cache
+
+from boundlexx.boundless.color_index import WORLD_MASKS_KEY, invalidate_color_index
+from boundlexx.boundless.models import WorldBlockColor
+from tests.boundless.factories import ColorFactory, ItemFactory, WorldFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def block_colors():
+    worlds = WorldFactory.create_batch(4)
+    worlds.append(WorldFactory(is_public=False))
+    worlds.append(WorldFactory(active=False))
+    items = ItemFactory.create_batch(3)
+    colors = ColorFactory.create_batch(4)
+
+    for index, world in enumerate(worlds):
+        for item_index, item in enumerate(items):
+            WorldBlockColor.objects.create(
+                world=world,
+                item=item,
+                color=colors[(index + item_index) % len(colors)],
+            )
+
+    # no longer the current color
+    WorldBlockColor.objects.create(
+        world=worlds[0], item=items[0], color=colors[3], active=False
+    )
+
+    invalidate_color_index()
+    cache.delete(WORLD_MASKS_KEY)
+
+    return items, colors
+
+
+def _key(result):
+    if "item" in result:
+        return result["item"]["game_id"], result["world"]["id"]
+    return result["color"]["game_id"]
+
+
+def _ids(client, path, params):
+    response = client.get(path, params)
+    assert response.status_code == 200
+
+    data = response.json()
+    return data["count"], [_key(r) for r in data["results"]]
+
+
+class TestColorIndex:
+    def _assert_pages(self, client, path, db_params):
+        # `world__active` is a filter, so the list is from the database
+        count, db_results = _ids(client, path, {"limit": 100, **db_params})
+        index_count, results = _ids(client, path, {"limit": 100})
+
+        assert index_count == count > 2
+        assert sorted(results) == sorted(db_results)
+
+        for offset in range(count):
+            page_count, page = _ids(client, path, {"limit": 2, "offset": offset})
+
+            assert page_count == count
+            assert page == results[offset : offset + 2]
+
+    def test_color_blocks(self, client, block_colors):
+        _, colors = block_colors
+
+        self._assert_pages(
+            client,
+            f"/api/v2/colors/{colors[1].game_id}/blocks/",
+            {"world__active": True},
+        )
+
+    def test_item_colors(self, client, block_colors):
+        items, _ = block_colors
+
+        self._assert_pages(
+            client,
+            f"/api/v2/items/{items[0].game_id}/colors/",
+            {"world__active": True},
+        )
+
+    def test_world_changes(self, client, block_colors, settings):
+        settings.BOUNDLESS_API_RESPONSE_CACHE = False
+        items, colors = block_colors
+        path = f"/api/v2/colors/{colors[0].game_id}/blocks/"
+
+        # world masks are cached
+        count, _ = _ids(client, path, {"limit": 100})
+
+        world = WorldFactory()
+        WorldBlockColor.objects.create(world=world, item=items[0], color=colors[0])
+
+        new_count, results = _ids(client, path, {"limit": 100})
+        assert new_count == count + 1
+        assert (items[0].game_id, world.id) in results
+
+        world.active = False
+        world.save()
+
+        assert _ids(client, path, {"limit": 100})[0] == count
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from boundlexx.api.downsample import (
+    MIN_POINTS,
+    downsample_indexes,
+    downsample_rows,
+    lttb,
+)
+
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def series():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 25) * 100 + np.random.default_rng(1).normal(size=1000)
+
+    return x, y
+
+
+@pytest.mark.parametrize("points", [MIN_POINTS, 10, 100, 999])
+def test_size_and_endpoints(series, points):
+    indexes = lttb(*series, points)
+
+    assert len(indexes) == points
+    assert indexes[0] == 0
+    assert indexes[-1] == len(series[0]) - 1
+    # ordered and without duplicates
+    assert (np.diff(indexes) > 0).all()
+
+
+@pytest.mark.parametrize("points", [0, MIN_POINTS - 1, 1000, 2000])
+def test_not_downsampled(series, points):
+    assert lttb(*series, points).tolist() == list(range(1000))
+
+
+def test_keeps_peaks():
+    x = np.arange(100, dtype=float)
+    y = np.zeros(100)
+    y[37] = 50
+    y[71] = -50
+
+    indexes = lttb(x, y, 10)
+
+    assert 37 in indexes
+    assert 71 in indexes
+
+
+def test_indexes():
+    times = [START + timedelta(hours=h) for h in range(50)]
+
+    indexes = downsample_indexes(times, list(range(50)), 5)
+
+    assert len(indexes) == 5
+    assert indexes[0] == 0
+    assert indexes[-1] == 49
+
+
+def test_rows():
+    rows = [
+        {"time": START + timedelta(hours=h), "value": None if h % 10 == 5 else h}
+        for h in range(50)
+    ]
+
+    downsampled = downsample_rows(rows, 5, "time", "value")
+
+    assert len(downsampled) == 5
+    assert downsampled[0] is rows[0]
+    assert downsampled[-1] is rows[-1]
+    assert all(row["value"] is not None for row in downsampled)
+
+
+def test_rows_not_downsampled():
+    rows = [{"time": START, "value": None}]
+
+    assert downsample_rows(rows, 5, "time", "value") is rows
@@ -0,0 +1,64 @@
+import io
+import zipfile
+
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+
+from boundlexx.api import exports
+from boundlexx.api.exports import ExportSheet, write_parquet, write_xlsx
+from boundlexx.api.models import ExportedFile
+
+ROWS = [["Tier 1", 1, None], ["Tier 2", 2, 1.5]]
+
+
+def _sheet(title="Worlds", rows=ROWS):
+    sheet = ExportSheet(title, ["Name", "Tier", "Value"])
+    sheet.extend(rows)
+    return sheet
+
+
+def test_xlsx_rows():
+    content = write_xlsx([_sheet()])
+
+    workbook = load_workbook(io.BytesIO(content))
+    assert workbook.properties.created == exports.XLSX_DATE_TIME
+    assert workbook.properties.modified == exports.XLSX_DATE_TIME
+    assert [list(r) for r in workbook["Worlds"].values] == [
+        ["Name", "Tier", "Value"]
+    ] + ROWS
+
+
+def test_xlsx_deterministic(monkeypatch):
+    first = write_xlsx([_sheet()])
+
+    # a different save time
+    monkeypatch.setattr(zipfile.time, "time", lambda: 1_700_000_000)
+    monkeypatch.setattr(
+        zipfile.time, "localtime", lambda *args: (2023, 11, 14, 22, 13, 20, 1, 318, 0)
+    )
+
+    assert write_xlsx([_sheet()]) == first
+    assert write_xlsx([_sheet(rows=ROWS[:1])]) != first
+
+    with zipfile.ZipFile(io.BytesIO(first)) as zip_file:
+        assert {i.date_time for i in zip_file.infolist()} == {exports.ZIP_DATE_TIME}
+
+
+def test_parquet():
+    table = pq.read_table(io.BytesIO(write_parquet(_sheet())))
+
+    assert table.column_names == ["Name", "Tier", "Value"]
+    assert table.to_pydict()["Value"] == [None, "1.5"]
+    assert write_parquet(_sheet()) == write_parquet(_sheet())
+
+
+@pytest.mark.django_db
+def test_create_exports_unchanged():
+    assert exports.create_exports("worlds", "Worlds", [_sheet()]) == [
+        "worlds",
+        "worlds_csv",
+        "worlds_parquet",
+    ]
+    assert exports.create_exports("worlds", "Worlds", [_sheet()]) == []
+    assert ExportedFile.objects.count() == 3
@@ -0,0 +1,70 @@
+import pytest
+
+from boundlexx.api.db import estimate_count
+from boundlexx.boundless.models import Color
+from tests.boundless.factories import ColorFactory
+
+pytestmark = pytest.mark.django_db
+
+COLORS_PATH = "/api/v2/colors/"
+
+
+@pytest.fixture
+def colors(settings):
+    settings.BOUNDLESS_API_RESPONSE_CACHE = False
+    settings.BOUNDLESS_API_COUNT_THRESHOLD = 3
+
+    return ColorFactory.create_batch(7)
+
+
+def _page(client, **params):
+    response = client.get(COLORS_PATH, params)
+    assert response.status_code == 200
+
+    return response.json()
+
+
+class TestEstimatedCount:
+    def test_estimate(self, colors):
+        assert estimate_count(Color.objects.all()) >= 0
+
+    def test_below_threshold(self, client, colors, settings):
+        settings.BOUNDLESS_API_COUNT_THRESHOLD = 10
+
+        data = _page(client, limit=2)
+
+        assert data["count"] == 7
+        assert data["count_approximate"] is False
+
+    def test_past_threshold(self, client, colors):
+        data = _page(client, limit=2)
+
+        assert data["count_approximate"] is True
+        # at least the counted rows, and enough for a next page
+        assert data["count"] >= 4
+        assert data["next"] is not None
+
+    def test_pages(self, client, colors):
+        game_ids = []
+        offset = 0
+
+        while True:
+            data = _page(client, limit=2, offset=offset)
+            game_ids += [c["game_id"] for c in data["results"]]
+
+            if data["next"] is None:
+                break
+            offset += 2
+
+        # last page, the count is exact
+        assert data["count"] == 7
+        assert data["count_approximate"] is False
+        assert sorted(game_ids) == sorted(c.game_id for c in colors)
+
+    def test_offset_past_estimate(self, client, colors):
+        data = _page(client, limit=2, offset=6)
+
+        assert len(data["results"]) == 1
+        assert data["count"] == 7
+        assert data["count_approximate"] is False
+        assert data["next"] is None
@@ -0,0 +1,52 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from boundlexx.api.renderers import ORJSONRenderer
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"count": 1, "next": None, "results": [{"id": 1, "name": "a"}]},
+        OrderedDict([("b", 1), ("a", [1.5, -2, True, False, None])]),
+        {1: "int key", "nested": {"empty": [], "map": {}}},
+        {"unicode": "Blinksecs · ✓ 日本", "escaped": 'quote " \\ \n \t'},
+        {"separators": "a b c"},
+        {"control": "\x00\x1f\x7f"},
+        {
+            "time": datetime.datetime(
+                2020, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc
+            ),
+            "naive": datetime.datetime(2020, 1, 2, 3, 4, 5),
+            "date": datetime.date(2020, 1, 2),
+            "clock": datetime.time(3, 4, 5),
+            "delta": datetime.timedelta(days=1, seconds=5),
+        },
+        {"decimal": decimal.Decimal("1.50"), "uuid": uuid.UUID(int=1)},
+        {"lazy": gettext_lazy("Name"), "tuple": (1, 2), "set": {3}},
+        {"big": 2**70, "float": 0.1},
+        [],
+        "string",
+    ],
+)
+def test_same_bytes(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_none():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_indent():
+    data = {"a": [1, 2]}
+    context = {"indent": 4}
+
+    assert ORJSONRenderer().render(
+        data, renderer_context=context
+    ) == JSONRenderer().render(data, renderer_context=context)
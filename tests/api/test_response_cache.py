@@ -0,0 +1,331 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boundlexx.api import response_cache
+from boundlexx.api.common import mixins
+from boundlexx.api.common.mixins import ResponseCacheMixin
+from boundlexx.api.response_cache import (
+    ALL_GENERATION_KEY,
+    COALESCED_RESPONSES,
+    OBJECT_GENERATION_MODELS,
+    bump_all_generations,
+    bump_generation,
+    coalesce,
+    generation_key,
+    get_generations,
+    get_response_key,
+    set_cached_response,
+    uses_object_generations,
+)
+from boundlexx.boundless.game import Location, ShopItem, World as SimpleWorld
+from boundlexx.boundless.models import ItemShopStandPrice, World
+from tests.boundless.factories import ColorFactory, ItemFactory, WorldFactory
+
+pytestmark = pytest.mark.django_db
+
+COLORS_PATH = "/api/v2/colors/"
+
+
+def _keys_without_timeout():
+    # `LocMemCache` stores a None expiry for keys without a timeout
+    return {
+        key
+        for key, expires in cache._expire_info.items()  # pylint: disable=protected-access # noqa E501
+        if expires is None and ALL_GENERATION_KEY in key
+    }
+
+
+def _request(path, host="testserver", secure=False):
+    request = Request(APIRequestFactory().get(path, HTTP_HOST=host, secure=secure))
+    request.accepted_renderer = JSONRenderer()
+    request.accepted_media_type = JSONRenderer.media_type
+
+    return request
+
+
+@pytest.fixture
+def hosts(settings):
+    settings.ALLOWED_HOSTS = ["*"]
+    settings.BOUNDLESS_API_RESPONSE_CACHE = True
+    bump_all_generations()
+
+
+class TestResponseKey:
+    def test_query_order(self):
+        assert get_response_key(_request("/api/v2/colors/?a=1&b=2"), [1]) == (
+            get_response_key(_request("/api/v2/colors/?b=2&a=1"), [1])
+        )
+
+    def test_generations(self):
+        request = _request(COLORS_PATH)
+
+        assert get_response_key(request, [1, 2]) != get_response_key(request, [1, 3])
+
+    def test_host(self, hosts):
+        keys = {
+            get_response_key(_request(COLORS_PATH), [1]),
+            get_response_key(_request(COLORS_PATH, host="a.example.com"), [1]),
+            get_response_key(_request(COLORS_PATH, secure=True), [1]),
+        }
+
+        assert len(keys) == 3
+
+
+class TestResponseCache:
+    def test_host(self, client, hosts):
+        ColorFactory.create_batch(2)
+
+        # the `next` link is absolute
+        first = client.get(COLORS_PATH, {"limit": 1}, HTTP_HOST="a.example.com")
+        second = client.get(COLORS_PATH, {"limit": 1}, HTTP_HOST="b.example.com")
+
+        assert first.status_code == second.status_code == 200
+        assert b"//a.example.com/" in first.content
+        assert b"//b.example.com/" in second.content
+        assert b"//a.example.com/" not in second.content
+
+    def test_invalidation(self, client, hosts):
+        ColorFactory()
+
+        assert client.get(COLORS_PATH).json()["count"] == 1
+        assert client.get(COLORS_PATH).json()["count"] == 1
+
+        ColorFactory()
+
+        assert client.get(COLORS_PATH).json()["count"] == 2
+
+    def test_not_modified(self, client, hosts):
+        ColorFactory()
+
+        response = client.get(COLORS_PATH)
+        etag = response["ETag"]
+
+        cached = client.get(COLORS_PATH, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == 304
+        assert "Last-Modified" not in cached
+
+    def test_bulk_write(self, client, hosts):
+        color = ColorFactory()
+
+        client.get(COLORS_PATH)
+        # bulk updates do not send signals, the data is newer than any bump
+        type(color).objects.filter(id=color.id).update(game_id=color.game_id + 100)
+        bump_all_generations()
+
+        changed = client.get(COLORS_PATH, HTTP_IF_MODIFIED_SINCE=http_date())
+        assert changed.status_code == 200
+        assert changed.json()["results"][0]["game_id"] == color.game_id + 100
+
+
+class TestGenerations:
+    def test_object_generation_models(self):
+        from boundlexx.api.v1.router import router as apiv1
+        from boundlexx.api.v2.router import router as apiv2
+
+        models = set()
+        for router in (apiv1, apiv2):
+            for _, viewset, _ in router.registry:
+                if not issubclass(viewset, ResponseCacheMixin):
+                    continue
+
+                view = viewset()
+                view.action = "retrieve"
+                cache_models = view.get_cache_models()
+                if viewset.lookup_field in ("id", "pk") and len(cache_models) > 0:
+                    models.add(cache_models[0]._meta.label_lower)
+
+        assert models == OBJECT_GENERATION_MODELS
+
+    def test_price_keys_expire(self):
+        world = WorldFactory()
+        item = ItemFactory()
+        before = _keys_without_timeout()
+
+        ItemShopStandPrice.objects.create_from_shop_item(
+            SimpleWorld(world.id, world.api_url),
+            item,
+            ShopItem("Shop", "TAG", 10, 1, 100, Location(1, 2, 3)),
+        )
+
+        assert _keys_without_timeout() == before
+        assert cache.get(generation_key(ItemShopStandPrice)) is not None
+        assert not uses_object_generations(ItemShopStandPrice)
+
+    def test_object_generation(self):
+        world = WorldFactory()
+        keys = [generation_key(World), generation_key(World, world.id)]
+        before = get_generations(keys)
+
+        world.display_name = "Changed"
+        world.save()
+
+        after = get_generations(keys)
+        assert after[0] > before[0]
+        assert after[1] > before[1]
+        assert generation_key(World, world.id) not in _keys_without_timeout()
+
+    def test_expired_generation(self):
+        key = generation_key(World)
+        bump_generation(World)
+        generation = get_generations([key])[0]
+
+        cache.delete(key)
+        assert get_generations([key]) == [0]
+
+        # does not repeat a generation responses could still be cached under
+        bump_generation(World)
+        assert get_generations([key])[0] > generation
+
+
+class _Flights(response_cache.SingleFlight):
+    """
+    Signals when a caller joined a flight it did not start
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.joined = threading.Event()
+
+    def join(self, key):
+        flight, started = super().join(key)
+        if not started:
+            self.joined.set()
+        return flight, started
+
+
+class _Lease:
+    def acquire(self, blocking=True):
+        return False
+
+
+@pytest.fixture
+def flights(monkeypatch, settings):
+    settings.BOUNDLESS_API_COALESCE_LEASE = False
+    settings.BOUNDLESS_API_COALESCE_TIMEOUT = 5
+
+    flights = _Flights()
+    monkeypatch.setattr(response_cache, "_flights", flights)
+    return flights
+
+
+def _concurrent(flights, key, render):
+    """
+    Calls `coalesce` with `render` and, while it renders, once more from another
+    thread. Returns both results (first, waiter)
+    """
+
+    rendering = threading.Event()
+    results = {}
+
+    def _render():
+        rendering.set()
+        # the waiter has to join while this one is rendering
+        flights.joined.wait(5)
+        return render()
+
+    def _first():
+        try:
+            results["first"] = coalesce(key, _render)
+        except ValueError as ex:
+            results["first"] = ex
+
+    def _waiter():
+        results["waiter"] = coalesce(key, lambda: "waiter rendered")
+
+    first = threading.Thread(target=_first)
+    first.start()
+    assert rendering.wait(5)
+
+    waiter = threading.Thread(target=_waiter)
+    waiter.start()
+
+    for thread in (first, waiter):
+        thread.join(10)
+        assert not thread.is_alive()
+
+    return results["first"], results["waiter"]
+
+
+class TestCoalesce:
+    def test_renders_once(self, flights):
+        renders = []
+
+        def render():
+            renders.append(1)
+            return "cached"
+
+        first, waiter = _concurrent(flights, "key", render)
+
+        assert renders == [1]
+        assert first == ("cached", None)
+        assert waiter == ("cached", "local")
+        assert flights._flights == {}  # pylint: disable=protected-access
+
+    def test_render_fails(self, flights):
+        def render():
+            raise ValueError("render failed")
+
+        first, waiter = _concurrent(flights, "key", render)
+
+        assert isinstance(first, ValueError)
+        # the waiter has to render for itself
+        assert waiter == (None, "local")
+        assert flights._flights == {}  # pylint: disable=protected-access
+
+    def test_not_cacheable(self, flights):
+        # non 200 responses are not cached, `render` returns None
+        first, waiter = _concurrent(flights, "key", lambda: None)
+
+        assert first == (None, None)
+        assert waiter == (None, "local")
+
+    def test_flight_removed(self, flights):
+        def render():
+            raise ValueError("render failed")
+
+        with pytest.raises(ValueError):
+            coalesce("key", render)
+
+        assert flights._flights == {}  # pylint: disable=protected-access
+        assert coalesce("key", lambda: "cached") == ("cached", None)
+
+    def test_lease(self, flights, settings, monkeypatch):
+        settings.BOUNDLESS_API_COALESCE_LEASE = True
+        monkeypatch.setattr(cache, "lock", lambda *args, **kwargs: _Lease())
+
+        response = HttpResponse(b"{}", content_type="application/json")
+
+        # another process holds the lease and fills the cache
+        timer = threading.Timer(0.1, set_cached_response, ("key", response, 60))
+        timer.start()
+        cached, source = coalesce("key", lambda: "rendered")
+        timer.join()
+
+        assert source == "redis"
+        assert cached[:3] == (200, b"{}", "application/json")
+
+    def test_lease_timeout(self, flights, settings, monkeypatch):
+        settings.BOUNDLESS_API_COALESCE_LEASE = True
+        settings.BOUNDLESS_API_COALESCE_TIMEOUT = 0.1
+        monkeypatch.setattr(cache, "lock", lambda *args, **kwargs: _Lease())
+
+        # the holder never filled the cache
+        assert coalesce("missing", lambda: "rendered") == ("rendered", None)
+
+    def test_counted(self, client, hosts, monkeypatch):
+        cached = (200, b"[]", "application/json", '"etag"')
+        monkeypatch.setattr(mixins, "coalesce", lambda key, render: (cached, "local"))
+        counter = COALESCED_RESPONSES.labels("v2:color-list", "local")
+        before = counter._value.get()  # pylint: disable=protected-access
+
+        response = client.get(COLORS_PATH)
+
+        assert response.content == b"[]"
+        assert counter._value.get() == before + 1  # pylint: disable=protected-access
@@ -0,0 +1,52 @@
+from factory import Faker, Sequence
+from factory.django import DjangoModelFactory
+
+from boundlexx.boundless.models import Block, Color, Item, World
+
+
+class WorldFactory(DjangoModelFactory):
+
+    id = Sequence(lambda n: n + 1)  # noqa A003
+    name = Faker("user_name")
+    display_name = Faker("user_name")
+    owner = None
+    is_creative = False
+    is_public = True
+    active = True
+
+    class Meta:
+        model = World
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        # `ModelDiffMixin` does not save unchanged models
+        world = model_class(*args, **kwargs)
+        world.save(force=True)
+        return world
+
+
+class ColorFactory(DjangoModelFactory):
+
+    game_id = Sequence(lambda n: n + 1)
+
+    class Meta:
+        model = Color
+
+
+class ItemFactory(DjangoModelFactory):
+
+    game_id = Sequence(lambda n: n + 1)
+    string_id = Sequence(lambda n: f"ITEM_{n}")
+    name = Faker("word")
+
+    class Meta:
+        model = Item
+
+
+class BlockFactory(DjangoModelFactory):
+
+    game_id = Sequence(lambda n: n + 1)
+    name = Sequence(lambda n: f"BLOCK_{n}")
+
+    class Meta:
+        model = Block
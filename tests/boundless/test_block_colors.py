@@ -0,0 +1,226 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Q
+from django.utils import timezone
+
+from boundlexx.boundless.models import WorldBlockColor, world as world_models
+from boundlexx.boundless.registry import bump_registry_version
+from tests.boundless.factories import (
+    BlockFactory,
+    ColorFactory,
+    ItemFactory,
+    WorldFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+NON_EXO = Q(world__end__isnull=True) | Q(world__owner__isnull=False)
+EXO = {
+    "world__isnull": False,
+    "world__end__isnull": False,
+    "world__owner__isnull": True,
+}
+HISTORY_FIELDS = ["time", "is_new", "first_world_id", "last_exo_id"]
+
+
+def _old_history(block_color):
+    """
+    The per row lookups `recalculate_colors` used to do, without the
+    transform fields (those intentionally changed)
+    """
+
+    if block_color.world is not None and block_color.world.is_creative:
+        return block_color.time, False, None, None
+
+    base_compare = WorldBlockColor.objects.filter(
+        item=block_color.item,
+        color=block_color.color,
+        is_default=True,
+        time__lt=block_color.time,
+    ).filter(Q(world__isnull=True) | Q(world__is_creative=False))
+
+    first = base_compare.filter(NON_EXO).order_by("world__start").first()
+    last_exo = base_compare.filter(**EXO).order_by("-world__start").first()
+
+    return (
+        block_color.time,
+        first is None,
+        first.world_id if first is not None else None,
+        last_exo.world_id if last_exo is not None else None,
+    )
+
+
+def _assert_history():
+    block_colors = WorldBlockColor.objects.select_related("world").order_by("id")
+
+    for block_color in block_colors:
+        expected = _old_history(block_color)
+        actual = tuple(getattr(block_color, f) for f in HISTORY_FIELDS)
+
+        assert actual == expected, block_color.id
+
+
+@pytest.fixture
+def start():
+    return timezone.now() - timedelta(days=30)
+
+
+@pytest.fixture
+def history(settings, start):
+    settings.BOUNDLESS_TRANSFORMATION_GROUPS = {}
+    bump_registry_version()
+
+    def _world(days, **kwargs):
+        return WorldFactory(start=start + timedelta(days=days), **kwargs)
+
+    def _exo(days):
+        return _world(days, end=start + timedelta(days=days + 10))
+
+    worlds = {
+        "perm_1": _world(0),
+        "exo_1": _exo(1),
+        "sovereign": _world(2, owner=1, end=start + timedelta(days=60)),
+        "exo_2": _exo(3),
+        "creative": _world(4, is_creative=True),
+        "perm_2": _world(5),
+    }
+    items = ItemFactory.create_batch(2)
+    colors = ColorFactory.create_batch(3)
+
+    def _add(world, item, color, time=None, **kwargs):
+        block_color = WorldBlockColor.objects.create(
+            world=worlds.get(world),
+            item=items[item],
+            color=colors[color],
+            **kwargs,
+        )
+        if time is not None:
+            WorldBlockColor.objects.filter(id=block_color.id).update(
+                time=start + timedelta(days=time)
+            )
+
+    _add("exo_1", 0, 0)
+    _add("exo_1", 1, 0)
+    _add("exo_2", 0, 0)
+    _add("exo_2", 0, 1)
+    _add("sovereign", 0, 1)
+    _add("sovereign", 1, 0, is_default=False)
+    _add("perm_1", 1, 1)
+    _add("creative", 0, 0)
+    _add("perm_2", 0, 0)
+    _add("perm_2", 1, 0)
+    _add(None, 1, 1, time=-1)
+    _add(None, 0, 1, time=6)
+
+    return worlds, items, colors
+
+
+class TestRecalculateHistory:
+    def test_matches_old(self, history):
+        WorldBlockColor.objects.recalculate_history()
+
+        _assert_history()
+
+        # run again, nothing changed
+        assert WorldBlockColor.objects.recalculate_history() == (0, 0)
+
+    def test_world_ids(self, history):
+        worlds, _, _ = history
+
+        WorldBlockColor.objects.recalculate_history(world_ids=[worlds["exo_2"].id])
+
+        exo_2 = WorldBlockColor.objects.filter(world=worlds["exo_2"])
+        assert all(c.time == worlds["exo_2"].start for c in exo_2)
+        assert not WorldBlockColor.objects.filter(
+            world=worlds["perm_1"], time=worlds["perm_1"].start
+        ).exists()
+
+    def test_groups(self, history, start):
+        worlds, items, colors = history
+        WorldBlockColor.objects.recalculate_history()
+
+        # changes the `last_exo` of the `exo_2` color
+        world = WorldFactory(
+            start=start + timedelta(days=2, hours=12),
+            end=start + timedelta(days=20),
+        )
+        WorldBlockColor.objects.create(world=world, item=items[0], color=colors[1])
+
+        groups = WorldBlockColor.objects.get_affected_groups(
+            [(items[0].id, colors[1].id)]
+        )
+        WorldBlockColor.objects.recalculate_history(
+            world_ids=[world.id], max_age=world.start, groups=groups
+        )
+
+        _assert_history()
+        assert (
+            WorldBlockColor.objects.get(
+                world=worlds["exo_2"], item=items[0], color=colors[1]
+            ).last_exo_id
+            == world.id
+        )
+
+
+class TestAffectedGroups:
+    def test_transforms(self, settings):
+        items = ItemFactory.create_batch(3)
+        settings.BOUNDLESS_TRANSFORMATION_GROUPS = {
+            items[1].game_id: [items[0].game_id],
+            items[2].game_id: [items[1].game_id],
+        }
+        bump_registry_version()
+
+        assert WorldBlockColor.objects.get_affected_groups(
+            [(items[0].id, 5), (items[2].id, 6)]
+        ) == [(items[0].id, 5), (items[1].id, 5), (items[2].id, 6)]
+
+
+class TestCreateColorsFromWC:
+    def test_changed_groups(self, start, monkeypatch):
+        monkeypatch.setattr(
+            world_models, "send_color_update_notification", lambda *args: None
+        )
+
+        world = WorldFactory(start=start, end=start + timedelta(days=10))
+        items = ItemFactory.create_batch(2)
+        colors = ColorFactory.create_batch(3)
+        blocks = [BlockFactory(block_item=item) for item in items]
+        WorldBlockColor.objects.create(
+            world=world, item=items[0], color=colors[0], active=False
+        )
+        bump_registry_version()
+
+        created, groups, since = WorldBlockColor.objects.create_colors_from_wc(
+            world,
+            {
+                blocks[0].game_id: {
+                    "default": colors[1].game_id,
+                    "possible": [colors[2].game_id],
+                },
+                blocks[1].game_id: {"default": colors[0].game_id, "possible": []},
+            },
+        )
+
+        # the default for items[1] and the unknown possible color of items[0]
+        assert created == 2
+        assert groups == sorted(
+            [
+                (items[0].id, colors[0].id),
+                (items[0].id, colors[1].id),
+                (items[0].id, colors[2].id),
+                (items[1].id, colors[0].id),
+            ]
+        )
+        assert since == world.start
+
+    def test_nothing_changed(self, start):
+        world = WorldFactory(start=start)
+        bump_registry_version()
+
+        assert WorldBlockColor.objects.create_colors_from_wc(world, {}) == (
+            0,
+            [],
+            None,
+        )
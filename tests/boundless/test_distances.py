@@ -0,0 +1,107 @@
+import pytest
+
+from boundlexx.boundless import distances
+from boundlexx.boundless.distances import (
+    ROUTE_COST,
+    ROUTE_DISTANCE,
+    WorldRoutePlanner,
+    bump_distance_version,
+    get_distance_matrix,
+)
+from boundlexx.boundless.models import WorldDistance
+from boundlexx.boundless.tasks.worlds import calculate_distances
+from tests.boundless.factories import WorldFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _distance(world_source, world_dest, distance):
+    WorldDistance.objects.create(
+        world_source=world_source, world_dest=world_dest, distance=distance
+    )
+    WorldDistance.objects.create(
+        world_source=world_dest, world_dest=world_source, distance=distance
+    )
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    fetched = []
+
+    def _fetch_distance(client, world_source, world_dest):
+        fetched.append((world_source.id, world_dest.id))
+        if world_source.id == world_dest.id:
+            return 0
+        return 10
+
+    monkeypatch.setattr(distances, "fetch_distance", _fetch_distance)
+    monkeypatch.setattr(distances, "BoundlessClient", lambda: None)
+    bump_distance_version()
+
+    return fetched
+
+
+class TestCalculateDistances:
+    def test_new_world(self, fetched):
+        world_1 = WorldFactory()
+        world_2 = WorldFactory()
+        _distance(world_1, world_1, 0)
+        _distance(world_2, world_2, 0)
+        _distance(world_1, world_2, 5)
+
+        matrix = get_distance_matrix()
+        assert list(matrix) == [world_1.id, world_2.id]
+
+        calculate_distances()
+        assert fetched == []
+
+        # activated after the matrix was loaded
+        world_3 = WorldFactory()
+        calculate_distances()
+
+        assert sorted(fetched) == [
+            (world_1.id, world_3.id),
+            (world_2.id, world_3.id),
+            (world_3.id, world_3.id),
+        ]
+
+        matrix = get_distance_matrix()
+        assert world_3.id in matrix
+        assert matrix.get(world_3.id, world_1.id) == 10
+        assert matrix.get(world_1.id, world_2.id) == 5
+        assert matrix.missing_pairs(matrix) == []
+
+
+class TestWorldRoutePlanner:
+    def test_route(self, fetched):
+        world_1 = WorldFactory()
+        world_2 = WorldFactory()
+        world_3 = WorldFactory()
+        _distance(world_1, world_2, 5)
+        _distance(world_2, world_3, 5)
+        _distance(world_1, world_3, 30)
+
+        planner = WorldRoutePlanner(get_distance_matrix())
+
+        assert planner.distance(world_1.id, world_3.id) == 30
+        assert planner.route(world_1.id, world_3.id, ROUTE_DISTANCE) == (
+            10.0,
+            [world_1.id, world_2.id, world_3.id],
+        )
+
+        # 2 x 5 blinksecs (420c) is cheaper than 30 blinksecs (2700c)
+        cost, path = planner.route(world_1.id, world_3.id, ROUTE_COST)
+        assert path == [world_1.id, world_2.id, world_3.id]
+        assert cost == (
+            WorldDistance.objects.get(world_source=world_1, world_dest=world_2).cost * 2
+        )
+
+    def test_no_route(self, fetched):
+        world_1 = WorldFactory()
+        world_2 = WorldFactory()
+
+        planner = WorldRoutePlanner(get_distance_matrix())
+
+        assert planner.distance(world_1.id, world_2.id) is None
+        assert planner.route(world_1.id, world_2.id) is None
+        assert planner.route(world_1.id, world_1.id) == (0.0, [world_1.id])
@@ -0,0 +1,27 @@
+import pytest
+from polymorphic.managers import PolymorphicManager
+
+from boundlexx.boundless.models import Color, GameObj, Item
+from tests.boundless.factories import ColorFactory, ItemFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGameObjManagers:
+    def test_default_manager(self):
+        for model in (GameObj, Item, Color):
+            assert isinstance(model._default_manager, PolymorphicManager)
+            assert isinstance(model._base_manager, PolymorphicManager)
+
+    def test_polymorphic(self):
+        item = ItemFactory()
+        color = ColorFactory()
+
+        assert list(GameObj.objects.order_by("id")) == [item, color]
+        assert type(GameObj.objects.get(id=item.id)) is Item
+
+    def test_fast(self):
+        item = ItemFactory()
+
+        assert Item.fast.get(game_id=item.game_id) == item
+        assert type(GameObj.fast.get(id=item.id)) is GameObj
@@ -0,0 +1,57 @@
+import pytest
+
+from boundlexx.boundless.tasks import worlds as tasks
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeClient:
+    def __init__(self):
+        self.scanned: list[int] = []
+
+    def get_world_data(self, world):
+        self.scanned.append(world.id)
+        return None
+
+
+@pytest.fixture
+def scan(settings, monkeypatch):
+    settings.BOUNDLESS_MAX_WORLD_ID = 5
+    settings.BOUNDLESS_MAX_SCAN_CHUNK = 2
+    settings.BOUNDLESS_WORLD_SCAN_WORKERS = 1
+
+    client = FakeClient()
+    marked: list[list[int]] = []
+
+    monkeypatch.setattr(tasks, "BoundlessClient", lambda: client)
+    monkeypatch.setattr(tasks, "mark_missing_world_ids", marked.append)
+    monkeypatch.setattr(tasks, "get_missing_world_ids", lambda ids: set())
+
+    return client, marked
+
+
+class TestDiscoverAllWorlds:
+    def test_chunks(self, scan):
+        client, marked = scan
+
+        tasks.discover_all_worlds()
+
+        assert client.scanned == [1, 2, 3, 4, 5]
+        assert marked == [[1, 2], [3, 4], [5]]
+
+    def test_start_id(self, scan):
+        client, marked = scan
+
+        tasks.discover_all_worlds(start_id=4)
+
+        assert client.scanned == [4, 5]
+        assert marked == [[4, 5]]
+
+    def test_skips_missing(self, scan, monkeypatch):
+        client, marked = scan
+        monkeypatch.setattr(tasks, "get_missing_world_ids", lambda ids: {2, 3})
+
+        tasks.discover_all_worlds()
+
+        assert client.scanned == [1, 4, 5]
+        assert marked == [[1, 4], [5]]
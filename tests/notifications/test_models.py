@@ -0,0 +1,22 @@
+import pytest
+
+from boundlexx.boundless.models import ResourceCount
+from boundlexx.notifications.models import WorldNotification
+from tests.boundless.factories import ItemFactory, WorldFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestWorldNotification:
+    def test_resources_largest_first(self):
+        world = WorldFactory()
+        # compact resource counts are in resource mapping order
+        resources = [
+            ResourceCount(item=item, count=count)
+            for item, count in zip(ItemFactory.create_batch(3), [5, 50, 20])
+        ]
+
+        context = WorldNotification()._get_context(world, resources)
+
+        assert [r.count for r in context["surface_resources"]] == [50, 20, 5]
+        assert context["embedded_resources"] == []
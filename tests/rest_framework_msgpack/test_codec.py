@@ -0,0 +1,101 @@
+import datetime
+import decimal
+import io
+
+import msgpack
+import pytest
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+
+from rest_framework_msgpack.parsers import MessagePackParser
+from rest_framework_msgpack.renderers import MessagePackRenderer
+
+
+class ColorSerializer(serializers.Serializer):
+    game_id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class WorldSerializer(serializers.Serializer):
+    id = serializers.IntegerField()  # noqa A003
+    name = serializers.CharField()
+    colors = ColorSerializer(many=True)
+
+
+def _round_trip(data):
+    content = MessagePackRenderer().render(data)
+    return MessagePackParser().parse(io.BytesIO(content))
+
+
+def test_round_trip_nested():
+    data = {
+        "count": 2,
+        "results": [
+            {"id": 1, "name": "a", "tags": ["x", "y"], "world": {"id": 1}},
+            {"id": 2, "name": "b", "tags": [], "world": None},
+        ],
+        "empty": {},
+    }
+
+    assert _round_trip(data) == data
+
+
+def test_round_trip_types():
+    data = {
+        "time": datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        "date": datetime.date(2020, 1, 2),
+        "decimal": decimal.Decimal("1.50"),
+        "tuple": (1, 2),
+        "float": 1.5,
+        "bool": True,
+        "none": None,
+    }
+
+    parsed = _round_trip(data)
+
+    assert parsed["time"] == data["time"]
+    assert parsed["date"] == data["date"]
+    assert parsed["decimal"] == data["decimal"]
+    assert parsed["tuple"] == [1, 2]
+    assert parsed["float"] == 1.5
+    assert parsed["bool"] is True
+    assert parsed["none"] is None
+
+
+def test_keys_stored_once():
+    data = [{"id": index, "name": str(index)} for index in range(100)]
+
+    root, keys = msgpack.unpackb(
+        MessagePackRenderer().render(data), strict_map_key=False
+    )
+
+    assert keys == ["id", "name"]
+    assert root[5] == {0: 5, 1: "5"}
+
+
+def test_serializer_keys():
+    worlds = [{"id": 1, "name": "a", "colors": [{"game_id": 1, "name": "red"}]}]
+    data = WorldSerializer(worlds, many=True).data
+
+    _, keys = msgpack.unpackb(
+        MessagePackRenderer().render({"count": 1, "results": data}),
+        strict_map_key=False,
+    )
+
+    assert keys[:5] == ["id", "name", "colors", "game_id", "count"]
+    assert _round_trip({"count": 1, "results": data}) == {
+        "count": 1,
+        "results": worlds,
+    }
+
+
+def test_parse_strips_null_characters():
+    assert _round_trip({"name": "a\u0000b"}) == {"name": "ab"}
+
+
+def test_parse_invalid():
+    with pytest.raises(ParseError):
+        MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+    with pytest.raises(ParseError):
+        MessagePackParser().parse(io.BytesIO(b""))